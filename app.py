@@ -1,15 +1,22 @@
+import time
+_START = time.perf_counter()
+
 import sys
 import os
+import multiprocessing
 from PyQt5 import QtWidgets, QtGui, QtCore
 
-from vault.main_window import MainWindow
-from vault.storage import VaultStorage, VaultError
+# 主密码对话框之前只导入必需的模块；存储、加密和主窗口在输入主密码后再导入
 from vault.dialogs import MasterPasswordDialog
-from vault.style import load_app_style
+from vault.style import apply_app_style
 from vault.config import get_app_config, get_window_config, get_file_config
+from vault.startup_profile import PROFILE_FLAG, StartupProfiler
 
 
 def main():
+    profiler = StartupProfiler(_START, enabled=PROFILE_FLAG in sys.argv[1:])
+    profiler.mark("import")
+
     # 启用高DPI支持
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
@@ -30,33 +37,36 @@ def main():
     app.setWindowIcon(icon)
 
     # Load global stylesheet (modern dark theme)
-    app.setStyleSheet(load_app_style())
+    apply_app_style(app)
+    profiler.mark("app")
 
     data_path = os.path.join(base_dir, file_config['data_file'])
-    storage = VaultStorage(data_path)
 
     # Determine first-run or login
     first_run = not os.path.exists(data_path)
 
     # 预创建对话框以提高响应速度
     dlg = MasterPasswordDialog(first_run=first_run)
+    profiler.mark("prompt")
+    profiler.pause()
     if dlg.exec_() != QtWidgets.QDialog.Accepted:
         sys.exit(0)
+    profiler.resume()
 
     master_password = dlg.get_password()
 
-    try:
-        if first_run:
-            storage.create_new(master_password)
-            storage.save()
-        else:
-            storage.load(master_password)
-    except VaultError as e:
-        QtWidgets.QMessageBox.critical(None, "错误", str(e))
-        sys.exit(1)
-
-    # 延迟创建主窗口以提高启动速度
-    win = MainWindow(storage)
+    from vault.storage import VaultStorage
+    from vault.unlock import UnlockProgressDialog
+    from vault.main_window import MainWindow
+    profiler.mark("import_main")
+    storage = VaultStorage(data_path)
+
+    # 密钥派生、解密和反序列化在后台线程执行，期间在GUI线程并行构建主窗口
+    unlock_dlg = UnlockProgressDialog(storage, master_password, first_run=first_run)
+    unlock_dlg.start()
+
+    # 主窗口暂不绑定数据，解锁完成后再加载
+    win = MainWindow(storage, load_data=False)
     window_config = get_window_config()
     win.resize(window_config['default_width'], window_config['default_height'])
     # 确保窗口标题栏/任务栏也使用该图标
@@ -64,6 +74,21 @@ def main():
         win.setWindowIcon(icon)
     except Exception:
         pass
+    profiler.mark("construct")
+
+    if unlock_dlg.wait_result() != QtWidgets.QDialog.Accepted:
+        if unlock_dlg.error_message:
+            QtWidgets.QMessageBox.critical(None, "错误", unlock_dlg.error_message)
+            sys.exit(1)
+        sys.exit(0)
+    profiler.mark("unlock")
+    if storage.recovered_bytes:
+        QtWidgets.QMessageBox.warning(
+            None, "提示",
+            f"上次保存没有完成，已丢弃数据文件末尾 {storage.recovered_bytes} 字节未提交的内容，"
+            "最近一次修改可能没有保存。")
+    win.start_loading()
+    profiler.watch_first_paint(win)
     
     # 使用 QTimer.singleShot 延迟显示窗口，让事件循环先启动
     QtCore.QTimer.singleShot(0, win.show)
@@ -72,4 +97,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，正则沙箱的子进程同样从这里启动
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+卡片列表内存与首屏时间基准
+
+对比两种卡片列表在不同账号数量下的常驻内存（RSS）和首屏时间：
+- 控件卡片：QListWidget 中每个账号一个 AccountCard 控件，按 batch_load_size 分批创建（原实现）
+- 卡片复用池：模型/视图 + AccountCardPool，只为视口内的行准备 AccountCard 并在滚动时重新绑定
+- 模型/视图：AccountListModel + AccountCardDelegate，只绘制进入视口的卡片
+首屏时间为开始绑定数据到卡片列表第一次绘制完成，全部加载为不再有后台的分批加载
+（后两种方式只在滚动到接近底部时加载下一批，与首屏相同）。
+内存为绑定数据后的 RSS 减去绑定前的 RSS（不含保险库本身）。
+每项测量在独立的子进程中运行。控件卡片超过上限（默认 1000）时跳过：每添加一个控件列表都要重新布局，
+总耗时随数量近似平方增长，一千个已需数秒。
+
+用法: python -m benchmarks.bench_cards [账号数量,...] [控件卡片上限]
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from PyQt5 import QtCore, QtWidgets
+
+from benchmarks.bench_keystroke import _make_storage
+from vault.card_view import (AccountCard, AccountCardDelegate, AccountCardPool, AccountListModel, AccountListView,
+                             CardSlotDelegate)
+from vault.config import get_card_config, get_ui_config, get_text
+from vault.storage import VaultStorage
+from vault.style import load_app_style
+
+MODES = ("all_widgets", "pool", "delegate")
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        # 非 Linux 平台退而使用峰值 RSS（macOS 单位为字节，其余为 KB）
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _PaintWatcher(QtCore.QObject):
+    """记录视口是否发生过绘制"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.painted = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            self.painted = True
+        return False
+
+
+def _new_widget_list() -> QtWidgets.QListWidget:
+    # 与原 MainWindow 的卡片列表设置相同
+    card_list = QtWidgets.QListWidget()
+    card_list.setObjectName("CardList")
+    card_list.setViewMode(QtWidgets.QListView.IconMode)
+    card_list.setResizeMode(QtWidgets.QListView.Adjust)
+    card_list.setMovement(QtWidgets.QListView.Static)
+    card_list.setWrapping(True)
+    card_list.setSpacing(10)
+    card_list.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+    card_list.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+    card_list.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+    card_config = get_card_config()
+    grid_spacing = card_config['grid_spacing']
+    card_list.setGridSize(QtCore.QSize(card_config['width'] + grid_spacing, card_config['height'] + grid_spacing))
+    return card_list
+
+
+class _WidgetLoader:
+    """按原实现的方式分批为每个账号创建 AccountCard"""
+
+    def __init__(self, card_list: QtWidgets.QListWidget, storage: VaultStorage):
+        self.card_list = card_list
+        self.storage = storage
+        self.pending = list(storage.vault.accounts)
+        self.loaded = 0
+        self.batch_size = get_ui_config()['batch_load_size']
+        card_config = get_card_config()
+        self.card_size = QtCore.QSize(card_config['width'], card_config['height'])
+
+    def load_next_batch(self):
+        batch = self.pending[self.loaded:self.loaded + self.batch_size]
+        group_names = {g.id: g.name for g in self.storage.vault.groups}
+        default_group_name = get_text('default_values', 'default_group') or "未分组"
+        groups = self.storage.vault.groups
+        self.card_list.setUpdatesEnabled(False)
+        try:
+            for a in batch:
+                card = AccountCard(a, group_names.get(a.group_id, default_group_name), False, groups, self.card_list)
+                item = QtWidgets.QListWidgetItem()
+                item.setData(QtCore.Qt.UserRole, a.id)
+                item.setSizeHint(self.card_size)
+                self.card_list.addItem(item)
+                self.card_list.setItemWidget(item, card)
+        finally:
+            self.card_list.setUpdatesEnabled(True)
+        self.loaded += len(batch)
+        if self.loaded < len(self.pending):
+            QtCore.QTimer.singleShot(1, self.load_next_batch)
+
+
+def _measure(mode: str, n_accounts: int) -> dict:
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    app.setStyleSheet(load_app_style())
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = _make_storage(os.path.join(tmp, "vault.dat"), n_accounts)
+        if mode == "all_widgets":
+            view = _new_widget_list()
+        else:
+            model = AccountListModel(storage)
+            view = AccountListView()
+            view.setModel(model)
+            if mode == "pool":
+                view.setItemDelegate(CardSlotDelegate(view))
+                AccountCardPool(view)
+            else:
+                view.setItemDelegate(AccountCardDelegate(view))
+        view.resize(1200, 800)
+        view.show()
+        app.processEvents()
+        watcher = _PaintWatcher()
+        view.viewport().installEventFilter(watcher)
+        rss_before = _rss_bytes()
+
+        start = time.perf_counter()
+        if mode == "all_widgets":
+            loader = _WidgetLoader(view, storage)
+            loader.load_next_batch()
+            done = lambda: loader.loaded >= n_accounts
+        else:
+            model.set_rows(list(storage.vault.account_ids()))
+            done = lambda: True
+        first_paint = None
+        while first_paint is None or not done():
+            app.processEvents()
+            if first_paint is None and watcher.painted:
+                first_paint = time.perf_counter() - start
+        loaded = time.perf_counter() - start
+        app.processEvents()
+        rss_after = _rss_bytes()
+        view.hide()
+        return {
+            "mode": mode,
+            "accounts": n_accounts,
+            "first_paint_ms": first_paint * 1000,
+            "loaded_ms": loaded * 1000,
+            "rss_mb": (rss_after - rss_before) / (1024 * 1024),
+        }
+
+
+def _run_child(mode: str, n_accounts: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_cards", "--child", mode, str(n_accounts)],
+        check=True, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def run(counts=(1000, 10000, 100000), widget_limit: int = 1000) -> list:
+    results = []
+    for n in counts:
+        for mode in MODES:
+            if mode == "all_widgets" and n > widget_limit:
+                results.append({"mode": mode, "accounts": n, "skipped": True})
+                continue
+            results.append(_run_child(mode, n))
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--child":
+        print(json.dumps(_measure(argv[1], int(argv[2]))))
+        return
+    counts = tuple(int(x) for x in argv[0].split(",")) if len(argv) > 0 else (1000, 10000, 100000)
+    widget_limit = int(argv[1]) if len(argv) > 1 else 1000
+    names = {"all_widgets": "控件卡片", "pool": "卡片复用池", "delegate": "模型/视图"}
+    print(f"{'账号数':>8}  {'实现':<10}{'首屏(ms)':>12}{'全部加载(ms)':>14}{'内存(MB)':>10}")
+    for r in run(counts, widget_limit):
+        if r.get("skipped"):
+            print(f"{r['accounts']:>8}  {names[r['mode']]:<10}{'跳过':>12}")
+            continue
+        print(f"{r['accounts']:>8}  {names[r['mode']]:<10}{r['first_paint_ms']:>12.1f}"
+              f"{r['loaded_ms']:>14.1f}{r['rss_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
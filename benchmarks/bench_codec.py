@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+载荷编码基准
+
+在合成保险库上对比 JSON 与二进制两种编码（结果必须一致）：
+- 整体：导出文件/旧版格式的明文（encode_vault / decode_vault）以及加密后的密文大小
+- 记录：vault.dat 中每条记录单独编码（encode_record / decode_record），以及整体重写后的文件大小
+
+用法: python -m benchmarks.bench_codec [账号数量] [分组数量] [重复次数]
+"""
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Callable
+
+from benchmarks.synthetic import make_storage
+from vault.crypto import encrypt_with_key
+from vault.storage import PAYLOAD_CODECS, RECORD_ACCOUNT
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(n_accounts: int = 100000, n_groups: int = 20, repeat: int = 3) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = make_storage(os.path.join(tmp, "vault.dat"), n_groups, n_accounts)
+        groups, accounts = list(storage.vault.groups), list(storage.vault.accounts)
+        expected = [asdict(a) for a in accounts]
+        meta = {"salt": None, "hash": None}
+        for name, codec in PAYLOAD_CODECS.items():
+            plain = codec.encode_vault(meta, storage.vault.version, groups, accounts)
+            decoded = codec.decode_vault(plain)[3]
+            if [asdict(a) for a in decoded] != expected:
+                raise AssertionError(f"{name} 编码解码后的账号不一致")
+            bodies = [codec.encode_record(a) for a in accounts]
+            if [asdict(codec.decode_record(RECORD_ACCOUNT, b)) for b in bodies] != expected:
+                raise AssertionError(f"{name} 记录编码解码后的账号不一致")
+            storage.codec = codec
+            storage._mark_rewrite()
+            storage.save()
+            results.append({
+                "codec": name,
+                "encode_ms": _best_ms(lambda: codec.encode_vault(meta, 1, groups, accounts), repeat),
+                "decode_ms": _best_ms(lambda: codec.decode_vault(plain), repeat),
+                "plain_bytes": len(plain),
+                "cipher_bytes": len(encrypt_with_key(storage._session_key, plain)),
+                "record_encode_ms": _best_ms(lambda: [codec.encode_record(a) for a in accounts], repeat),
+                "record_decode_ms": _best_ms(
+                    lambda: [codec.decode_record(RECORD_ACCOUNT, b) for b in bodies], repeat),
+                "log_file_bytes": os.path.getsize(storage.path),
+            })
+    return {"accounts": n_accounts, "groups": n_groups, "results": results}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 100000
+    n_groups = int(argv[1]) if len(argv) > 1 else 20
+    repeat = int(argv[2]) if len(argv) > 2 else 3
+    r = run(n_accounts, n_groups, repeat)
+    print(f"账号数: {r['accounts']}  分组数: {r['groups']}")
+    print(f"{'编码':<8}{'整体编码(ms)':>14}{'整体解码(ms)':>14}{'明文(KB)':>10}{'密文(KB)':>10}"
+          f"{'逐条编码(ms)':>14}{'逐条解码(ms)':>14}{'vault.dat(KB)':>15}")
+    for x in r["results"]:
+        print(f"{x['codec']:<8}{x['encode_ms']:>14.1f}{x['decode_ms']:>14.1f}"
+              f"{x['plain_bytes'] / 1024:>10.0f}{x['cipher_bytes'] / 1024:>10.0f}"
+              f"{x['record_encode_ms']:>14.1f}{x['record_decode_ms']:>14.1f}{x['log_file_bytes'] / 1024:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+载荷压缩基准
+
+在带长备注的合成保险库上（每十个账号有一条数千字的备注），对比不压缩、zlib 各级别和 lzma：
+- 导出：压缩 + 加密的耗时和导出文件大小；导入：解密 + 解压 + 解码的耗时（不含密钥派生）
+- vault.dat：整体重写的耗时和文件大小（只有超过 compression_min_size 的记录会压缩），以及 load() 耗时
+
+用法: python -m benchmarks.bench_compression [账号数量] [重复次数]
+"""
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Callable
+
+from benchmarks.synthetic import PASSWORD, make_storage
+from vault.storage import PayloadCompressor, VaultStorage
+
+_SETTINGS = [("none", 0), ("zlib", 1), ("zlib", 6), ("zlib", 9), ("lzma", 6)]
+_LONG_NOTE_PHRASES = [
+    "服务器地址和端口见运维文档", "登录后需要在十分钟内完成二次验证", "密钥轮换记录：",
+    "恢复码：", "合同编号与续费日期", "共享给了设计部的三位同事", "注意不要在公共电脑上登录",
+]
+
+
+def _add_long_notes(storage: VaultStorage, seed: int = 0):
+    rnd = random.Random(seed)
+    for i, a in enumerate(list(storage.vault.accounts)):
+        if i % 10 == 0:
+            lines = (rnd.choice(_LONG_NOTE_PHRASES) + f"{rnd.getrandbits(64):016x}" for _ in range(rnd.randint(50, 200)))
+            a.notes = "\n".join(lines)
+            storage.update_account(a)
+    storage.save()
+
+
+def _best_ms(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(n_accounts: int = 20000, repeat: int = 3) -> dict:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = make_storage(os.path.join(tmp, "vault.dat"), 20, n_accounts)
+        _add_long_notes(storage)
+        expected = [asdict(a) for a in storage.vault.accounts]
+        for algorithm, level in _SETTINGS:
+            storage.compressor = PayloadCompressor(algorithm, level)
+            blob = storage.export_encrypted()
+            if [asdict(a) for a in storage._open_blob(io.BytesIO(blob), None)[3]] != expected:
+                raise AssertionError(f"{algorithm}-{level} 导入后的账号不一致")
+
+            def rewrite():
+                storage._mark_rewrite()
+                storage.save()
+
+            rewrite_ms = _best_ms(rewrite, repeat)
+            results.append({
+                "setting": algorithm if algorithm == "none" else f"{algorithm}-{level}",
+                "export_ms": _best_ms(storage.export_encrypted, repeat),
+                "export_bytes": len(blob),
+                "import_ms": _best_ms(lambda: storage._open_blob(io.BytesIO(blob), None), repeat),
+                "rewrite_ms": rewrite_ms,
+                "file_bytes": os.path.getsize(storage.path),
+                "load_ms": _best_ms(lambda: VaultStorage(storage.path).load(PASSWORD), repeat),
+            })
+    return {"accounts": n_accounts, "results": results}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 20000
+    repeat = int(argv[1]) if len(argv) > 1 else 3
+    r = run(n_accounts, repeat)
+    print(f"账号数: {r['accounts']}（每十个账号一条长备注）")
+    print(f"{'压缩':<10}{'导出(ms)':>10}{'导出文件(KB)':>14}{'导入(ms)':>10}"
+          f"{'重写(ms)':>10}{'vault.dat(KB)':>15}{'解锁(ms)':>10}")
+    for x in r["results"]:
+        print(f"{x['setting']:<10}{x['export_ms']:>10.1f}{x['export_bytes'] / 1024:>14.0f}{x['import_ms']:>10.1f}"
+              f"{x['rewrite_ms']:>10.1f}{x['file_bytes'] / 1024:>15.0f}{x['load_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
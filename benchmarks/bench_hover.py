@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+卡片悬停的样式重算基准
+
+用 QProxyStyle 统计 polish 调用次数，模拟鼠标依次划过一排 AccountCard（每张卡片先后收到 Enter/Leave 事件并重绘），
+对比两种悬停实现的 polish 次数和耗时：
+- 原实现：修改动态属性后 unpolish/polish，整个应用样式表对卡片重新匹配
+- 当前实现：记录悬停状态后只重绘，背景和边框由卡片自己绘制
+当前实现在划过期间不应有任何 polish 调用。
+
+用法: python -m benchmarks.bench_hover [卡片数量] [划过次数]
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen
+"""
+import sys
+import time
+
+from PyQt5 import QtCore, QtWidgets
+
+from vault.card_view import AccountCard
+from vault.models import Account, gen_id
+from vault.style import load_app_style
+
+
+class _CountingStyle(QtWidgets.QProxyStyle):
+    """统计对控件的 polish 调用次数"""
+
+    def __init__(self):
+        super().__init__()
+        self.widget_polishes = 0
+
+    def polish(self, target):
+        if isinstance(target, QtWidgets.QWidget):
+            self.widget_polishes += 1
+        return super().polish(target)
+
+
+class _LegacyHoverCard(AccountCard):
+    """原来的悬停实现：修改动态属性后 unpolish/polish"""
+
+    def enterEvent(self, event):
+        self.setProperty("hovered", True)
+        self.style().unpolish(self)
+        self.style().polish(self)
+        self.update()
+        QtWidgets.QFrame.enterEvent(self, event)
+
+    def leaveEvent(self, event):
+        self.setProperty("hovered", False)
+        self.style().unpolish(self)
+        self.style().polish(self)
+        self.update()
+        QtWidgets.QFrame.leaveEvent(self, event)
+
+
+def _sweep(app: QtWidgets.QApplication, style: _CountingStyle, card_cls, n_cards: int, sweeps: int) -> dict:
+    container = QtWidgets.QWidget()
+    layout = QtWidgets.QGridLayout(container)
+    cards = []
+    for i in range(n_cards):
+        account = Account(id=gen_id(), name=f"site-{i}", username=f"user{i}@example.com",
+                          password="pw", url=f"https://site{i}.example.com")
+        card = card_cls(account, "默认分组", False)
+        layout.addWidget(card, i // 3, i % 3)
+        cards.append(card)
+    container.resize(1200, 800)
+    container.show()
+    app.processEvents()
+
+    style.widget_polishes = 0
+    start = time.perf_counter()
+    for _ in range(sweeps):
+        for card in cards:
+            QtWidgets.QApplication.sendEvent(card, QtCore.QEvent(QtCore.QEvent.Enter))
+            app.processEvents()
+            QtWidgets.QApplication.sendEvent(card, QtCore.QEvent(QtCore.QEvent.Leave))
+            app.processEvents()
+    elapsed = time.perf_counter() - start
+    polishes = style.widget_polishes
+    container.hide()
+    container.deleteLater()
+    app.processEvents()
+    crossings = n_cards * sweeps
+    return {"polishes": polishes, "ms": elapsed * 1000, "ms_per_crossing": elapsed * 1000 / crossings}
+
+
+def run(n_cards: int = 30, sweeps: int = 20) -> dict:
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    style = _CountingStyle()
+    app.setStyle(style)
+    app.setStyleSheet(load_app_style())
+    return {
+        "cards": n_cards,
+        "crossings": n_cards * sweeps,
+        "legacy": _sweep(app, style, _LegacyHoverCard, n_cards, sweeps),
+        "current": _sweep(app, style, AccountCard, n_cards, sweeps),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_cards = int(argv[0]) if len(argv) > 0 else 30
+    sweeps = int(argv[1]) if len(argv) > 1 else 20
+    r = run(n_cards, sweeps)
+    print(f"卡片数: {r['cards']}  鼠标划过次数: {r['crossings']}")
+    print(f"{'实现':<12}{'polish次数':>12}{'总耗时(ms)':>12}{'每次划过(ms)':>14}")
+    for name, key in (("原实现", "legacy"), ("当前实现", "current")):
+        x = r[key]
+        print(f"{name:<12}{x['polishes']:>12}{x['ms']:>12.1f}{x['ms_per_crossing']:>14.3f}")
+    if r["current"]["polishes"]:
+        raise SystemExit("悬停过程中不应触发 polish")
+
+
+if __name__ == "__main__":
+    main()
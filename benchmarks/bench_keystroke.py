@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+搜索框按键到绘制完成的延迟基准
+
+在主窗口中逐字输入一个查询（g → gi → git → …），每次按键后立即执行筛选并同步重绘卡片列表，
+记录从修改搜索框到后台搜索送回结果、绘制完成的耗时（不含防抖等待）。
+
+用法: python -m benchmarks.bench_keystroke [账号数量] [查询]
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen
+"""
+import os
+import sys
+import tempfile
+import time
+
+from PyQt5 import QtCore, QtWidgets
+
+from vault.main_window import MainWindow
+from vault.models import Account, gen_id
+from vault.storage import VaultStorage
+
+PASSWORD = "benchmark-master-password"
+_SITES = ["github", "gitlab", "google", "mail", "bank", "steam", "shop", "工作", "银行"]
+
+
+def _make_storage(path: str, n_accounts: int) -> VaultStorage:
+    storage = VaultStorage(path)
+    storage.create_new(PASSWORD)
+    gid = storage.default_group_id()
+    for i in range(n_accounts):
+        site = _SITES[i % len(_SITES)]
+        storage.add_account(Account(
+            id=gen_id(),
+            name=f"{site}-{i}",
+            username=f"user{i}@{_SITES[(i * 7) % len(_SITES)]}.com",
+            password=f"pw-{i:08d}",
+            url=f"https://{site}.example.com/{i}",
+            group_id=gid,
+        ))
+    return storage
+
+
+def _keystroke(app: QtWidgets.QApplication, window: MainWindow, text: str) -> float:
+    start = time.perf_counter()
+    window.search_edit.setText(text)
+    window._apply_filter()
+    while window._search.busy:
+        app.processEvents(QtCore.QEventLoop.WaitForMoreEvents)
+    window.card_list.viewport().repaint()
+    elapsed = time.perf_counter() - start
+    app.processEvents()
+    return elapsed
+
+
+def run(n_accounts: int = 2000, query: str = "github") -> dict:
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as tmp:
+        return _run(app, _make_storage(os.path.join(tmp, "vault.dat"), n_accounts), n_accounts, query)
+
+
+def _run(app: QtWidgets.QApplication, storage: VaultStorage, n_accounts: int, query: str) -> dict:
+    window = MainWindow(storage, load_data=False)
+    window.resize(1200, 800)
+    window.show()
+    window._load_data()
+    # 显示全部分组，使筛选覆盖所有账号
+    window.group_tree.clearSelection()
+    app.processEvents()
+
+    prefixes = [query[:i] for i in range(1, len(query) + 1)]
+    _keystroke(app, window, "")
+    latencies = [_keystroke(app, window, text) * 1000 for text in prefixes]
+
+    window._save_scheduler.shutdown()
+    window._search.shutdown()
+    window.hide()
+    window.deleteLater()
+    return {
+        "accounts": n_accounts,
+        "keystrokes": [{"text": t, "ms": ms} for t, ms in zip(prefixes, latencies)],
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 2000
+    query = argv[1] if len(argv) > 1 else "github"
+    r = run(n_accounts, query)
+    print(f"账号数: {r['accounts']}")
+    print(f"{'输入':<12}{'耗时(ms)':>12}")
+    for k in r["keystrokes"]:
+        print(f"{k['text']:<12}{k['ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
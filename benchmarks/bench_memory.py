@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+账号对象内存占用基准
+
+与反序列化相同，先把合成保险库的 JSON 解析为字典，再创建账号对象并丢弃字典，
+用 tracemalloc 统计留存的内存，折算为每个账号的字节数。对比：
+- 原实现：普通 dataclass（每个实例带 __dict__），Account(**d) 创建，每个账号各有一份分组ID字符串
+- 当前实现：slots dataclass，Account.from_dict 按位置传参创建，分组ID驻留后共用
+同时记录创建全部账号的耗时，并检查 asdict 的结果与原字典一致。
+
+用法: python -m benchmarks.bench_memory [账号数量] [分组数量]
+"""
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional
+
+from benchmarks.synthetic import make_vault
+from vault.models import Account
+
+
+@dataclass
+class _LegacyAccount:
+    id: str
+    name: str
+    username: str
+    password: str
+    url: str = ""
+    notes: str = ""
+    group_id: Optional[str] = None
+
+
+def _legacy_build(dicts: List[dict]) -> list:
+    return [_LegacyAccount(**d) for d in dicts]
+
+
+def _current_build(dicts: List[dict]) -> list:
+    return [Account.from_dict(d) for d in dicts]
+
+
+def _retained_bytes(text: str, build: Callable[[List[dict]], list]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        dicts = json.loads(text)["accounts"]
+        accounts = build(dicts)
+        del dicts
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del accounts
+    return retained
+
+
+def _build_ms(text: str, build: Callable[[List[dict]], list]) -> float:
+    dicts = json.loads(text)["accounts"]
+    start = time.perf_counter()
+    build(dicts)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(n_accounts: int = 100000, n_groups: int = 20) -> dict:
+    data = make_vault(n_groups, n_accounts).to_dict()
+    text = json.dumps(data, ensure_ascii=False)
+    for d, a in zip(data["accounts"], _current_build(json.loads(text)["accounts"])):
+        if asdict(a) != d:
+            raise AssertionError(f"asdict 结果与原字典不一致: {d['id']}")
+    legacy = _retained_bytes(text, _legacy_build)
+    current = _retained_bytes(text, _current_build)
+    return {
+        "accounts": n_accounts,
+        "groups": n_groups,
+        "legacy_bytes": legacy / n_accounts,
+        "current_bytes": current / n_accounts,
+        "legacy_ms": _build_ms(text, _legacy_build),
+        "current_ms": _build_ms(text, _current_build),
+        "reduction": 1 - current / legacy if legacy else 0.0,
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 100000
+    n_groups = int(argv[1]) if len(argv) > 1 else 20
+    r = run(n_accounts, n_groups)
+    print(f"账号数: {r['accounts']}  分组数: {r['groups']}")
+    print(f"{'实现':<10}{'每个账号(字节)':>16}{'创建耗时(ms)':>14}")
+    print(f"{'原实现':<10}{r['legacy_bytes']:>16.0f}{r['legacy_ms']:>14.1f}")
+    print(f"{'当前实现':<10}{r['current_bytes']:>16.0f}{r['current_ms']:>14.1f}")
+    print(f"内存减少: {r['reduction'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+分块并行加解密基准
+
+对一段随机数据（模拟带大量备注或附件的保险库明文）按 v6 导出格式分块，统计不同线程数和分块大小下
+StreamCipher.seal_chunks / open_chunks 的吞吐量（MB/s），并与同一数据单块 AES-GCM 加密对比。
+线程数超过 CPU 核数后吞吐量不再增长；单核环境下多线程只有调度开销。
+
+用法: python -m benchmarks.bench_parallel [数据大小MB] [重复次数]
+"""
+import io
+import os
+import sys
+import time
+from typing import Callable
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from vault.crypto import NONCE_SIZE, StreamCipher
+
+_CHUNK_SIZES = [64 * 1024, 256 * 1024, 1024 * 1024]
+
+
+def _best_seconds(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _worker_counts() -> list:
+    cpus = os.cpu_count() or 1
+    counts = [1, 2, 4, 8]
+    counts += [n for n in (cpus, cpus * 2) if n not in counts]
+    return sorted(counts)
+
+
+def run(size_mb: int = 64, repeat: int = 3) -> dict:
+    data = os.urandom(size_mb * 1024 * 1024)
+    key = os.urandom(32)
+    mb = len(data) / 1024 / 1024
+    single = AESGCM(key)
+    nonce = os.urandom(NONCE_SIZE)
+    results = {
+        "size_mb": size_mb,
+        "cpus": os.cpu_count() or 1,
+        "single_shot_mbps": mb / _best_seconds(lambda: single.encrypt(nonce, data, None), repeat),
+        "rows": [],
+    }
+    for chunk_size in _CHUNK_SIZES:
+        cipher = StreamCipher(key, StreamCipher.new_prefix(), b"bench", chunk_size)
+        sealed = io.BytesIO()
+        cipher.seal_chunks(data, sealed, 1)
+        sealed = sealed.getvalue()
+        for workers in _worker_counts():
+            check = io.BytesIO()
+            cipher.open_chunks(io.BytesIO(sealed), check, len(data), workers)
+            if check.getvalue() != data:
+                raise AssertionError("解密结果与原数据不一致")
+            seal_s = _best_seconds(lambda: cipher.seal_chunks(data, io.BytesIO(), workers), repeat)
+            open_s = _best_seconds(lambda: cipher.open_chunks(io.BytesIO(sealed), io.BytesIO(), len(data), workers),
+                                   repeat)
+            results["rows"].append({
+                "chunk_kb": chunk_size // 1024,
+                "workers": workers,
+                "seal_mbps": mb / seal_s,
+                "open_mbps": mb / open_s,
+            })
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    size_mb = int(argv[0]) if len(argv) > 0 else 64
+    repeat = int(argv[1]) if len(argv) > 1 else 3
+    r = run(size_mb, repeat)
+    print(f"数据大小: {r['size_mb']} MB  CPU核数: {r['cpus']}")
+    print(f"单块 AES-GCM 加密: {r['single_shot_mbps']:.0f} MB/s")
+    print(f"{'分块(KB)':>10}{'线程数':>8}{'加密(MB/s)':>14}{'解密(MB/s)':>14}")
+    for x in r["rows"]:
+        print(f"{x['chunk_kb']:>10}{x['workers']:>8}{x['seal_mbps']:>14.0f}{x['open_mbps']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
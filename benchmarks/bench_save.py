@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+保存延迟微基准
+
+修改一个账号后保存，对比三种保存路径：
+- 每次保存都从主密码重新派生密钥并重写整个密文块（encrypt(password, data)）
+- 复用会话密钥，但仍重写整个密文块（v2 单密文块格式）
+- 记录日志格式，只追加被修改的记录（VaultStorage.save）
+计时前先检查记录日志的崩溃恢复：截断最后一个批次时丢弃未提交的尾部，已提交批次中间的帧损坏时报错。
+
+用法: python -m benchmarks.bench_save [账号数量] [保存次数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from vault.crypto import encrypt
+from vault.models import Account, gen_id
+from vault.storage import VaultError, VaultStorage
+
+PASSWORD = "benchmark-master-password"
+
+
+def _make_storage(path: str, n_accounts: int) -> VaultStorage:
+    storage = VaultStorage(path)
+    storage.create_new(PASSWORD)
+    gid = storage.default_group_id()
+    for i in range(n_accounts):
+        storage.add_account(Account(
+            id=gen_id(),
+            name=f"site-{i}",
+            username=f"user{i}@example.com",
+            password=f"pw-{i:08d}",
+            url=f"https://site-{i}.example.com/login",
+            group_id=gid,
+        ))
+    storage.save()
+    return storage
+
+
+def check_recovery(path: str, n_batches: int = 10):
+    """在已有的保险库后追加 n_batches 个批次，检查未提交尾部和已提交内容损坏两种情况"""
+    storage = VaultStorage(path)
+    storage.load(PASSWORD)
+    gid = storage.default_group_id()
+    batch_ends = []
+    for i in range(n_batches):
+        storage.add_account(Account(id=gen_id(), name=f"batch-{i}", username=f"batch{i}@example.com",
+                                    password=f"pw-batch-{i}", group_id=gid))
+        storage.save()
+        batch_ends.append(os.path.getsize(path))
+    with open(path, "rb") as f:
+        data = f.read()
+    expected = len(storage.vault.accounts)
+    damaged = path + ".damaged"
+    try:
+        # 最后一个批次只写了一半：丢弃该批次，其余数据完整
+        with open(damaged, "wb") as f:
+            f.write(data[:(batch_ends[-2] + batch_ends[-1]) // 2])
+        torn = VaultStorage(damaged)
+        torn.load(PASSWORD)
+        if len(torn.vault.accounts) != expected - 1 or torn.recovered_bytes == 0:
+            raise AssertionError("未提交的尾部没有被正确丢弃")
+        # 已提交批次中间的一个字节损坏：必须报错，不能把之后的批次当作未提交的尾部丢弃
+        middle = bytearray(data)
+        middle[(batch_ends[n_batches // 2 - 1] + batch_ends[n_batches // 2]) // 2] ^= 0xFF
+        with open(damaged, "wb") as f:
+            f.write(middle)
+        try:
+            VaultStorage(damaged).load(PASSWORD)
+        except VaultError:
+            pass
+        else:
+            raise AssertionError("已提交的内容损坏时加载没有报错")
+    finally:
+        os.remove(damaged)
+
+
+def _time_per_call(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def run(n_accounts: int = 1000, repeat: int = 5) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vault.dat")
+        blob_path = os.path.join(tmp, "vault.blob")
+        storage = _make_storage(path, n_accounts)
+        check_recovery(path)
+        storage.load(PASSWORD)
+        counter = [0]
+        account_ids = [a.id for a in storage.vault.accounts]
+
+        def edit_one():
+            counter[0] += 1
+            account = storage.get_account(account_ids[counter[0] % n_accounts])
+            account.password = f"changed-{counter[0]}"
+            storage.update_account(account)
+
+        def save_rederive():
+            edit_one()
+            encrypted_data = encrypt(PASSWORD, storage._serialize())
+            with open(blob_path, "wb") as f:
+                f.write(encrypted_data)
+
+        def save_session_blob():
+            edit_one()
+            encrypted_data = storage._encrypt_blob(storage._serialize())
+            with open(blob_path, "wb") as f:
+                f.write(encrypted_data)
+
+        def save_record_log():
+            edit_one()
+            storage.save()
+
+        rederive = _time_per_call(save_rederive, repeat)
+        session_blob = _time_per_call(save_session_blob, repeat)
+        record_log = _time_per_call(save_record_log, repeat)
+    return {
+        "accounts": n_accounts,
+        "save_rederive_ms": rederive * 1000,
+        "save_session_key_ms": session_blob * 1000,
+        "save_record_log_ms": record_log * 1000,
+        "speedup": rederive / record_log if record_log else float("inf"),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 1000
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    r = run(n_accounts, repeat)
+    print(f"账号数: {r['accounts']}")
+    print(f"每次重新派生密钥并重写全部: {r['save_rederive_ms']:.2f} ms/次")
+    print(f"复用会话密钥并重写全部:     {r['save_session_key_ms']:.2f} ms/次")
+    print(f"记录日志只追加变更:         {r['save_record_log_ms']:.2f} ms/次")
+    print(f"加速比: {r['speedup']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+搜索延迟微基准
+
+对比两种搜索方式在不同查询下的耗时（结果必须一致）：
+- 逐账号扫描：对每个账号的名称/用户名/网址做正则或子序列匹配（原搜索框实现）
+- 搜索索引：字符位图求候选集后批量验证（SearchIndex.search）
+另外统计对命中结果打分并取前 K 条（SearchIndex.rank）的耗时。
+运行前先检查正则预筛选：对 PREFILTER_QUERIES 中的转义、字符类和内联标志写法，
+索引的正则命中必须与逐账号 re.search 完全一致。
+
+用法: python -m benchmarks.bench_search [账号数量] [重复次数]
+"""
+import random
+import re
+import sys
+import time
+
+from vault.models import Account, gen_id
+from vault.search import SearchIndex, is_regex_query
+
+_WORDS = ["github", "google", "mail", "bank", "alipay", "taobao", "steam", "apple",
+          "cloud", "shop", "工作", "微信", "银行", "邮箱", "站点", "家庭"]
+QUERIES = ["gh", "github", "gml", "工作邮", "user42", "zzzz", r"mail\.com", "^bank.*[0-9]$"]
+# 容易让字面量提取出错的正则：转义写法的字符、以 ] 开头的字符类、内联标志
+PREFILTER_QUERIES = [r"\x61il", r"\x61b", r"\u5de5\u4f5c", r"\101pple", r"\147ithub", r"[^]a]", r"[]a]p",
+                     r"[^]x]i", r"(?x) m a i l", r"(?i)MAIL\.com", r"s\tea|\x6dail", r"b\x61nk\d"]
+
+
+def _make_accounts(n_accounts: int, seed: int = 0):
+    rnd = random.Random(seed)
+    accounts = []
+    for i in range(n_accounts):
+        site = rnd.choice(_WORDS)
+        accounts.append(Account(
+            id=gen_id(),
+            name=f"{site}{rnd.choice(_WORDS)}-{i}",
+            username=f"user{rnd.randint(0, 99999)}@{rnd.choice(_WORDS)}.com",
+            password="pw",
+            url=f"https://{site}.example.com/{i}",
+        ))
+    return accounts
+
+
+def _subsequence(pattern: str, text: str) -> bool:
+    it = iter(text)
+    return all(c in it for c in pattern)
+
+
+def _linear_search(query: str, accounts) -> set:
+    pattern = None
+    if is_regex_query(query):
+        try:
+            pattern = re.compile(query, re.IGNORECASE)
+        except re.error:
+            pattern = None
+    lower = query.lower()
+    result = set()
+    for a in accounts:
+        fields = (a.name or "", a.username or "", a.url or "")
+        if pattern is not None and any(pattern.search(f) for f in fields):
+            result.add(a.id)
+        elif any(_subsequence(lower, f.lower()) for f in fields):
+            result.add(a.id)
+    return result
+
+
+def _regex_scan(query: str, accounts) -> set:
+    pattern = re.compile(query, re.IGNORECASE)
+    return {a.id for a in accounts
+            if any(pattern.search(f) for f in (a.name or "", a.username or "", a.url or ""))}
+
+
+def check_prefilter(index: SearchIndex, accounts):
+    """索引的正则命中（经过字面量预筛选）必须与逐账号全量扫描一致"""
+    for q in PREFILTER_QUERIES:
+        hits = {index._doc_aid[doc] for doc in index._regex_hits(q)}
+        if hits != _regex_scan(q, accounts):
+            raise AssertionError(f"正则预筛选漏掉了结果: {q!r}")
+
+
+def _cold_search(index: SearchIndex, query: str):
+    # 不利用上一次查询的结果，测量完整查找的耗时
+    index._forget_last_query()
+    return index.search(query)
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n_accounts: int = 10000, repeat: int = 3, limit: int = 200) -> dict:
+    accounts = _make_accounts(n_accounts)
+    start = time.perf_counter()
+    index = SearchIndex(accounts)
+    build = time.perf_counter() - start
+    check_prefilter(index, accounts)
+    queries = []
+    for q in QUERIES:
+        expected = _linear_search(q, accounts)
+        if index.search(q) != expected:
+            raise AssertionError(f"搜索结果不一致: {q!r}")
+        queries.append({
+            "query": q,
+            "matches": len(expected),
+            "linear_ms": _best_of(lambda: _linear_search(q, accounts), repeat) * 1000,
+            "index_ms": _best_of(lambda: _cold_search(index, q), repeat) * 1000,
+            "rank_ms": _best_of(lambda: index.rank(q, limit, expected), repeat) * 1000,
+        })
+    return {"accounts": n_accounts, "build_ms": build * 1000, "queries": queries}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 10000
+    repeat = int(argv[1]) if len(argv) > 1 else 3
+    r = run(n_accounts, repeat)
+    print(f"账号数: {r['accounts']}  建立索引: {r['build_ms']:.1f} ms")
+    print(f"{'查询':<16}{'命中':>8}{'逐个扫描(ms)':>14}{'索引(ms)':>10}{'排序前200(ms)':>16}")
+    for q in r["queries"]:
+        print(f"{q['query']:<16}{q['matches']:>8}{q['linear_ms']:>14.2f}{q['index_ms']:>10.2f}{q['rank_ms']:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+搜索期间的界面停顿基准
+
+在主窗口中执行几种查询，对比界面事件循环的最长停顿：
+- 原实现：在GUI线程中同步查找和打分，整个过程界面无法响应（停顿即总耗时）
+- 后台搜索：查找在后台线程、正则在限时的子进程中进行，用 5 ms 定时器测量事件循环两次响应之间的最长间隔，
+  同时记录结果送达的耗时
+保险库中有一个用户名为长串字母 a 的账号，(a+)+$ 在它上面会发生回溯爆炸：
+串长每加一，原实现的耗时约翻一倍；后台搜索在 search_regex_timeout 后放弃正则部分，只显示模糊匹配结果。
+
+用法: python -m benchmarks.bench_search_stall [账号数量] [回溯串长度]
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen
+"""
+import os
+import sys
+import tempfile
+import time
+
+from PyQt5 import QtCore, QtWidgets
+
+from benchmarks.bench_keystroke import _make_storage
+from vault.config import get_ui_config
+from vault.main_window import MainWindow
+from vault.models import Account, gen_id
+from vault.storage import VaultStorage
+
+QUERIES = ["github", "git.*b", "(a+)+$"]
+
+
+def _legacy_ms(storage: VaultStorage, query: str) -> float:
+    index = storage.search_index
+    index._forget_last_query()
+    start = time.perf_counter()
+    matched = index.search(query)
+    index.rank(query, get_ui_config().get('search_rank_limit', 50), matched)
+    return (time.perf_counter() - start) * 1000
+
+
+def _background(app: QtWidgets.QApplication, window: MainWindow, query: str) -> dict:
+    ticks = []
+    timer = QtCore.QTimer()
+    timer.setInterval(5)
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    notes = []
+    window._search.finished.connect(lambda total, note, matched: notes.append(note))
+    window.search_edit.setText("")
+    window._apply_filter()
+    app.processEvents()
+
+    timer.start()
+    start = time.perf_counter()
+    ticks.append(start)
+    window.search_edit.setText(query)
+    window._apply_filter()
+    while window._search.busy:
+        app.processEvents(QtCore.QEventLoop.WaitForMoreEvents)
+    done = time.perf_counter()
+    timer.stop()
+    window._search.finished.disconnect()
+    window._search.finished.connect(window._on_search_finished)
+    ticks.append(done)
+    stall = max(b - a for a, b in zip(ticks, ticks[1:]))
+    return {"stall_ms": stall * 1000, "result_ms": (done - start) * 1000, "note": notes[-1] if notes else ""}
+
+
+def run(n_accounts: int = 20000, evil_length: int = 22) -> dict:
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = _make_storage(os.path.join(tmp, "vault.dat"), n_accounts)
+        storage.add_account(Account(id=gen_id(), name="evil", username="a" * evil_length + "!",
+                                    password="pw", group_id=storage.default_group_id()))
+        window = MainWindow(storage, load_data=False)
+        window.resize(1200, 800)
+        window.show()
+        window._load_data()
+        window.group_tree.clearSelection()
+        app.processEvents()
+        try:
+            # 先执行一次正则查询，让子进程启动并收到字段原文，不计入各项测量
+            _background(app, window, "g.*")
+            results = []
+            for query in QUERIES:
+                results.append({"query": query, "legacy_ms": _legacy_ms(storage, query),
+                                **_background(app, window, query)})
+        finally:
+            window._save_scheduler.shutdown()
+            window._search.shutdown()
+            window.hide()
+            window.deleteLater()
+    return {"accounts": n_accounts + 1, "evil_length": evil_length, "results": results}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 20000
+    evil_length = int(argv[1]) if len(argv) > 1 else 22
+    r = run(n_accounts, evil_length)
+    print(f"账号数: {r['accounts']}  回溯串长度: {r['evil_length']}  "
+          f"正则时间预算: {get_ui_config().get('search_regex_timeout', 500)} ms")
+    print(f"{'查询':<10}{'原实现停顿(ms)':>16}{'后台最长停顿(ms)':>18}{'结果送达(ms)':>14}  提示")
+    for x in r["results"]:
+        print(f"{x['query']:<10}{x['legacy_ms']:>16.1f}{x['stall_ms']:>18.1f}{x['result_ms']:>14.1f}  {x['note']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准和延迟导入检查
+
+在子进程中以 --profile-startup 运行 app.py（合成保险库，主密码对话框自动以基准密码确认），
+多次运行取各阶段耗时的中位数，并检查：
+- 显示主密码对话框时没有导入存储、加密、主窗口等模块（这些模块在输入主密码后才需要）
+- 主窗口首次绘制时没有导入设置对话框和配置编辑器（打开时才导入）
+检查不通过时以非零状态退出。
+
+用法: python -m benchmarks.bench_startup [账号数量] [运行次数]
+无显示器的环境会自动使用 QT_QPA_PLATFORM=offscreen
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+from benchmarks.synthetic import PASSWORD, make_storage
+from vault.startup_profile import STAGE_NAMES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 显示主密码对话框之前不应导入的模块（按前缀匹配）
+NOT_BEFORE_PROMPT = (
+    "cryptography", "vault.crypto", "vault.storage", "vault.unlock", "vault.main_window",
+    "vault.card_view", "vault.search", "vault.search_worker", "vault.regex_sandbox",
+    "vault.save_scheduler", "vault.settings_dialog", "vault.config_editor_dialog",
+)
+# 主窗口显示后仍不应导入的模块（用到时才导入）
+NOT_AT_FIRST_PAINT = ("vault.settings_dialog", "vault.config_editor_dialog")
+
+# 子进程：导入 app 后让主密码对话框直接以基准密码确认，再按 --profile-startup 启动
+_DRIVER = """
+import json, sys
+data_path, password = sys.argv[1:3]
+sys.argv = ["app.py", "--profile-startup"]
+import app
+from PyQt5 import QtWidgets
+from vault import config, startup_profile
+
+config.FILE_CONFIG["data_file"] = data_path
+app.MasterPasswordDialog.exec_ = lambda self: QtWidgets.QDialog.Accepted
+app.MasterPasswordDialog.get_password = lambda self: password
+_report = startup_profile.StartupProfiler.report
+
+def report(self):
+    print("RESULT " + json.dumps({"stages": self.stages, "prompt_modules": self.prompt_modules}))
+    return _report(self)
+
+startup_profile.StartupProfiler.report = report
+try:
+    app.main()
+except SystemExit:
+    pass
+print("LOADED " + json.dumps(startup_profile.prompt_modules()))
+"""
+
+
+def _matching(modules: List[str], prefixes) -> List[str]:
+    return [m for m in modules if any(m == p or m.startswith(p + ".") for p in prefixes)]
+
+
+def _run_once(data_path: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run([sys.executable, "-c", _DRIVER, data_path, PASSWORD], cwd=ROOT, env=env,
+                         capture_output=True, text=True, timeout=300)
+    result, loaded = None, None
+    for line in out.stdout.splitlines():
+        if line.startswith("RESULT "):
+            result = json.loads(line[len("RESULT "):])
+        elif line.startswith("LOADED "):
+            loaded = json.loads(line[len("LOADED "):])
+    if result is None or loaded is None:
+        raise RuntimeError(f"启动失败（退出码 {out.returncode}）:\n{out.stderr[-2000:]}")
+    result["loaded_modules"] = loaded
+    return result
+
+
+def run(n_accounts: int = 5000, runs: int = 3) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        data_path = os.path.join(tmp, "vault.dat")
+        make_storage(data_path, 10, n_accounts)
+        samples = [_run_once(data_path) for _ in range(runs)]
+    stages: Dict[str, List[float]] = {}
+    for sample in samples:
+        for stage, seconds in sample["stages"]:
+            stages.setdefault(stage, []).append(seconds * 1000)
+    last = samples[-1]
+    return {
+        "accounts": n_accounts,
+        "runs": runs,
+        "stages_ms": {stage: statistics.median(values) for stage, values in stages.items()},
+        "prompt_modules": last["prompt_modules"],
+        "early_imports": _matching(last["prompt_modules"], NOT_BEFORE_PROMPT),
+        "eager_imports": _matching(last["loaded_modules"], NOT_AT_FIRST_PAINT),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 5000
+    runs = int(argv[1]) if len(argv) > 1 else 3
+    r = run(n_accounts, runs)
+    print(f"账号数: {r['accounts']}  运行次数: {r['runs']}（中位数）")
+    for stage, ms in r["stages_ms"].items():
+        print(f"  {STAGE_NAMES.get(stage, stage):<12}{ms:>10.1f} ms")
+    print(f"  {'合计':<12}{sum(r['stages_ms'].values()):>10.1f} ms")
+    print(f"显示主密码对话框时已导入的本项目模块: {', '.join(r['prompt_modules'])}")
+    errors = []
+    if r["early_imports"]:
+        errors.append("显示主密码对话框前导入了: " + ", ".join(r["early_imports"]))
+    if r["eager_imports"]:
+        errors.append("主窗口首次绘制时已导入: " + ", ".join(r["eager_imports"]))
+    if errors:
+        raise SystemExit("\n".join(errors))
+    print("延迟导入检查通过")
+
+
+if __name__ == "__main__":
+    main()
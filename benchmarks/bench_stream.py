@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+分块流式加密基准
+
+用 tracemalloc 统计加解密过程中 Python 堆内存的峰值（不含加密前已经在内存中的明文），对比：
+- 导出：v2 单密文块（整体加密后拼接文件头）与 v6 分块流（逐块写入文件）
+- 导入：v2 读入整个文件后解密与 v6 从文件逐块解密
+- 解锁：解析记录日志时整个 vault.dat 读入内存（原实现）与只读映射文件（当前实现），峰值包含解析出的对象
+耗时在不启用 tracemalloc 时另行测量。明文使用不压缩的二进制编码，大小约等于保险库大小。
+
+用法: python -m benchmarks.bench_stream [账号数量]
+"""
+import gc
+import mmap
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from benchmarks.synthetic import make_storage
+from vault.crypto import STREAM_CHUNK_SIZE, decrypt_with_key
+from vault.storage import (
+    CHUNKED_FORMAT_VERSION, _MAX_HEADER_SIZE, VaultStorage, _read_stream, _unpack_header, _write_stream,
+)
+
+
+def _measure(fn: Callable[[], object]) -> Tuple[float, float]:
+    """返回 (峰值内存MB, 耗时ms)"""
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024, elapsed * 1000
+
+
+def _import_v2(storage: VaultStorage, path: str):
+    with open(path, "rb") as f:
+        blob = f.read()
+    offset = _unpack_header(blob)[4]
+    return decrypt_with_key(storage._session_key, blob[offset:])
+
+
+def _import_v6(storage: VaultStorage, path: str):
+    with open(path, "rb") as f:
+        offset = _unpack_header(f.read(_MAX_HEADER_SIZE))[4]
+        f.seek(0)
+        header = f.read(offset)
+        return _read_stream(storage._session_key, f, header, CHUNKED_FORMAT_VERSION)
+
+
+def _load_read_all(storage: VaultStorage):
+    with open(storage.path, "rb") as f:
+        data = f.read()
+    offset = _unpack_header(data)[4]
+    return VaultStorage._read_log(storage._session_key, data, offset)
+
+
+def _load_mmap(storage: VaultStorage):
+    with open(storage.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = _unpack_header(data)[4]
+        return VaultStorage._read_log(storage._session_key, data, offset)
+
+
+def run(n_accounts: int = 100000) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = make_storage(os.path.join(tmp, "vault.dat"), 20, n_accounts)
+        plain = storage._serialize()
+        v2_path, v6_path = os.path.join(tmp, "v2.mima"), os.path.join(tmp, "v6.mima")
+
+        def export_v2():
+            with open(v2_path, "wb") as f:
+                f.write(storage._encrypt_blob(plain))
+
+        def export_v6():
+            with open(v6_path, "wb") as f:
+                _write_stream(storage._session_key, plain, f, STREAM_CHUNK_SIZE)
+
+        results = {
+            "accounts": n_accounts,
+            "plain_mb": len(plain) / 1024 / 1024,
+            "export_v2": _measure(export_v2),
+            "export_v6": _measure(export_v6),
+            "import_v2": _measure(lambda: _import_v2(storage, v2_path)),
+            "import_v6": _measure(lambda: _import_v6(storage, v6_path)),
+        }
+        if _import_v2(storage, v2_path) != plain or _import_v6(storage, v6_path) != plain:
+            raise AssertionError("解密结果与明文不一致")
+        # 解锁：两者都包含解析出的对象，差别在于文件内容是否整体读入
+        results["load_read_all"] = _measure(lambda: _load_read_all(storage))
+        results["load_mmap"] = _measure(lambda: _load_mmap(storage))
+        results["file_mb"] = os.path.getsize(storage.path) / 1024 / 1024
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 100000
+    r = run(n_accounts)
+    print(f"账号数: {r['accounts']}  明文: {r['plain_mb']:.1f} MB  vault.dat: {r['file_mb']:.1f} MB")
+    print(f"{'场景':<24}{'峰值内存(MB)':>14}{'耗时(ms)':>12}")
+    rows = [
+        ("导出 v2 单密文块", "export_v2"), ("导出 v6 分块流", "export_v6"),
+        ("导入 v2 整体读入", "import_v2"), ("导入 v6 逐块解密", "import_v6"),
+        ("解锁 整体读入 vault.dat", "load_read_all"), ("解锁 映射 vault.dat", "load_mmap"),
+    ]
+    for label, key in rows:
+        peak, ms = r[key]
+        print(f"{label:<24}{peak:>14.1f}{ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
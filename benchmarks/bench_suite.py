@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+"""
+综合性能基准
+
+在同一个合成保险库（见 benchmarks.synthetic，固定随机种子）上测量各主要路径的耗时，
+每项取多次运行的中位数，结果写入 JSON，可与之前某次提交的结果比较：
+- storage.*：序列化/反序列化、修改一个账号后保存、整体重写、解锁加载、导入导出
+- crypto.*：用主密码加解密（含密钥派生）、用会话密钥加解密
+- search.*：按模拟的逐字输入序列执行搜索和打分
+- gui.*：主窗口加载数据、搜索筛选、分组筛选、刷新卡片列表和分组树（无显示器时使用 offscreen）
+
+与基准结果比较时，某项耗时超过 基准值 × (1 + 容差) + 固定余量 即视为性能退化，以非零状态退出。
+界面和密钥派生的波动较大，容差单独放宽（见 TOLERANCES）。
+
+用法:
+    python -m benchmarks.bench_suite [--accounts N] [--groups N] [--seed N] [--repeat N]
+                                     [--output 结果.json] [--baseline 基准.json] [--no-gui]
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import PASSWORD, make_storage, make_vault, query_traces
+from vault.crypto import decrypt, decrypt_with_key, encrypt, encrypt_with_key
+from vault.search import SearchIndex
+from vault.storage import VaultStorage
+
+# 默认容差（相对基准值的比例）；按名称前缀单独设置的容差优先
+DEFAULT_TOLERANCE = 0.3
+TOLERANCES = {
+    "gui.": 0.5,
+    "storage.load": 0.5,
+    "crypto.encrypt_password": 0.5,
+    "crypto.decrypt_password": 0.5,
+}
+# 固定余量（毫秒），避免耗时很短的项目因计时抖动被误判
+SLACK_MS = 2.0
+
+
+def _median_ms(fn: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> float:
+    # 与 timeit 相同，计时期间关闭垃圾回收，减少不同提交之间的抖动
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return statistics.median(samples) * 1000
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _storage_cases(storage: VaultStorage, tmp: str, repeat: int) -> Dict[str, float]:
+    results = {}
+    plain = storage._serialize()
+    results["storage.serialize"] = _median_ms(storage._serialize, repeat)
+    scratch = VaultStorage(os.path.join(tmp, "scratch.dat"))
+    results["storage.deserialize"] = _median_ms(lambda: scratch._deserialize(plain), repeat)
+
+    account_ids = list(storage.vault.account_ids())
+    counter = [0]
+
+    def edit_one():
+        counter[0] += 1
+        account = storage.get_account(account_ids[counter[0] % len(account_ids)])
+        account.notes = f"基准修改 {counter[0]}"
+        storage.update_account(account)
+
+    results["storage.save_one_edit"] = _median_ms(storage.save, repeat, setup=edit_one)
+    results["storage.save_rewrite"] = _median_ms(storage.save, repeat, setup=storage._mark_rewrite)
+    results["storage.load"] = _median_ms(lambda: VaultStorage(storage.path).load(PASSWORD), repeat)
+
+    text = storage.export_plain()
+    results["storage.export_plain"] = _median_ms(storage.export_plain, repeat)
+    target = {}
+
+    def fresh_target():
+        target["s"] = VaultStorage(os.path.join(tmp, "import.dat"))
+        target["s"].create_new(PASSWORD)
+
+    results["storage.import_plain"] = _median_ms(lambda: target["s"].import_plain(text, merge=False),
+                                                 repeat, setup=fresh_target)
+    results["storage.import_plain_merge"] = _median_ms(lambda: target["s"].import_plain(text, merge=True),
+                                                       repeat, setup=fresh_target)
+    blob = storage.export_encrypted()
+    results["storage.export_encrypted"] = _median_ms(storage.export_encrypted, repeat)
+    results["storage.import_encrypted"] = _median_ms(lambda: storage.import_encrypted(blob, merge=False), repeat)
+    return results
+
+
+def _crypto_cases(storage: VaultStorage, repeat: int) -> Dict[str, float]:
+    plain = storage._serialize()
+    sealed = encrypt(PASSWORD, plain)
+    session_key = storage._session_key
+    sealed_with_key = encrypt_with_key(session_key, plain)
+    return {
+        "crypto.encrypt_password": _median_ms(lambda: encrypt(PASSWORD, plain), repeat),
+        "crypto.decrypt_password": _median_ms(lambda: decrypt(PASSWORD, sealed), repeat),
+        "crypto.encrypt_session_key": _median_ms(lambda: encrypt_with_key(session_key, plain), repeat),
+        "crypto.decrypt_session_key": _median_ms(lambda: decrypt_with_key(session_key, sealed_with_key), repeat),
+    }
+
+
+def _search_cases(storage: VaultStorage, traces: List[Tuple[str, ...]], repeat: int) -> Dict[str, float]:
+    index = SearchIndex(storage.vault.accounts)
+
+    def run_traces():
+        for trace in traces:
+            for query in trace:
+                index._forget_last_query()
+                index.rank(query, 50, index.search(query))
+
+    return {
+        "search.build_index": _median_ms(lambda: SearchIndex(storage.vault.accounts), repeat),
+        "search.trace": _median_ms(run_traces, repeat),
+    }
+
+
+def _gui_cases(storage: VaultStorage, traces: List[Tuple[str, ...]], repeat: int) -> Dict[str, float]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5 import QtCore, QtWidgets
+    from vault.main_window import MainWindow
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    window = MainWindow(storage, load_data=False)
+    window.resize(1200, 800)
+    window.show()
+    app.processEvents()
+
+    def settle():
+        while window._search.busy:
+            app.processEvents(QtCore.QEventLoop.WaitForMoreEvents)
+        window.repaint()
+        app.processEvents()
+
+    def load():
+        window._load_data()
+        window.group_tree.clearSelection()
+        settle()
+
+    query = traces[0][-1]
+
+    def search(text: str):
+        window.search_edit.setText(text)
+        window._apply_filter()
+        settle()
+
+    state = {"i": 0}
+
+    def select_group():
+        state["i"] += 1
+        tree = window.group_tree
+        tree.setCurrentItem(tree.topLevelItem(state["i"] % tree.topLevelItemCount()))
+        settle()
+
+    try:
+        results = {"gui.load_data": _median_ms(load, repeat)}
+        results["gui.filter_search"] = _median_ms(lambda: search(query), repeat, setup=lambda: search(""))
+        search("")
+        results["gui.filter_group"] = _median_ms(select_group, repeat)
+        window.group_tree.clearSelection()
+        search("")
+        results["gui.refresh_table"] = _median_ms(lambda: (window._refresh_table(), settle()), repeat)
+        results["gui.refresh_groups"] = _median_ms(lambda: (window._refresh_groups(), settle()), repeat)
+    finally:
+        window._save_scheduler.shutdown()
+        window._search.shutdown()
+        window.hide()
+        window.deleteLater()
+        app.processEvents()
+    return results
+
+
+def run(n_accounts: int = 5000, n_groups: int = 10, seed: int = 0, repeat: int = 5, gui: bool = True) -> dict:
+    traces = query_traces(make_vault(n_groups, n_accounts, seed), seed=seed)
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = make_storage(os.path.join(tmp, "vault.dat"), n_groups, n_accounts, seed)
+        results.update(_crypto_cases(storage, repeat))
+        results.update(_search_cases(storage, traces, repeat))
+        if gui:
+            results.update(_gui_cases(storage, traces, repeat))
+        # 存储项最后运行：导入会替换保险库内容
+        results.update(_storage_cases(storage, tmp, repeat))
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "time": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "accounts": n_accounts,
+            "groups": n_groups,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results_ms": results,
+    }
+
+
+def _tolerance(name: str) -> float:
+    for prefix, tolerance in TOLERANCES.items():
+        if name.startswith(prefix):
+            return tolerance
+    return DEFAULT_TOLERANCE
+
+
+def compare(current: dict, baseline: dict) -> List[str]:
+    """返回相对基准结果退化的项目说明；数据规模不同时无法比较，抛出 ValueError"""
+    for key in ("accounts", "groups", "seed"):
+        if current["meta"][key] != baseline["meta"][key]:
+            raise ValueError(f"基准结果的 {key} 不同（{baseline['meta'][key]} ≠ {current['meta'][key]}），无法比较")
+    regressions = []
+    for name, base in baseline["results_ms"].items():
+        value = current["results_ms"].get(name)
+        if value is None:
+            continue
+        limit = base * (1 + _tolerance(name)) + SLACK_MS
+        if value > limit:
+            regressions.append(f"{name}: {value:.1f} ms，基准 {base:.1f} ms，上限 {limit:.1f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_suite", description="综合性能基准")
+    parser.add_argument("--accounts", type=int, default=5000, help="账号数量")
+    parser.add_argument("--groups", type=int, default=10, help="分组数量")
+    parser.add_argument("--seed", type=int, default=0, help="合成数据的随机种子")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数（取中位数）")
+    parser.add_argument("--output", help="结果写入的 JSON 文件")
+    parser.add_argument("--baseline", help="用于比较的基准结果 JSON 文件")
+    parser.add_argument("--no-gui", action="store_true", help="跳过主窗口相关的项目")
+    args = parser.parse_args(argv)
+
+    r = run(args.accounts, args.groups, args.seed, args.repeat, gui=not args.no_gui)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    meta = r["meta"]
+    print(f"提交: {meta['commit'] or '未知'}  账号数: {meta['accounts']}  分组数: {meta['groups']}  "
+          f"种子: {meta['seed']}  重复: {meta['repeat']} 次（中位数）")
+    print(f"{'项目':<30}{'耗时(ms)':>12}" + (f"{'基准(ms)':>12}{'变化':>10}" if baseline else ""))
+    for name, value in r["results_ms"].items():
+        line = f"{name:<30}{value:>12.2f}"
+        base = baseline["results_ms"].get(name) if baseline else None
+        if base:
+            line += f"{base:>12.2f}{(value / base - 1) * 100:>+9.1f}%"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(r, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入 {args.output}")
+    if baseline is not None:
+        try:
+            regressions = compare(r, baseline)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        if regressions:
+            raise SystemExit("性能退化:\n" + "\n".join(regressions))
+        print("没有超过容差的性能退化")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+设置更改后重新应用主题的耗时基准
+
+在装有大量账号的主窗口中，测量一次设置更改从重新应用样式到窗口同步重绘完成的耗时：
+- 原实现：重新拼接并对整个应用设置样式表，然后完整刷新卡片列表和分组树
+- 主题未变：样式表与当前相同，跳过 setStyleSheet，只让卡片重新读取主题并重绘可见部分
+- 主题已变：修改一种颜色后重新应用（全局样式表需要重新设置）
+分别在模型/视图（delegate）和卡片复用池（widgets）两种卡片模式下运行，目标为 100 ms 以内。
+
+用法: python -m benchmarks.bench_theme [账号数量] [重复次数]
+无显示器的环境可设置 QT_QPA_PLATFORM=offscreen
+"""
+import os
+import sys
+import tempfile
+import time
+
+from PyQt5 import QtWidgets
+
+from benchmarks.bench_keystroke import _make_storage
+from vault import config
+from vault.main_window import MainWindow
+from vault.storage import VaultStorage
+from vault.style import _build_app_style
+from vault.theme import theme_config
+
+TARGET_MS = 100.0
+
+
+def _legacy_restyle(app: QtWidgets.QApplication, window: MainWindow):
+    app.setStyleSheet(_build_app_style(**theme_config()))
+    if window._card_pool is not None:
+        window._card_pool.reload_theme()
+    else:
+        window.card_list.itemDelegate().reload_theme()
+    window._refresh_table()
+    window._refresh_groups()
+
+
+def _timed(app: QtWidgets.QApplication, window: MainWindow, restyle, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        restyle()
+        window.repaint()
+        samples.append(time.perf_counter() - start)
+        app.processEvents()
+    samples.sort()
+    return samples[len(samples) // 2] * 1000
+
+
+def _measure(app: QtWidgets.QApplication, storage: VaultStorage, render_mode: str, repeat: int) -> dict:
+    config.UI_CONFIG['card_render_mode'] = render_mode
+    window = MainWindow(storage, load_data=False)
+    window.resize(1200, 800)
+    window.show()
+    window._load_data()
+    window.group_tree.clearSelection()
+    app.processEvents()
+
+    # 切换主题时来回修改一种没有被用户设置覆盖的颜色
+    overridden = config.get_user_settings().get('colors', {})
+    color_key = next(k for k in config.COLOR_THEME if k not in overridden)
+    original = config.COLOR_THEME[color_key]
+    colors = [original, "#101018"]
+    state = {"i": 0}
+
+    def switch_theme():
+        state["i"] += 1
+        config.COLOR_THEME[color_key] = colors[state["i"] % 2]
+        if not window._apply_theme():
+            raise RuntimeError("主题已修改但样式表没有重新设置")
+
+    try:
+        result = {
+            "mode": render_mode,
+            "legacy_ms": _timed(app, window, lambda: _legacy_restyle(app, window), repeat),
+            "unchanged_ms": _timed(app, window, window._apply_theme, repeat),
+            "changed_ms": _timed(app, window, switch_theme, repeat),
+        }
+    finally:
+        config.COLOR_THEME[color_key] = original
+        window._apply_theme()
+        window._save_scheduler.shutdown()
+        window._search.shutdown()
+        window.hide()
+        window.deleteLater()
+        app.processEvents()
+    return result
+
+
+def run(n_accounts: int = 10000, repeat: int = 5) -> dict:
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    render_mode = config.UI_CONFIG['card_render_mode']
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            storage = _make_storage(os.path.join(tmp, "vault.dat"), n_accounts)
+            results = [_measure(app, storage, mode, repeat) for mode in ("delegate", "widgets")]
+    finally:
+        config.UI_CONFIG['card_render_mode'] = render_mode
+    return {"accounts": n_accounts, "results": results}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 10000
+    repeat = int(argv[1]) if len(argv) > 1 else 5
+    r = run(n_accounts, repeat)
+    print(f"账号数: {r['accounts']}  目标: {TARGET_MS:.0f} ms 以内（中位数）")
+    print(f"{'卡片模式':<10}{'原实现(ms)':>12}{'主题未变(ms)':>14}{'主题已变(ms)':>14}")
+    slow = []
+    for x in r["results"]:
+        print(f"{x['mode']:<10}{x['legacy_ms']:>12.1f}{x['unchanged_ms']:>14.1f}{x['changed_ms']:>14.1f}")
+        if x["changed_ms"] > TARGET_MS:
+            slow.append(x["mode"])
+    if slow:
+        raise SystemExit(f"重新应用主题超过目标: {', '.join(slow)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+解锁延迟基准
+
+对比旧版v1文件（固定盐值派生 + 独立的主密码哈希验证）与当前格式（单次加盐派生）的 load() 耗时。
+v1 文件在首次 load() 时会迁移为当前格式，因此每轮都重新写入一份 v1 文件。
+
+用法: python -m benchmarks.bench_unlock [账号数量] [重复次数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from vault.crypto import encrypt, _crypto_manager
+from vault.models import Account, gen_id
+from vault.storage import VaultStorage, get_payload_codec
+
+PASSWORD = "benchmark-master-password"
+
+
+def _legacy_blob(storage: VaultStorage) -> bytes:
+    """按v1格式生成加密数据"""
+    storage._master_salt, storage._master_hash = _crypto_manager.create_master_hash(PASSWORD)
+    try:
+        # v1 文件的明文是 JSON
+        return encrypt(PASSWORD, storage._serialize(get_payload_codec("json")))
+    finally:
+        storage._master_salt, storage._master_hash = None, None
+
+
+def _time_legacy_verify(path: str, legacy: bytes) -> float:
+    """只计时v1的解锁部分（派生 + 解密 + 主密码哈希验证），不含迁移写入"""
+    storage = VaultStorage(path)
+    start = time.perf_counter()
+    session_key = _crypto_manager.derive_session_key(PASSWORD)
+    storage._deserialize(_crypto_manager.decrypt_with_key(session_key, legacy))
+    _crypto_manager.verify_master_password(PASSWORD, storage._master_salt, storage._master_hash)
+    return time.perf_counter() - start
+
+
+def run(n_accounts: int = 1000, repeat: int = 3) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vault.dat")
+        storage = VaultStorage(path)
+        storage.create_new(PASSWORD)
+        for i in range(n_accounts):
+            storage.add_account(Account(gen_id(), f"site-{i}", f"user{i}", f"pw-{i}"))
+        legacy = _legacy_blob(storage)
+        storage.save()
+
+        v1 = sum(_time_legacy_verify(path, legacy) for _ in range(repeat)) / repeat
+        start = time.perf_counter()
+        for _ in range(repeat):
+            VaultStorage(path).load(PASSWORD)
+        current = (time.perf_counter() - start) / repeat
+    return {
+        "accounts": n_accounts,
+        "unlock_v1_ms": v1 * 1000,
+        "unlock_current_ms": current * 1000,
+        "reduction": 1 - current / v1 if v1 else 0.0,
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    n_accounts = int(argv[0]) if len(argv) > 0 else 1000
+    repeat = int(argv[1]) if len(argv) > 1 else 3
+    r = run(n_accounts, repeat)
+    print(f"账号数: {r['accounts']}")
+    print(f"v1 解锁: {r['unlock_v1_ms']:.1f} ms")
+    print(f"当前格式解锁: {r['unlock_current_ms']:.1f} ms")
+    print(f"耗时降低: {r['reduction'] * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
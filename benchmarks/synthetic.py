@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+合成保险库生成器
+
+按随机种子生成分组、账号和搜索框的输入序列，同一种子每次生成的内容完全相同（包括ID），
+便于在不同提交之间比较基准结果。字段内容接近真实数据：
+- 名称：中英文站点名，部分带“工作”“备用”等后缀
+- 用户名：邮箱、手机号或中文昵称
+- 密码：12~24 位随机字符
+- 网址：带路径的 https 地址，少数为空
+- 备注：长短不一的中文句子，约四成为空
+"""
+import json
+import random
+import string
+from typing import List, Tuple
+
+from vault.config import get_text
+from vault.models import Account, Group, VaultData
+from vault.storage import VaultStorage
+
+PASSWORD = "benchmark-master-password"
+
+# (显示名称, 域名)
+_SITES = [
+    ("GitHub", "github.com"), ("GitLab", "gitlab.com"), ("Google", "google.com"),
+    ("Gmail", "mail.google.com"), ("Steam", "steampowered.com"), ("Apple ID", "appleid.apple.com"),
+    ("微信", "weixin.qq.com"), ("QQ邮箱", "mail.qq.com"), ("淘宝", "taobao.com"),
+    ("支付宝", "alipay.com"), ("京东", "jd.com"), ("招商银行", "cmbchina.com"),
+    ("工商银行", "icbc.com.cn"), ("阿里云", "aliyun.com"), ("腾讯云", "cloud.tencent.com"),
+    ("哔哩哔哩", "bilibili.com"), ("知乎", "zhihu.com"), ("网易邮箱", "mail.163.com"),
+    ("12306", "12306.cn"), ("中国移动", "10086.cn"),
+]
+_NAME_SUFFIXES = ["", "", "", " - 工作", " - 个人", "（备用）", " 测试号", " 家庭共享"]
+_GROUP_NAMES = ["工作", "个人", "银行金融", "社交", "购物", "游戏", "开发", "邮箱", "家庭", "学习"]
+_NICKNAMES = ["小明", "阿强", "张伟", "李娜", "王芳", "老陈", "设计部", "财务组"]
+_NOTE_PHRASES = [
+    "密保问题是小学名称", "两步验证绑定在旧手机上", "每三个月更换一次密码", "公司统一分配的账号",
+    "登录需要短信验证码", "备用邮箱已绑定", "年费会员到期前记得续费", "仅用于测试环境",
+    "恢复码保存在保险柜里", "和家人共用，修改前先通知",
+]
+_PASSWORD_CHARS = string.ascii_letters + string.digits + "!@#$%^&*-_"
+
+
+def _rand_id(rnd: random.Random) -> str:
+    return f"{rnd.getrandbits(128):032x}"
+
+
+def _username(rnd: random.Random, domain: str) -> str:
+    kind = rnd.random()
+    if kind < 0.6:
+        local = rnd.choice(["user", "admin", "dev", "test", "zhang", "li", "wang"]) + str(rnd.randint(1, 99999))
+        return f"{local}@{rnd.choice([domain, 'qq.com', '163.com', 'gmail.com'])}"
+    if kind < 0.85:
+        return "1" + "".join(rnd.choice(string.digits) for _ in range(10))
+    return rnd.choice(_NICKNAMES) + str(rnd.randint(1, 999))
+
+
+def _url(rnd: random.Random, domain: str) -> str:
+    if rnd.random() < 0.1:
+        return ""
+    path = "/".join(rnd.choice(["login", "account", "user", "settings", "zh-cn", "portal"])
+                    for _ in range(rnd.randint(0, 3)))
+    return f"https://{domain}/{path}"
+
+
+def _notes(rnd: random.Random) -> str:
+    if rnd.random() < 0.4:
+        return ""
+    return "，".join(rnd.sample(_NOTE_PHRASES, rnd.randint(1, 4))) + "。"
+
+
+def make_vault(n_groups: int, n_accounts: int, seed: int = 0) -> VaultData:
+    """生成包含 n_groups 个分组（第一个为默认分组）和 n_accounts 个账号的保险库数据"""
+    rnd = random.Random(seed)
+    names = [get_text('default_values', 'default_group') or "未分组"]
+    for i in range(1, max(n_groups, 1)):
+        base = _GROUP_NAMES[(i - 1) % len(_GROUP_NAMES)]
+        names.append(base if i <= len(_GROUP_NAMES) else f"{base}{i // len(_GROUP_NAMES) + 1}")
+    groups = [Group(id=_rand_id(rnd), name=name) for name in names]
+    accounts = []
+    for _ in range(n_accounts):
+        site, domain = rnd.choice(_SITES)
+        accounts.append(Account(
+            id=_rand_id(rnd),
+            name=site + rnd.choice(_NAME_SUFFIXES),
+            username=_username(rnd, domain),
+            password="".join(rnd.choice(_PASSWORD_CHARS) for _ in range(rnd.randint(12, 24))),
+            url=_url(rnd, domain),
+            notes=_notes(rnd),
+            group_id=rnd.choice(groups).id,
+        ))
+    return VaultData(groups, accounts)
+
+
+def make_storage(path: str, n_groups: int, n_accounts: int, seed: int = 0) -> VaultStorage:
+    """在 path 创建已解锁并保存到磁盘的合成保险库（主密码为 PASSWORD）"""
+    storage = VaultStorage(path)
+    storage.create_new(PASSWORD)
+    storage.import_plain(json.dumps(make_vault(n_groups, n_accounts, seed).to_dict(), ensure_ascii=False),
+                         merge=False)
+    storage.save()
+    return storage
+
+
+def query_traces(vault: VaultData, n_traces: int = 8, seed: int = 0) -> List[Tuple[str, ...]]:
+    """模拟搜索框的逐字输入：每条序列是同一个查询的各个前缀
+
+    查询取自保险库中的名称和用户名片段（中英文都有），另加一条正则查询。
+    """
+    rnd = random.Random(seed)
+    accounts = list(vault.accounts)
+    traces = []
+    for _ in range(n_traces):
+        a = rnd.choice(accounts)
+        text = rnd.choice([a.name, a.username]).lower()
+        start = rnd.randint(0, max(len(text) - 2, 0))
+        query = text[start:start + rnd.randint(2, 6)].strip() or text[:2]
+        traces.append(tuple(query[:i] for i in range(1, len(query) + 1)))
+    traces.append(("m", "ma", "mai", "mail", r"mail\.", r"mail\.c", r"mail\.co", r"mail\.com"))
+    return traces
@@ -0,0 +1,895 @@
+# -*- coding: utf-8 -*-
+"""
+账号卡片视图
+
+卡片列表采用模型/视图结构，不再为每个账号创建一个控件：
+- AccountListModel 只保存当前显示的账号ID顺序，账号数据在绘制某一行时才从存储层读取
+- AccountCardDelegate 在 paint 中直接画出卡片（背景、边框、标题、分组标签、各行文字和搜索高亮）
+- AccountListView 以图标模式排列等尺寸的卡片，处理悬停、选中、双击和右键菜单
+视图只布局和绘制进入视口的行，账号数量增加时内存和首屏时间基本不变。
+
+AccountCard 是单个账号的控件版卡片（供卡片复用池使用），背景和边框与委托共用 paint_card_frame 绘制。
+"""
+import html
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from PyQt5 import QtWidgets, QtGui, QtCore
+
+from .models import Account, Group
+from .storage import VaultStorage
+from .config import get_card_config, get_color_theme, get_font_config, get_spacing_config, get_border_radius_config, get_ui_config, get_text
+
+# 模型数据角色
+ACCOUNT_ID_ROLE = QtCore.Qt.UserRole
+ACCOUNT_ROLE = QtCore.Qt.UserRole + 1
+GROUP_NAME_ROLE = QtCore.Qt.UserRole + 2
+HIGHLIGHT_ROLE = QtCore.Qt.UserRole + 3  # (字段, 命中区间) 或 None
+
+Spans = Tuple[Tuple[int, int], ...]
+
+# 卡片背景以 surface_container 为底色，各状态混入的 primary 比例，键为 (选中, 悬停)
+_CARD_TINTS = {
+    (False, False): 0.0,
+    (False, True): 0.06,
+    (True, False): 0.05,
+    (True, True): 0.1,
+}
+_GRADIENT_STEP = 106  # 渐变上端提亮、下端压暗的比例（QColor.lighter/darker 的参数）
+_LINE_SPACING = 6  # 卡片内各行的间距，与 AccountCard 的布局间距一致
+_TAG_MIN_HEIGHT = 20
+
+# CSS 字重 -> Qt5 字重
+_QT_WEIGHTS = {
+    100: QtGui.QFont.Thin, 200: QtGui.QFont.ExtraLight, 300: QtGui.QFont.Light,
+    400: QtGui.QFont.Normal, 500: QtGui.QFont.Medium, 600: QtGui.QFont.DemiBold,
+    700: QtGui.QFont.Bold, 800: QtGui.QFont.ExtraBold, 900: QtGui.QFont.Black,
+}
+
+
+def _qt_weight(css_weight: int) -> int:
+    return _QT_WEIGHTS[min(_QT_WEIGHTS, key=lambda w: abs(w - css_weight))]
+
+
+def _mix(color: str, other: str, ratio: float) -> QtGui.QColor:
+    """按 ratio 把 other 混入 color"""
+    a, b = QtGui.QColor(color), QtGui.QColor(other)
+    return QtGui.QColor.fromRgbF(*(x + (y - x) * ratio for x, y in zip(a.getRgbF()[:3], b.getRgbF()[:3])))
+
+
+def card_frame_theme() -> dict:
+    """卡片背景和边框在各状态下的画笔（委托和 AccountCard 共用，读取配置后由调用方缓存）"""
+    colors = get_color_theme()
+    borders = {
+        (False, False): (QtGui.QColor(colors['outline']), 1),
+        (False, True): (QtGui.QColor(colors['primary_hover']), 1),
+        (True, False): (QtGui.QColor(colors['accent']), 2),
+        (True, True): (_mix(colors['accent'], colors['primary'], 0.4), 2),
+    }
+    gradients = {}
+    for key, tint in _CARD_TINTS.items():
+        base = _mix(colors['surface_container'], colors['primary'], tint)
+        gradients[key] = (base.lighter(_GRADIENT_STEP), base.darker(_GRADIENT_STEP))
+    return {
+        'gradients': gradients,
+        'borders': borders,
+        'margin': get_spacing_config('xs'),
+        'radius': get_border_radius_config('large'),
+    }
+
+
+def paint_card_frame(painter: QtGui.QPainter, rect: QtCore.QRectF, theme: dict, selected: bool, hovered: bool):
+    """在 rect（卡片所占区域，含外边距）内绘制卡片的渐变背景和圆角边框"""
+    m = theme['margin']
+    border_color, border_width = theme['borders'][(selected, hovered)]
+    half = border_width / 2
+    frame = rect.adjusted(m + half, m + half, -m - half, -m - half)
+    top, bottom = theme['gradients'][(selected, hovered)]
+    gradient = QtGui.QLinearGradient(frame.topLeft(), frame.bottomLeft())
+    gradient.setColorAt(0, top)
+    gradient.setColorAt(1, bottom)
+    painter.setPen(QtGui.QPen(border_color, border_width))
+    painter.setBrush(QtGui.QBrush(gradient))
+    painter.drawRoundedRect(frame, theme['radius'], theme['radius'])
+
+
+def copy_to_clipboard(text: str, widget: QtWidgets.QWidget):
+    """复制文本到剪贴板并在鼠标位置提示"""
+    if text:
+        clipboard = QtWidgets.QApplication.clipboard()
+        clipboard.setText(text)
+        QtWidgets.QToolTip.showText(QtGui.QCursor.pos(), "已复制到剪贴板", widget, QtCore.QRect(), 1500)
+
+
+def exec_account_menu(parent: QtWidgets.QWidget, account: Account, groups: Iterable[Group], pos: QtCore.QPoint,
+                      on_edit: Callable[[], None], on_delete: Callable[[], None],
+                      on_move: Callable[[str], None]):
+    """显示账号的右键菜单（控件卡片和卡片列表共用）"""
+    menu = QtWidgets.QMenu(parent)
+
+    edit_action = menu.addAction("编辑")
+    edit_action.triggered.connect(on_edit)
+
+    copy_menu = menu.addMenu("复制")
+    copy_username = copy_menu.addAction("复制用户名")
+    copy_username.triggered.connect(lambda: copy_to_clipboard(account.username, parent))
+    copy_password = copy_menu.addAction("复制密码")
+    copy_password.triggered.connect(lambda: copy_to_clipboard(account.password, parent))
+    copy_url = copy_menu.addAction("复制网址")
+    copy_url.triggered.connect(lambda: copy_to_clipboard(account.url, parent))
+
+    # 移动至分组的子菜单（跳过账号当前所在的分组）
+    targets = [g for g in groups if g.id != account.group_id]
+    if targets:
+        menu.addSeparator()
+        move_menu = menu.addMenu(get_text('labels', 'move_to_group'))
+        for group in targets:
+            move_action = move_menu.addAction(group.name)
+            # 使用lambda的默认参数来捕获group.id的值
+            move_action.triggered.connect(lambda checked, gid=group.id: on_move(gid))
+
+    menu.addSeparator()
+    delete_action = menu.addAction("删除")
+    delete_action.triggered.connect(on_delete)
+
+    # 执行菜单并在完成后清理
+    try:
+        menu.exec_(pos)
+    finally:
+        menu.deleteLater()
+
+
+class AccountListModel(QtCore.QAbstractListModel):
+    """卡片列表的模型
+
+    只保存当前显示的账号ID顺序（搜索排名靠前的在前，其余按添加顺序），不复制账号数据；
+    视图绘制某一行时才通过存储层的索引按ID读取账号。
+    行按需交给视图：每次设置行后先提供 batch_load_size 行，视图滚动到接近底部时通过 fetchMore 再追加一批。
+    """
+
+    def __init__(self, storage: VaultStorage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.batch_size = max(1, get_ui_config()['batch_load_size'])
+        self._ids: List[str] = []
+        self._loaded = 0  # 已交给视图的行数
+        self._highlights: Dict[str, Tuple[str, Spans]] = {}
+        self._row_of: Optional[Dict[str, int]] = None  # 按需建立的 账号ID -> 行号
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        return not parent.isValid() and self._loaded < len(self._ids)
+
+    def fetchMore(self, parent: QtCore.QModelIndex):
+        if parent.isValid():
+            return
+        self.load_until(self._loaded + self.batch_size - 1)
+
+    def load_until(self, row: int):
+        """确保第 row 行（及之前的行）已交给视图"""
+        end = min(row + 1, len(self._ids))
+        if end <= self._loaded:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), self._loaded, end - 1)
+        self._loaded = end
+        self.endInsertRows()
+
+    def total_count(self) -> int:
+        """显示的账号总数（含尚未交给视图的行）"""
+        return len(self._ids)
+
+    def flags(self, index: QtCore.QModelIndex):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemNeverHasChildren
+
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        aid = self._ids[index.row()]
+        if role == ACCOUNT_ID_ROLE:
+            return aid
+        if role == HIGHLIGHT_ROLE:
+            return self._highlights.get(aid)
+        account = self.storage.get_account(aid)
+        if account is None:
+            return None
+        if role == ACCOUNT_ROLE:
+            return account
+        if role == QtCore.Qt.DisplayRole:
+            return account.name
+        if role == GROUP_NAME_ROLE:
+            group = self.storage.get_group(account.group_id)
+            return group.name if group else (get_text('default_values', 'default_group') or "未分组")
+        return None
+
+    def set_rows(self, ids: List[str], highlights: Optional[Dict[str, Tuple[str, Spans]]] = None,
+                 keep_loaded: bool = False):
+        """替换显示的账号及其搜索高亮（视图随后只重新布局和绘制可见的行）
+
+        keep_loaded 为 True 时保留已加载的行数，数据修改后重新设置行不会丢失滚动位置。
+        """
+        loaded = max(self.batch_size, self._loaded) if keep_loaded else self.batch_size
+        self.beginResetModel()
+        self._ids = ids
+        self._loaded = min(len(ids), loaded)
+        self._highlights = highlights or {}
+        self._row_of = None
+        self.endResetModel()
+
+    def append_rows(self, ids: List[str]):
+        """在末尾追加显示的账号（后台搜索分块送回的结果），追加的行同样按需交给视图"""
+        if not ids:
+            return
+        start = len(self._ids)
+        self._ids.extend(ids)
+        if self._row_of is not None:
+            self._row_of.update((aid, start + i) for i, aid in enumerate(ids))
+        if self._loaded < self.batch_size:
+            self.load_until(self.batch_size - 1)
+
+    def account_id(self, row: int) -> Optional[str]:
+        return self._ids[row] if 0 <= row < self._loaded else None
+
+    def row_of(self, aid: str) -> int:
+        """账号所在的行（可能尚未交给视图），不在列表中时返回 -1"""
+        if self._row_of is None:
+            self._row_of = {a: i for i, a in enumerate(self._ids)}
+        return self._row_of.get(aid, -1)
+
+
+class AccountCardDelegate(QtWidgets.QStyledItemDelegate):
+    """按需绘制账号卡片
+
+    外观与 AccountCard 一致。颜色、字体和文字在第一次绘制时读取并缓存
+    （颜色和字体配置每次读取都要加载用户设置文件），设置更改后调用 reload_theme。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        card_config = get_card_config()
+        self._size = QtCore.QSize(card_config['width'], card_config['height'])
+        self._theme: Optional[dict] = None
+
+    def reload_theme(self):
+        """设置更改后重新读取颜色、字体和文字"""
+        self._theme = None
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        return self._size
+
+    def _get_theme(self, base_font: QtGui.QFont) -> dict:
+        if self._theme is not None:
+            return self._theme
+        colors = get_color_theme()
+        fonts = get_font_config()
+        spacing = get_spacing_config()
+        radius = get_border_radius_config()
+        margins = get_card_config()['margins']
+
+        def make_font(size: Optional[str], weight: str) -> QtGui.QFont:
+            font = QtGui.QFont(base_font)
+            if size is not None:
+                font.setPixelSize(fonts['sizes'][size])
+            font.setWeight(_qt_weight(fonts['weights'][weight]))
+            return font
+
+        text_font = make_font(None, 'normal')
+        title_font = make_font('large', 'bold')
+        text_hl_font = make_font(None, 'semibold')
+        tag_font = make_font('small', 'medium')
+        tag_metrics = QtGui.QFontMetricsF(tag_font)
+        self._theme = {
+            'colors': {k: QtGui.QColor(v) for k, v in colors.items()},
+            'frame': card_frame_theme(),
+            'margin': spacing['xs'],
+            'pad_x': margins['card'],
+            'pad_y': margins['content'],
+            'radius': radius['large'],
+            'tag_pad_x': spacing['xl'],
+            'tag_height': max(_TAG_MIN_HEIGHT, tag_metrics.height() + 2 * spacing['sm']),
+            'title': (title_font, QtGui.QFontMetricsF(title_font)),
+            'text': (text_font, QtGui.QFontMetricsF(text_font)),
+            'text_hl': (text_hl_font, QtGui.QFontMetricsF(text_hl_font)),
+            'tag': (tag_font, tag_metrics),
+            'unnamed': get_text('default_values', 'unnamed_account'),
+            'prefixes': {key: get_text('labels', key) for key in ('username', 'password', 'url', 'notes')},
+        }
+        return self._theme
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        account = index.data(ACCOUNT_ROLE)
+        if account is None:
+            return
+        theme = self._get_theme(option.font)
+        selected = bool(option.state & QtWidgets.QStyle.State_Selected)
+        hovered = bool(option.state & QtWidgets.QStyle.State_MouseOver)
+        highlight = index.data(HIGHLIGHT_ROLE)
+        hl_field, hl_spans = highlight if highlight else (None, ())
+
+        painter.save()
+        try:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing)
+            painter.setRenderHint(QtGui.QPainter.TextAntialiasing)
+            paint_card_frame(painter, QtCore.QRectF(option.rect), theme['frame'], selected, hovered)
+            m = theme['margin']
+            rect = QtCore.QRectF(option.rect).adjusted(m, m, -m, -m)
+
+            colors = theme['colors']
+            left = rect.left() + theme['pad_x']
+            right = rect.right() - theme['pad_x']
+            top = rect.top() + theme['pad_y']
+            bottom = rect.bottom() - theme['pad_y']
+
+            # 标题行：名称在左，分组标签在右
+            tag_height = theme['tag_height']
+            tag_rect = self._paint_tag(painter, theme, index.data(GROUP_NAME_ROLE) or "",
+                                       right, top, (right - left) / 2)
+            title_font, title_metrics = theme['title']
+            baseline = top + (tag_height - title_metrics.height()) / 2 + title_metrics.ascent()
+            self._draw_text(painter, left, baseline, tag_rect.left() - theme['pad_x'] - left,
+                            "", account.name or theme['unnamed'],
+                            hl_spans if hl_field == 'name' else (),
+                            theme['title'], theme['title'], colors['on_surface'], colors['accent'])
+
+            # 用户名、密码、网址、备注依次排列；放不下时先压缩行距（与控件卡片的布局一致），仍放不下的行不绘制
+            prefixes = theme['prefixes']
+            password = account.password or ""
+            if not getattr(option.widget, 'show_passwords', False):
+                password = "*" * len(password)
+            lines = [
+                ('username', account.username or "", colors['on_surface_variant']),
+                ('password', password, colors['on_surface_variant']),
+            ]
+            if account.url:
+                lines.append(('url', account.url, colors['on_surface_variant']))
+            if account.notes:
+                lines.append(('notes', " ".join(account.notes.split()), colors['notes']))
+            text_metrics = theme['text'][1]
+            line_height = text_metrics.height()
+            available = bottom - top - tag_height
+            del lines[max(0, int(available // line_height)):]
+            gap = min(_LINE_SPACING, (available - len(lines) * line_height) / len(lines)) if lines else 0
+            y = top + tag_height + gap
+            for field, text, color in lines:
+                self._draw_text(painter, left, y + text_metrics.ascent(), right - left,
+                                prefixes[field], text, hl_spans if hl_field == field else (),
+                                theme['text'], theme['text_hl'], color, colors['accent'])
+                y += line_height + gap
+        finally:
+            painter.restore()
+
+    @staticmethod
+    def _paint_tag(painter: QtGui.QPainter, theme: dict, text: str, right: float, top: float,
+                   max_width: float) -> QtCore.QRectF:
+        """在标题行右侧绘制分组标签，返回标签区域"""
+        colors = theme['colors']
+        font, metrics = theme['tag']
+        pad = theme['tag_pad_x']
+        width = min(metrics.horizontalAdvance(text) + 2 * pad, max_width)
+        rect = QtCore.QRectF(right - width, top, width, theme['tag_height'])
+        gradient = QtGui.QLinearGradient(rect.topLeft(), rect.topRight())
+        gradient.setColorAt(0, colors['primary'])
+        gradient.setColorAt(1, colors['primary_hover'])
+        painter.setPen(QtGui.QPen(colors['accent'], 1))
+        painter.setBrush(QtGui.QBrush(gradient))
+        radius = theme['radius']
+        painter.drawRoundedRect(rect.adjusted(0.5, 0.5, -0.5, -0.5), radius, radius)
+        painter.setFont(font)
+        painter.setPen(colors['on_primary'])
+        text = metrics.elidedText(text, QtCore.Qt.ElideRight, width - 2 * pad)
+        painter.drawText(rect, QtCore.Qt.AlignCenter, text)
+        return rect
+
+    @staticmethod
+    def _draw_text(painter: QtGui.QPainter, x: float, baseline: float, width: float, prefix: str, text: str,
+                   spans: Spans, normal: Tuple[QtGui.QFont, QtGui.QFontMetricsF],
+                   highlighted: Tuple[QtGui.QFont, QtGui.QFontMetricsF],
+                   color: QtGui.QColor, hl_color: QtGui.QColor):
+        """绘制单行文字，命中区间使用高亮字体和颜色，超出宽度的部分以省略号结尾"""
+        segments = [(prefix, False)]
+        pos = 0
+        for start, end in spans:
+            segments.append((text[pos:start], False))
+            segments.append((text[start:end], True))
+            pos = end
+        segments.append((text[pos:], False))
+        right = x + width
+        for segment, is_hl in segments:
+            if not segment:
+                continue
+            font, metrics = highlighted if is_hl else normal
+            advance = metrics.horizontalAdvance(segment)
+            elided = x + advance > right
+            if elided:
+                segment = metrics.elidedText(segment, QtCore.Qt.ElideRight, max(0.0, right - x))
+            painter.setFont(font)
+            painter.setPen(hl_color if is_hl else color)
+            painter.drawText(QtCore.QPointF(x, baseline), segment)
+            if elided:
+                break
+            x += advance
+
+
+class AccountListView(QtWidgets.QListView):
+    """账号卡片列表：网格排列尺寸相同的卡片，只布局和绘制可见的行"""
+    editRequested = QtCore.pyqtSignal(str)
+    deleteRequested = QtCore.pyqtSignal(str)
+    moveToGroupRequested = QtCore.pyqtSignal(str, str)  # (account_id, group_id)
+    showPasswordsChanged = QtCore.pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("CardList")
+        # 是否明文显示密码：只影响绘制，不属于模型数据
+        self.show_passwords = False
+        # 列表模式从左到右换行排列，与图标模式的网格相同；行尺寸一致时布局不需要逐行询问尺寸
+        self.setFlow(QtWidgets.QListView.LeftToRight)
+        self.setResizeMode(QtWidgets.QListView.Adjust)
+        self.setMovement(QtWidgets.QListView.Static)
+        self.setWrapping(True)
+        self.setSpacing(10)
+        self.setUniformItemSizes(True)
+        self.setDragEnabled(False)
+        self.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.setFocusPolicy(QtCore.Qt.NoFocus)
+        # 悬停状态由视图通过 State_MouseOver 传给委托
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(QtCore.Qt.WA_Hover)
+        card_config = get_card_config()
+        grid_spacing = card_config['grid_spacing']
+        self.setGridSize(QtCore.QSize(card_config['width'] + grid_spacing, card_config['height'] + grid_spacing))
+        # 距离底部不足 scroll_load_threshold 行卡片时提前加载下一批
+        self._fetch_margin = get_ui_config()['scroll_load_threshold'] * self.gridSize().height()
+        self.doubleClicked.connect(self._on_double_clicked)
+
+    def current_account_id(self) -> Optional[str]:
+        selection = self.selectionModel()
+        indexes = selection.selectedIndexes() if selection is not None else []
+        return indexes[0].data(ACCOUNT_ID_ROLE) if indexes else None
+
+    def select_account(self, aid: str, load: bool = True) -> bool:
+        """选中指定账号，账号不在列表中（load 为 False 时：尚未加载）时返回 False"""
+        model = self.model()
+        row = model.row_of(aid) if model is not None else -1
+        if row < 0 or (not load and row >= model.rowCount()):
+            return False
+        model.load_until(row)
+        self.setCurrentIndex(model.index(row))
+        return True
+
+    def set_show_passwords(self, show: bool):
+        """切换密码明文显示
+
+        只通知视口内的行重绘；其余行绘制时读取同一个标志，滚动进入视口时自然按新状态显示。
+        """
+        if self.show_passwords == show:
+            return
+        self.show_passwords = show
+        rows = self.visible_rows()
+        if rows:
+            model = self.model()
+            self.dataChanged(model.index(rows[0]), model.index(rows[-1]), [ACCOUNT_ROLE])
+        self.showPasswordsChanged.emit(show)
+
+    def visible_rows(self, overscan_rows: int = 0) -> range:
+        """视口内的行（上下再各多算 overscan_rows 行卡片）"""
+        model = self.model()
+        count = model.rowCount() if model is not None else 0
+        if count == 0:
+            return range(0)
+        margin = overscan_rows * self.gridSize().height()
+        top = -margin
+        bottom = self.viewport().height() + margin
+        # 各行的位置随行号单调递增，二分查找第一个进入可见范围的行
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.visualRect(model.index(mid)).bottom() < top:
+                lo = mid + 1
+            else:
+                hi = mid
+        last = lo
+        while last < count and self.visualRect(model.index(last)).top() <= bottom:
+            last += 1
+        return range(lo, last)
+
+    def verticalScrollbarValueChanged(self, value: int):
+        super().verticalScrollbarValueChanged(value)
+        model = self.model()
+        root = QtCore.QModelIndex()
+        if model is not None and self.verticalScrollBar().maximum() - value <= self._fetch_margin \
+                and model.canFetchMore(root):
+            model.fetchMore(root)
+
+    def _on_double_clicked(self, index: QtCore.QModelIndex):
+        aid = index.data(ACCOUNT_ID_ROLE)
+        if aid:
+            self.editRequested.emit(aid)
+
+    def contextMenuEvent(self, e: QtGui.QContextMenuEvent):
+        index = self.indexAt(e.pos())
+        account = index.data(ACCOUNT_ROLE) if index.isValid() else None
+        if account is None:
+            return
+        self.setCurrentIndex(index)
+        aid = account.id
+        exec_account_menu(self, account, self.model().storage.vault.groups, e.globalPos(),
+                          lambda: self.editRequested.emit(aid),
+                          lambda: self.deleteRequested.emit(aid),
+                          lambda gid: self.moveToGroupRequested.emit(aid, gid))
+
+
+class CardSlotDelegate(QtWidgets.QStyledItemDelegate):
+    """控件卡片模式下的委托：只提供卡片尺寸，内容由覆盖在行上的 AccountCard 显示"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        card_config = get_card_config()
+        self._size = QtCore.QSize(card_config['width'], card_config['height'])
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex) -> QtCore.QSize:
+        return self._size
+
+    def paint(self, painter: QtGui.QPainter, option: QtWidgets.QStyleOptionViewItem, index: QtCore.QModelIndex):
+        pass
+
+
+class AccountCardPool(QtCore.QObject):
+    """AccountCard 复用池
+
+    只为视口内的行（上下再各多留 overscan_rows 行卡片）准备 AccountCard，按行的位置覆盖在视图上。
+    滚动或列表变化后，离开可见范围的卡片通过 bind 重新绑定到新进入的账号，不再为每个账号创建和销毁控件；
+    卡片总数只取决于视口大小。
+    """
+
+    def __init__(self, view: AccountListView, overscan_rows: int = 1):
+        super().__init__(view)
+        self.view = view
+        self.overscan_rows = overscan_rows
+        self._bound: Dict[str, AccountCard] = {}  # 账号ID -> 当前绑定的卡片
+        self._free: List[AccountCard] = []
+        self._created = 0
+
+        model = view.model()
+        model.modelReset.connect(self.rebind)
+        model.dataChanged.connect(self.rebind)
+        model.rowsInserted.connect(self.update)
+        model.rowsRemoved.connect(self.rebind)
+        model.layoutChanged.connect(self.rebind)
+        view.selectionModel().selectionChanged.connect(self._sync_selection)
+        view.showPasswordsChanged.connect(self._sync_passwords)
+        view.verticalScrollBar().valueChanged.connect(self.update)
+        view.viewport().installEventFilter(self)
+
+    @property
+    def created_count(self) -> int:
+        """累计创建的卡片数量"""
+        return self._created
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Resize:
+            # 视口尺寸变化后视图会重新布局，等布局完成再摆放卡片
+            QtCore.QTimer.singleShot(0, self.update)
+        return False
+
+    def reload_theme(self):
+        """设置更改后重新读取颜色并重新绑定卡片"""
+        AccountCard.reload_theme()
+        self.rebind()
+
+    def rebind(self, *args):
+        """账号数据或显示顺序变化：可见的卡片全部重新绑定"""
+        self._release(list(self._bound))
+        self.update()
+
+    def update(self, *args):
+        """按当前滚动位置绑定并摆放可见范围内的卡片"""
+        view = self.view
+        model = view.model()
+        view.executeDelayedItemsLayout()
+        rows = view.visible_rows(self.overscan_rows)
+        wanted = {model.account_id(row): row for row in rows}
+        self._release([aid for aid in self._bound if aid not in wanted])
+        selected = view.current_account_id()
+        for aid, row in wanted.items():
+            index = model.index(row)
+            card = self._bound.get(aid)
+            if card is None:
+                account = index.data(ACCOUNT_ROLE)
+                if account is None:
+                    continue
+                group_name = index.data(GROUP_NAME_ROLE) or ""
+                if self._free:
+                    card = self._free.pop()
+                    card.groups = model.storage.vault.groups
+                    card.bind(account, group_name, view.show_passwords)
+                else:
+                    card = self._new_card(account, group_name)
+                highlight = index.data(HIGHLIGHT_ROLE)
+                if highlight:
+                    card.set_highlight(*highlight)
+                self._bound[aid] = card
+            if card.selected != (aid == selected):
+                card.set_selected(aid == selected)
+            card.setGeometry(view.visualRect(index))
+            card.show()
+
+    def _release(self, aids: List[str]):
+        for aid in aids:
+            card = self._bound.pop(aid)
+            card.hide()
+            self._free.append(card)
+
+    def _new_card(self, account: Account, group_name: str) -> 'AccountCard':
+        view = self.view
+        model = view.model()
+        card = AccountCard(account, group_name, view.show_passwords, model.storage.vault.groups, view.viewport())
+        # 右键菜单由卡片自己显示，不再交给视图
+        card.setContextMenuPolicy(QtCore.Qt.PreventContextMenu)
+        card.clicked.connect(view.select_account)
+        card.doubleClicked.connect(view.editRequested)
+        card.deleteRequested.connect(view.deleteRequested)
+        card.moveToGroupRequested.connect(view.moveToGroupRequested)
+        self._created += 1
+        return card
+
+    def _sync_passwords(self, show: bool):
+        # 只更新已绑定的卡片，空闲的卡片在下次绑定时按视图的状态显示
+        for card in self._bound.values():
+            card.set_show_passwords(show)
+
+    def _sync_selection(self, *args):
+        selected = self.view.current_account_id()
+        for aid, card in self._bound.items():
+            if card.selected != (aid == selected):
+                card.set_selected(aid == selected)
+
+
+class AccountCard(QtWidgets.QFrame):
+    # 在类级别定义信号
+    clicked = QtCore.pyqtSignal(str)
+    doubleClicked = QtCore.pyqtSignal(str)
+    deleteRequested = QtCore.pyqtSignal(str)  # 新增删除请求信号
+    moveToGroupRequested = QtCore.pyqtSignal(str, str)  # 新增移动至分组请求信号 (account_id, group_id)
+    
+    # 类级别缓存配置，避免重复获取
+    _card_config = None
+    _highlight_color = None  # 搜索高亮颜色，设置更改后清空
+    _frame_theme = None  # 背景和边框的画笔，设置更改后清空
+    _label_styles = {}  # 缓存标签样式
+    
+    @classmethod
+    def _get_card_config(cls):
+        if cls._card_config is None:
+            cls._card_config = get_card_config()
+        return cls._card_config
+    
+    @classmethod
+    def _get_label_style(cls, role: str):
+        """缓存标签样式以提高创建性能"""
+        if role not in cls._label_styles:
+            cls._label_styles[role] = f"[role=\"{role}\"] {{ }}"
+        return cls._label_styles[role]
+
+    @classmethod
+    def reload_theme(cls):
+        """设置更改后清空缓存的颜色，下次绘制时重新读取"""
+        cls._highlight_color = None
+        cls._frame_theme = None
+    
+    def __init__(self, account: Account, group_name: str, show_passwords: bool, groups: list = None, parent=None):
+        super().__init__(parent)
+        self.account = account
+        self.show_passwords = show_passwords
+        self.selected = False
+        self.hovered = False
+        self.groups = groups or []  # 存储所有分组信息
+        self._highlight_field: Optional[str] = None  # 当前高亮的字段
+        
+        self.setObjectName("AccountCard")
+        card_config = self._get_card_config()
+        self.setFixedHeight(card_config['fixed_height'])
+        self.setContentsMargins(0, 0, 0, 0)
+        
+        # 设置鼠标跟踪以支持悬停效果
+        self.setMouseTracking(True)
+        
+        # 预创建所有可能需要的标签以提高性能
+        self._setup_ui(group_name)
+
+    def _setup_ui(self, group_name: str):
+        """预创建UI组件以提高性能"""
+        card_config = self._get_card_config()
+        
+        # 创建布局
+        layout = QtWidgets.QVBoxLayout(self)
+        card_margins = card_config['margins']
+        layout.setContentsMargins(card_margins['card'], card_margins['content'], card_margins['card'], card_margins['content'])
+        layout.setSpacing(6)
+        
+        # 标题行
+        title_layout = QtWidgets.QHBoxLayout()
+        title_layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.name_label = QtWidgets.QLabel(self.account.name or get_text('default_values', 'unnamed_account'))
+        self.name_label.setProperty("role", "title")
+        self.name_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+        title_layout.addWidget(self.name_label)
+        
+        title_layout.addStretch()
+        
+        self.group_label = QtWidgets.QLabel(group_name)
+        self.group_label.setObjectName("GroupTag")
+        self.group_label.setProperty("role", "muted")
+        self.group_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+        title_layout.addWidget(self.group_label)
+        
+        layout.addLayout(title_layout)
+        
+        # 用户名
+        username_prefix = get_text('labels', 'username')
+        self.username_label = QtWidgets.QLabel(f"{username_prefix}{self.account.username or ''}")
+        self.username_label.setProperty("role", "muted")
+        self.username_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+        layout.addWidget(self.username_label)
+        
+        # 密码
+        self.password_label = QtWidgets.QLabel()
+        self.password_label.setProperty("role", "muted")
+        self.password_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+        layout.addWidget(self.password_label)
+        self.set_show_passwords(self.show_passwords)
+        
+        # URL（延迟创建，仅在需要时创建）
+        self.url_label = None
+        if self.account.url:
+            url_prefix = get_text('labels', 'url')
+            self.url_label = QtWidgets.QLabel(f"{url_prefix}{self.account.url}")
+            self.url_label.setProperty("role", "muted")
+            self.url_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+            layout.addWidget(self.url_label)
+        
+        # 备注（延迟创建，仅在需要时创建）
+        self.notes_label = None
+        if self.account.notes:
+            notes_prefix = get_text('labels', 'notes')
+            self.notes_label = QtWidgets.QLabel(f"{notes_prefix}{self.account.notes}")
+            self.notes_label.setProperty("role", "notes")
+            self.notes_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+            layout.addWidget(self.notes_label)
+
+    def bind(self, account: Account, group_name: str, show_passwords: bool):
+        """把卡片重新绑定到另一个账号（复用现有标签，不重建界面）"""
+        self.account = account
+        self._highlight_field = None
+        self._set_field_text('name', ())
+        self._set_field_text('username', ())
+        self.group_label.setText(group_name)
+        self.set_show_passwords(show_passwords)
+        # 网址在备注之前：标题行、用户名、密码之后的第 3 项
+        self.url_label = self._bind_optional_label(self.url_label, 'url', account.url, "muted", 3)
+        self.notes_label = self._bind_optional_label(self.notes_label, 'notes', account.notes, "notes", -1)
+
+    def _bind_optional_label(self, label: Optional[QtWidgets.QLabel], key: str, value: str, role: str,
+                             position: int) -> Optional[QtWidgets.QLabel]:
+        """更新可选的网址/备注标签：有内容时按需创建并显示，没有内容时隐藏"""
+        if not value:
+            if label is not None:
+                label.hide()
+            return label
+        if label is None:
+            label = QtWidgets.QLabel()
+            label.setProperty("role", role)
+            label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
+            self.layout().insertWidget(position, label)
+        label.setTextFormat(QtCore.Qt.PlainText)
+        label.setText(f"{get_text('labels', key)}{value}")
+        label.show()
+        return label
+
+    def set_show_passwords(self, show: bool):
+        """设置是否显示密码"""
+        self.show_passwords = show
+        password_prefix = get_text('labels', 'password')
+        if show:
+            self.password_label.setText(f"{password_prefix}{self.account.password or ''}")
+        else:
+            self.password_label.setText(password_prefix + "*" * len(self.account.password or ""))
+
+    def set_highlight(self, field: Optional[str] = None, spans: Tuple[Tuple[int, int], ...] = ()):
+        """高亮搜索命中的字符；field 为 None 时清除高亮"""
+        if field is None and self._highlight_field is None:
+            return
+        if self._highlight_field is not None and self._highlight_field != field:
+            self._set_field_text(self._highlight_field, ())
+        self._highlight_field = field
+        if field is not None:
+            self._set_field_text(field, spans)
+
+    def _set_field_text(self, field: str, spans: Tuple[Tuple[int, int], ...]):
+        if field == 'name':
+            label, prefix = self.name_label, ""
+            text = self.account.name or get_text('default_values', 'unnamed_account')
+        elif field == 'username':
+            label, prefix, text = self.username_label, get_text('labels', 'username'), self.account.username or ""
+        else:
+            label, prefix, text = self.url_label, get_text('labels', 'url'), self.account.url or ""
+        if label is None:
+            return
+        if not spans:
+            label.setTextFormat(QtCore.Qt.PlainText)
+            label.setText(f"{prefix}{text}")
+            return
+        if AccountCard._highlight_color is None:
+            AccountCard._highlight_color = get_color_theme('accent')
+        color = AccountCard._highlight_color
+        parts = [html.escape(prefix)]
+        pos = 0
+        for start, end in spans:
+            parts.append(html.escape(text[pos:start]))
+            parts.append(f'<span style="color:{color}; font-weight:600;">{html.escape(text[start:end])}</span>')
+            pos = end
+        parts.append(html.escape(text[pos:]))
+        label.setTextFormat(QtCore.Qt.RichText)
+        label.setText("".join(parts))
+
+    def set_selected(self, selected: bool):
+        """设置选中状态（只需重绘背景和边框）"""
+        if self.selected != selected:
+            self.selected = selected
+            self.update()
+
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        """背景和边框按悬停/选中状态直接绘制
+
+        状态变化时只重绘卡片，不再修改动态属性后 unpolish/polish——那会让整个应用样式表
+        对卡片及其所有标签重新匹配一遍。
+        """
+        if AccountCard._frame_theme is None:
+            AccountCard._frame_theme = card_frame_theme()
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        paint_card_frame(painter, QtCore.QRectF(self.rect()), AccountCard._frame_theme, self.selected, self.hovered)
+
+    # Click/DoubleClick passthrough
+    def mousePressEvent(self, e: QtGui.QMouseEvent):
+        # 只处理左键和右键，其他按键直接忽略
+        if e.button() == QtCore.Qt.LeftButton:
+            self.clicked.emit(self.account.id)
+            e.accept()
+        elif e.button() == QtCore.Qt.RightButton:
+            self._show_context_menu(e.globalPos())
+            e.accept()
+        # 移除else分支，减少不必要的事件传播
+
+    def mouseDoubleClickEvent(self, e: QtGui.QMouseEvent):
+        if e.button() == QtCore.Qt.LeftButton:
+            self.doubleClicked.emit(self.account.id)
+            e.accept()  # 阻止事件继续传播
+            return
+        super().mouseDoubleClickEvent(e)
+
+    def _show_context_menu(self, pos: QtCore.QPoint):
+        """显示账号卡片的右键菜单"""
+        aid = self.account.id
+        exec_account_menu(self, self.account, self.groups, pos,
+                          lambda: self.doubleClicked.emit(aid),
+                          lambda: self.deleteRequested.emit(aid),
+                          lambda gid: self.moveToGroupRequested.emit(aid, gid))
+
+    def enterEvent(self, event):
+        """鼠标悬停效果"""
+        self.hovered = True
+        self.update()
+        super().enterEvent(event)
+
+    def leaveEvent(self, event):
+        """鼠标离开效果"""
+        self.hovered = False
+        self.update()
+        super().leaveEvent(event)
@@ -113,16 +113,34 @@ SECURITY_CONFIG = {
     'clipboard_clear_timeout': 30,  # 剪贴板清除超时时间（秒）
 }
 
+# 数据存储配置
+STORAGE_CONFIG = {
+    'compaction_min_frames': 256,  # 日志帧数低于该值时不压缩
+    'compaction_ratio': 2.0,  # 日志帧数超过有效记录数的该倍数时压缩重写
+    'payload_codec': 'binary',  # 记录和导出文件的编码：binary（紧凑、更快）或 json（旧版程序可读）
+    'compression': 'zlib',  # 编码后、加密前的压缩：zlib、lzma（更小、更慢）或 none（旧版程序可读）
+    'compression_level': 6,  # 压缩级别 0~9
+    'compression_min_size': 2048,  # 小于该字节数的载荷不压缩（单条记录通常不压缩）
+    'stream_chunk_size': 256 * 1024,  # 导出文件分块加密的块大小（字节）
+    'crypto_workers': 0,  # 分块加解密的线程数，0 表示按CPU核数，1 表示不使用线程池
+}
+
 # UI交互配置
 UI_CONFIG = {
     'animation_duration': 200,  # 动画持续时间（毫秒）
     'tooltip_delay': 500,  # 工具提示延迟（毫秒）
     'double_click_interval': 400,  # 双击间隔（毫秒）
     'search_debounce': 300,  # 搜索防抖延迟（毫秒）
-    'auto_save_interval': 30,  # 自动保存间隔（秒）
+    'search_rank_limit': 50,  # 搜索时按相关度排在最前并高亮的结果数
+    'search_regex_timeout': 500,  # 正则搜索的时间预算（毫秒）：超时后只显示模糊匹配的结果
+    'search_chunk_size': 2000,  # 后台搜索每次送回卡片列表的结果数
+    'card_render_mode': 'delegate',  # 卡片显示方式：'delegate' 由委托直接绘制，'widgets' 使用复用的 AccountCard 控件
+    'card_pool_overscan': 1,  # 'widgets' 方式下视口上下额外准备卡片的行数
+    'save_debounce': 500,  # 保存合并延迟（毫秒）：连续修改在停顿后合并为一次写入
+    'auto_save_interval': 30,  # 自动保存间隔（秒）：持续修改时最长多久必须落盘一次
     'max_recent_files': 10,  # 最大最近文件数
-    'batch_load_size': 50,  # 批量加载大小
-    'scroll_load_threshold': 10,  # 滚动加载阈值
+    'batch_load_size': 50,  # 批量加载大小：卡片列表首屏及每次滚动加载的账号数
+    'scroll_load_threshold': 10,  # 滚动加载阈值：距离列表底部不足该行数时加载下一批
     'card_hover_animation': True,  # 卡片悬停动画
     'show_passwords_default': False,  # 默认是否显示密码
     'context_menu_enabled': True  # 是否启用右键菜单
@@ -323,6 +341,10 @@ def get_security_config(key=None):
     """获取安全配置"""
     return SECURITY_CONFIG.get(key) if key else SECURITY_CONFIG
 
+def get_storage_config(key=None):
+    """获取数据存储配置"""
+    return STORAGE_CONFIG.get(key) if key else STORAGE_CONFIG
+
 def get_ui_config(key=None):
     """获取UI配置"""
     return UI_CONFIG.get(key) if key else UI_CONFIG
@@ -454,6 +476,7 @@ def get_config_by_category(category):
         'border': BORDER_RADIUS_CONFIG,
         'file': FILE_CONFIG,
         'security': SECURITY_CONFIG,
+        'storage': STORAGE_CONFIG,
         'ui': UI_CONFIG,
         'dialog': DIALOG_CONFIG,
         'password_generator': PASSWORD_GENERATOR_CONFIG,
@@ -467,7 +490,7 @@ def get_config_by_category(category):
 def update_config_by_category(category, new_config):
     """根据类别更新配置项"""
     global APP_CONFIG, WINDOW_CONFIG, CARD_CONFIG, COLOR_THEME, FONT_CONFIG
-    global SPACING_CONFIG, BORDER_RADIUS_CONFIG, FILE_CONFIG, SECURITY_CONFIG
+    global SPACING_CONFIG, BORDER_RADIUS_CONFIG, FILE_CONFIG, SECURITY_CONFIG, STORAGE_CONFIG
     global UI_CONFIG, DIALOG_CONFIG, PASSWORD_GENERATOR_CONFIG, PASSWORD_STRENGTH_CONFIG
     global IMPORT_EXPORT_CONFIG, LOG_CONFIG
     
@@ -481,6 +504,7 @@ def update_config_by_category(category, new_config):
         'border': 'BORDER_RADIUS_CONFIG',
         'file': 'FILE_CONFIG',
         'security': 'SECURITY_CONFIG',
+        'storage': 'STORAGE_CONFIG',
         'ui': 'UI_CONFIG',
         'dialog': 'DIALOG_CONFIG',
         'password_generator': 'PASSWORD_GENERATOR_CONFIG',
@@ -189,6 +189,11 @@ class ConfigEditorDialog(QtWidgets.QDialog):
         self.tooltip_delay_spin.setSuffix(" ms")
         behavior_layout.addRow("工具提示延迟:", self.tooltip_delay_spin)
         
+        self.save_debounce_spin = QtWidgets.QSpinBox()
+        self.save_debounce_spin.setRange(0, 5000)
+        self.save_debounce_spin.setSuffix(" ms")
+        behavior_layout.addRow("保存合并延迟:", self.save_debounce_spin)
+        
         self.auto_save_interval_spin = QtWidgets.QSpinBox()
         self.auto_save_interval_spin.setRange(10, 300)
         self.auto_save_interval_spin.setSuffix(" 秒")
@@ -369,6 +374,7 @@ class ConfigEditorDialog(QtWidgets.QDialog):
         ui_config = config.get_ui_config()
         self.animation_duration_spin.setValue(ui_config.get('animation_duration', 200))
         self.tooltip_delay_spin.setValue(ui_config.get('tooltip_delay', 500))
+        self.save_debounce_spin.setValue(ui_config.get('save_debounce', 500))
         self.auto_save_interval_spin.setValue(ui_config.get('auto_save_interval', 30))
         self.show_passwords_check.setChecked(ui_config.get('show_passwords_default', False))
         self.card_hover_animation_check.setChecked(ui_config.get('card_hover_animation', True))
@@ -482,6 +488,7 @@ class ConfigEditorDialog(QtWidgets.QDialog):
             'UI_CONFIG': {
                 'animation_duration': self.animation_duration_spin.value(),
                 'tooltip_delay': self.tooltip_delay_spin.value(),
+                'save_debounce': self.save_debounce_spin.value(),
                 'auto_save_interval': self.auto_save_interval_spin.value(),
                 'show_passwords_default': self.show_passwords_check.isChecked(),
                 'card_hover_animation': self.card_hover_animation_check.isChecked(),
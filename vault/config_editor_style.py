@@ -4,16 +4,15 @@
 为配置编辑对话框提供统一的样式定义
 """
 
-from .config import get_color_theme, get_font_config, get_spacing_config, get_border_radius_config
+from .theme import compile_style
 
 
 def load_config_editor_style():
-    """加载配置编辑对话框样式"""
-    colors = get_color_theme()
-    fonts = get_font_config()
-    spacing = get_spacing_config()
-    radius = get_border_radius_config()
-    
+    """加载配置编辑对话框样式（按主题配置缓存）"""
+    return compile_style(_build_config_editor_style)
+
+
+def _build_config_editor_style(colors, fonts, spacing, radius):
     return f"""
     /* 配置编辑对话框主体样式 */
     QDialog#ConfigEditorDialog {{
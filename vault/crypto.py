@@ -1,16 +1,293 @@
 import os
 import hashlib
-from typing import Tuple, Optional
+import hmac
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Tuple, Optional, BinaryIO, Callable, Iterable
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.exceptions import InvalidTag
 from .config import get_security_config
 
 # ECC加密模块 - 提供基于椭圆曲线的加密和解密接口
 # 使用 ECIES (椭圆曲线集成加密方案) 和 P-256 椭圆曲线
 
 
+# 数据加密密钥派生迭代次数
+KDF_ITERATIONS = 200000
+# 加盐密钥派生使用的盐长度
+KDF_SALT_SIZE = 16
+# 记录加密使用的数据密钥长度（AES-256）
+DATA_KEY_SIZE = 32
+# AES-GCM nonce长度
+NONCE_SIZE = 12
+# AES-GCM 认证标签长度
+TAG_SIZE = 16
+# 流式加密的默认分块大小（明文字节数）
+STREAM_CHUNK_SIZE = 256 * 1024
+# 流式加密 nonce 的随机前缀长度；nonce = 前缀(7) | 块序号(4) | 末块标志(1)
+STREAM_PREFIX_SIZE = 7
+_STREAM_NONCE_SUFFIX = struct.Struct(">IB")
+
+
+class SessionKey:
+    """解锁会话密钥 - 缓存由主密码派生的ECC私钥
+
+    PBKDF2派生只在解锁/创建保险库时执行一次，之后的每次保存都直接复用该私钥。
+    锁定或更换主密码时调用 invalidate() 使其失效。
+
+    salt 为 None 表示旧版固定盐值派生的密钥（无验证标签）；
+    否则 verify_tag 与私钥来自同一次PBKDF2输出，可用于校验主密码。
+    """
+
+    __slots__ = ("_private_key", "_public_key", "salt", "iterations", "verify_tag")
+
+    def __init__(self, private_key: ec.EllipticCurvePrivateKey, salt: Optional[bytes] = None,
+                 iterations: int = KDF_ITERATIONS, verify_tag: Optional[bytes] = None):
+        self._private_key = private_key
+        self._public_key = private_key.public_key()
+        self.salt = salt
+        self.iterations = iterations
+        self.verify_tag = verify_tag
+
+    @property
+    def legacy(self) -> bool:
+        return self.salt is None
+
+    def matches(self, verify_tag: bytes) -> bool:
+        """常数时间比较验证标签"""
+        if self.verify_tag is None or verify_tag is None:
+            return False
+        return hmac.compare_digest(self.verify_tag, verify_tag)
+
+    @property
+    def valid(self) -> bool:
+        return self._private_key is not None
+
+    @property
+    def private_key(self) -> ec.EllipticCurvePrivateKey:
+        if self._private_key is None:
+            raise ValueError("会话密钥已失效")
+        return self._private_key
+
+    @property
+    def public_key(self) -> ec.EllipticCurvePublicKey:
+        if self._public_key is None:
+            raise ValueError("会话密钥已失效")
+        return self._public_key
+
+    def invalidate(self):
+        """丢弃缓存的密钥材料"""
+        self._private_key = None
+        self._public_key = None
+        self.verify_tag = None
+
+
+class RecordCipher:
+    """记录级AEAD - 使用随机数据密钥对单条记录做AES-256-GCM加密
+
+    数据密钥本身通过会话密钥（ECIES）包装后保存在文件头中，因此每条记录的加解密
+    只需一次AES-GCM运算，不涉及ECDH或PBKDF2。附加数据（AAD）用于把密文绑定到记录头。
+    """
+
+    __slots__ = ("_aead",)
+
+    def __init__(self, data_key: bytes):
+        self._aead = AESGCM(data_key)
+
+    @staticmethod
+    def new_data_key() -> bytes:
+        return os.urandom(DATA_KEY_SIZE)
+
+    def seal(self, aad: bytes, data: bytes) -> bytes:
+        """加密一条记录，返回 nonce + 密文"""
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + self._aead.encrypt(nonce, data, aad)
+
+    def open(self, aad: bytes, sealed) -> bytes:
+        """解密 seal() 的输出；sealed 可以是 bytes 或 memoryview"""
+        if len(sealed) < NONCE_SIZE + 16:
+            raise ValueError("记录格式错误")
+        try:
+            return self._aead.decrypt(sealed[:NONCE_SIZE], sealed[NONCE_SIZE:], aad)
+        except InvalidTag:
+            raise ValueError("记录认证失败")
+
+    def invalidate(self):
+        self._aead = None
+
+
+def chunk_count(plain_size: int, chunk_size: int) -> int:
+    """按分块大小切分 plain_size 字节明文得到的块数；空明文也有一个只含标签的末块"""
+    return max(1, -(-plain_size // chunk_size))
+
+
+def _read_full(src: BinaryIO, buf: memoryview) -> int:
+    """从 src 读满 buf（到达末尾时除外），返回读取的字节数"""
+    total = 0
+    while total < len(buf):
+        n = src.readinto(buf[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+
+class StreamCipher:
+    """分块流式AEAD（STREAM 构造）- 在有限内存中加解密任意大小的数据
+
+    明文按 chunk_size 分块，每块单独做AES-256-GCM，密文块比明文块多一个认证标签。
+    nonce 由随机前缀、块序号和末块标志组成：块序号防止删除或重排中间的块，
+    末块标志防止截断或在末尾追加；AAD（通常是流的头部）把所有块绑定到同一个流。
+    encrypt_stream/decrypt_stream 逐块顺序处理，只缓存两个块（需要预读一块才能知道当前块是否为末块）；
+    明文长度事先已知时，seal_chunks/open_chunks 按长度和分块大小确定每一块的位置，
+    各块互不依赖，可以在线程池中并行加解密（AES-GCM 运算期间释放 GIL）。
+    """
+
+    __slots__ = ("_aead", "_prefix", "_aad", "chunk_size")
+
+    def __init__(self, data_key: bytes, prefix: bytes, aad: bytes = b"", chunk_size: int = STREAM_CHUNK_SIZE):
+        if len(prefix) != STREAM_PREFIX_SIZE or chunk_size <= 0:
+            raise ValueError("流式加密参数错误")
+        self._aead = AESGCM(data_key)
+        self._prefix = prefix
+        self._aad = aad
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def new_prefix() -> bytes:
+        return os.urandom(STREAM_PREFIX_SIZE)
+
+    def _nonce(self, index: int, last: bool) -> bytes:
+        if index > 0xFFFFFFFF:
+            raise ValueError("数据过大")
+        return self._prefix + _STREAM_NONCE_SUFFIX.pack(index, last)
+
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO) -> int:
+        """读取 src 直到末尾，逐块加密写入 dst；空输入也会写出一个只含标签的末块
+
+        Returns:
+            写入 dst 的字节数
+        """
+        return self._pipe(src, dst, self.chunk_size, self._aead.encrypt)
+
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO) -> int:
+        """读取 src 直到末尾，逐块解密写入 dst
+
+        Returns:
+            写入 dst 的明文字节数
+
+        Raises:
+            ValueError: 任何一块认证失败，或数据被截断
+        """
+        def open_chunk(nonce, chunk, aad):
+            try:
+                return self._aead.decrypt(nonce, chunk, aad)
+            except InvalidTag:
+                raise ValueError("数据块认证失败")
+
+        return self._pipe(src, dst, self.chunk_size + TAG_SIZE, open_chunk)
+
+    def seal_chunks(self, data: bytes, dst: BinaryIO, workers: int = 1) -> int:
+        """加密整段明文并按顺序写入 dst，块数为 chunk_count(len(data), chunk_size)
+
+        Args:
+            data: 明文（bytes 或其他支持缓冲区协议的对象，按块切片时不复制）
+            workers: 并行线程数，1 表示在当前线程顺序处理
+
+        Returns:
+            写入 dst 的字节数
+        """
+        view = memoryview(data)
+        size = self.chunk_size
+        n = chunk_count(len(view), size)
+
+        def seal(index: int) -> bytes:
+            return self._aead.encrypt(self._nonce(index, index == n - 1), view[index * size:(index + 1) * size],
+                                      self._aad)
+
+        with view:
+            return _map_ordered(seal, range(n), workers, dst.write)
+
+    def open_chunks(self, src: BinaryIO, dst: BinaryIO, plain_size: int, workers: int = 1) -> int:
+        """从 src 读取 seal_chunks() 的输出直到末尾，解密后按顺序写入 dst
+
+        Args:
+            plain_size: 明文长度（来自文件中的清单），决定块数和每一块的长度
+            workers: 并行线程数，1 表示在当前线程顺序处理
+
+        Returns:
+            写入 dst 的明文字节数
+
+        Raises:
+            ValueError: 任何一块认证失败，或数据长度与 plain_size 不符
+        """
+        size = self.chunk_size
+        n = chunk_count(plain_size, size)
+
+        def read_chunks() -> Iterable[Tuple[int, bytes]]:
+            for index in range(n):
+                length = min(size, plain_size - index * size) + TAG_SIZE
+                chunk = src.read(length)
+                if len(chunk) != length:
+                    raise ValueError("数据不完整")
+                yield index, chunk
+            if src.read(1):
+                raise ValueError("数据长度不一致")
+
+        def open_chunk(item: Tuple[int, bytes]) -> bytes:
+            index, chunk = item
+            try:
+                return self._aead.decrypt(self._nonce(index, index == n - 1), chunk, self._aad)
+            except InvalidTag:
+                raise ValueError("数据块认证失败")
+
+        return _map_ordered(open_chunk, read_chunks(), workers, dst.write)
+
+    def _pipe(self, src: BinaryIO, dst: BinaryIO, block: int, transform) -> int:
+        current, ahead = memoryview(bytearray(block)), memoryview(bytearray(block))
+        n = _read_full(src, current)
+        index = total = 0
+        while True:
+            # 当前块读满时预读下一块，读不到内容说明当前块是末块
+            m = _read_full(src, ahead) if n == block else 0
+            out = transform(self._nonce(index, not m), current[:n], self._aad)
+            dst.write(out)
+            total += len(out)
+            if not m:
+                return total
+            current, ahead, n = ahead, current, m
+            index += 1
+
+
+def _map_ordered(fn: Callable, items: Iterable, workers: int, write: Callable[[bytes], object]) -> int:
+    """对 items 逐个调用 fn 并按原顺序写出结果，返回写出的总字节数
+
+    workers > 1 时每次向线程池提交一个窗口（workers 的若干倍个任务），窗口内的结果全部写出后
+    再读取下一批输入，同时在内存中的块数与 workers 成正比，与数据总量无关。
+    """
+    total = 0
+    if workers <= 1:
+        for item in items:
+            out = fn(item)
+            write(out)
+            total += len(out)
+        return total
+    items = iter(items)
+    window = workers * 4
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while True:
+            batch = list(islice(items, window))
+            if not batch:
+                return total
+            for out in pool.map(fn, batch):
+                write(out)
+                total += len(out)
+
+
 class CryptoManager:
     """ECC加密管理器 - 提供基于椭圆曲线的加密和解密接口"""
     
@@ -28,13 +305,24 @@ class CryptoManager:
         Returns:
             加密后的数据包（包含临时公钥、盐值和密文）
         """
+        return self.encrypt_with_key(self.derive_session_key(password), data)
+    
+    def encrypt_with_key(self, session_key: SessionKey, data: bytes) -> bytes:
+        """使用已派生的会话密钥加密，跳过PBKDF2
+        
+        Args:
+            session_key: derive_session_key() 返回的会话密钥
+            data: 要加密的数据
+            
+        Returns:
+            加密后的数据包，格式与 encrypt() 相同
+        """
         # 生成临时密钥对
         ephemeral_private_key = ec.generate_private_key(self.curve)
         ephemeral_public_key = ephemeral_private_key.public_key()
         
-        # 从密码派生接收方密钥对
-        recipient_private_key = self._derive_key_pair_from_password(password)
-        recipient_public_key = recipient_private_key.public_key()
+        # 接收方公钥来自会话密钥
+        recipient_public_key = session_key.public_key
         
         # 执行ECDH密钥交换
         shared_key = ephemeral_private_key.exchange(ec.ECDH(), recipient_public_key)
@@ -74,6 +362,21 @@ class CryptoManager:
         Returns:
             解密后的原始数据
             
+        Raises:
+            ValueError: 数据格式错误或解密失败
+        """
+        return self.decrypt_with_key(self.derive_session_key(password), encrypted_data)
+    
+    def decrypt_with_key(self, session_key: SessionKey, encrypted_data: bytes) -> bytes:
+        """使用已派生的会话密钥解密，跳过PBKDF2
+        
+        Args:
+            session_key: derive_session_key() 返回的会话密钥
+            encrypted_data: 加密的数据包（bytes 或 memoryview，传入 memoryview 时不复制密文）
+            
+        Returns:
+            解密后的原始数据
+            
         Raises:
             ValueError: 数据格式错误或解密失败
         """
@@ -87,7 +390,7 @@ class CryptoManager:
         offset += 1
         if len(encrypted_data) < offset + pubkey_len:
             raise ValueError("加密数据格式错误")
-        ephemeral_public_bytes = encrypted_data[offset:offset + pubkey_len]
+        ephemeral_public_bytes = bytes(encrypted_data[offset:offset + pubkey_len])
         offset += pubkey_len
         
         # 解析盐值
@@ -97,7 +400,7 @@ class CryptoManager:
         offset += 1
         if len(encrypted_data) < offset + salt_len:
             raise ValueError("加密数据格式错误")
-        salt = encrypted_data[offset:offset + salt_len]
+        salt = bytes(encrypted_data[offset:offset + salt_len])
         offset += salt_len
         
         # 解析nonce
@@ -107,7 +410,7 @@ class CryptoManager:
         offset += 1
         if len(encrypted_data) < offset + nonce_len:
             raise ValueError("加密数据格式错误")
-        nonce = encrypted_data[offset:offset + nonce_len]
+        nonce = bytes(encrypted_data[offset:offset + nonce_len])
         offset += nonce_len
         
         # 获取密文
@@ -119,8 +422,8 @@ class CryptoManager:
                 self.curve, ephemeral_public_bytes
             )
             
-            # 从密码派生接收方密钥对
-            recipient_private_key = self._derive_key_pair_from_password(password)
+            # 接收方私钥来自会话密钥
+            recipient_private_key = session_key.private_key
             
             # 执行ECDH密钥交换
             shared_key = recipient_private_key.exchange(ec.ECDH(), ephemeral_public_key)
@@ -170,8 +473,44 @@ class CryptoManager:
         computed_hash = self._hash_master(password, salt)
         return computed_hash == expected_hash
     
+    def derive_session_key(self, password: str, salt: Optional[bytes] = None,
+                           iterations: int = KDF_ITERATIONS) -> SessionKey:
+        """从主密码派生会话密钥（执行一次完整的PBKDF2）
+        
+        Args:
+            password: 主密码
+            salt: 保险库盐值；为 None 时使用旧版固定盐值派生
+            iterations: PBKDF2迭代次数
+            
+        Returns:
+            可重复用于 encrypt_with_key/decrypt_with_key 的会话密钥
+        """
+        if salt is None:
+            return SessionKey(self._derive_key_pair_from_password(password))
+        seed = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen=32)
+        # 同一次PBKDF2输出经HKDF扩展为私钥种子和验证标签，解锁只需一次慢速派生
+        material = HKDF(
+            algorithm=hashes.SHA256(),
+            length=64,
+            salt=None,
+            info=b'MimaVault-KeySchedule-v2'
+        ).derive(seed)
+        private_key = self._private_key_from_seed(material[:32])
+        return SessionKey(private_key, salt=salt, iterations=iterations, verify_tag=material[32:])
+    
+    def new_session_key(self, password: str) -> SessionKey:
+        """使用新的随机盐值派生会话密钥（创建保险库或更换主密码时使用）"""
+        return self.derive_session_key(password, salt=os.urandom(KDF_SALT_SIZE))
+    
+    def verify_session_password(self, password: str, session_key: SessionKey) -> bool:
+        """使用会话密钥的盐值重新派生并比较验证标签"""
+        if session_key.legacy:
+            return False
+        candidate = self.derive_session_key(password, session_key.salt, session_key.iterations)
+        return session_key.matches(candidate.verify_tag)
+    
     def _derive_key_pair_from_password(self, password: str) -> ec.EllipticCurvePrivateKey:
-        """从密码派生ECC密钥对
+        """从密码派生ECC密钥对（旧版固定盐值格式）
         
         Args:
             password: 密码字符串
@@ -180,11 +519,14 @@ class CryptoManager:
             ECC私钥对象
         """
         # 使用PBKDF2从密码派生32字节的种子
-        iterations = 200000  # 固定数据加密迭代次数
+        iterations = KDF_ITERATIONS  # 固定数据加密迭代次数
         # 使用固定盐值确保相同密码总是生成相同的密钥对
         fixed_salt = b'ECIES-KeyDerivation-Salt-2024'
         seed = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), fixed_salt, iterations, dklen=32)
-        
+        return self._private_key_from_seed(seed)
+    
+    def _private_key_from_seed(self, seed: bytes) -> ec.EllipticCurvePrivateKey:
+        """将32字节种子转换为P-256私钥"""
         # 将种子转换为私钥标量（确保在曲线阶数范围内）
         private_value = int.from_bytes(seed, 'big')
         # P-256曲线的阶数
@@ -230,4 +572,57 @@ def decrypt(password: str, encrypted_data: bytes) -> bytes:
     Returns:
         解密后的原始数据
     """
-    return _crypto_manager.decrypt(password, encrypted_data)
\ No newline at end of file
+    return _crypto_manager.decrypt(password, encrypted_data)
+
+
+def derive_session_key(password: str, salt: Optional[bytes] = None,
+                       iterations: int = KDF_ITERATIONS) -> SessionKey:
+    """从主密码派生会话密钥
+    
+    Args:
+        password: 主密码
+        salt: 保险库盐值；为 None 时使用旧版固定盐值
+        iterations: PBKDF2迭代次数
+        
+    Returns:
+        会话密钥
+    """
+    return _crypto_manager.derive_session_key(password, salt, iterations)
+
+
+def new_session_key(password: str) -> SessionKey:
+    """使用新的随机盐值派生会话密钥
+    
+    Args:
+        password: 主密码
+        
+    Returns:
+        会话密钥
+    """
+    return _crypto_manager.new_session_key(password)
+
+
+def encrypt_with_key(session_key: SessionKey, data: bytes) -> bytes:
+    """使用会话密钥加密数据
+    
+    Args:
+        session_key: 会话密钥
+        data: 要加密的数据
+        
+    Returns:
+        加密后的数据包
+    """
+    return _crypto_manager.encrypt_with_key(session_key, data)
+
+
+def decrypt_with_key(session_key: SessionKey, encrypted_data: bytes) -> bytes:
+    """使用会话密钥解密数据
+    
+    Args:
+        session_key: 会话密钥
+        encrypted_data: 加密的数据包
+        
+    Returns:
+        解密后的原始数据
+    """
+    return _crypto_manager.decrypt_with_key(session_key, encrypted_data)
@@ -1,342 +1,53 @@
 import functools
-import re
 from PyQt5 import QtWidgets, QtGui, QtCore
-from typing import Optional, Tuple, Dict
-from .models import Group, Account, PasswordStrength
-from .storage import VaultStorage, VaultError
+from typing import AbstractSet, Optional, Tuple, Dict, List
+from .models import Account, PasswordStrength
+from .storage import VaultStorage, VaultError, is_encrypted_blob, ENCRYPTED_PROBE_SIZE
 from .dialogs import AccountDialog, InputDialog, PasswordGeneratorDialog
-from .settings_dialog import SettingsDialog
-from .config import get_card_config, get_color_theme, get_font_config, get_spacing_config, get_border_radius_config, get_ui_config, get_text_config, get_text
+from .save_scheduler import SaveScheduler
+from .search_worker import SearchController
+from .card_view import AccountListModel, AccountCardDelegate, AccountListView, AccountCardPool, CardSlotDelegate
+from .config import get_card_config, get_font_config, get_spacing_config, get_border_radius_config, get_ui_config, get_text_config, get_text
+from .style import apply_app_style
 
-
-class SaveThread(QtCore.QThread):
-    """异步保存线程"""
-    save_completed = QtCore.pyqtSignal()
-    save_failed = QtCore.pyqtSignal(str)
-    
-    def __init__(self, storage: VaultStorage):
-        super().__init__()
-        self.storage = storage
-    
-    def run(self):
-        """在后台线程中执行保存操作"""
-        try:
-            self.storage.save()
-            self.save_completed.emit()
-        except VaultError as e:
-            self.save_failed.emit(str(e))
-        except Exception as e:
-            self.save_failed.emit(f"未知错误: {str(e)}")
-
-
-class AddAccountThread(QtCore.QThread):
-    """异步添加账号线程"""
-    add_completed = QtCore.pyqtSignal()
-    add_failed = QtCore.pyqtSignal(str)
-    
-    def __init__(self, storage: VaultStorage, account: Account):
-        super().__init__()
-        self.storage = storage
-        self.account = account
-    
-    def run(self):
-        """在后台线程中执行添加账号和保存操作"""
-        try:
-            self.storage.add_account(self.account)
-            self.storage.save()
-            self.add_completed.emit()
-        except VaultError as e:
-            self.add_failed.emit(str(e))
-        except Exception as e:
-            self.add_failed.emit(f"未知错误: {str(e)}")
-
-
-class AddGroupThread(QtCore.QThread):
-    """异步添加分组线程"""
-    group_added = QtCore.pyqtSignal(str, str)  # real_group_id, temp_id
-    group_add_failed = QtCore.pyqtSignal(str, str)  # error_msg, temp_id
-    
-    def __init__(self, storage: VaultStorage, group_name: str, temp_id: str):
-        super().__init__()
-        self.storage = storage
-        self.group_name = group_name
-        self.temp_id = temp_id
-    
-    def run(self):
-        """在后台线程中执行添加分组和保存操作"""
-        try:
-            new_group = self.storage.add_group(self.group_name)
-            self.storage.save()
-            self.group_added.emit(new_group.id, self.temp_id)
-        except VaultError as e:
-            self.group_add_failed.emit(str(e), self.temp_id)
-        except Exception as e:
-            self.group_add_failed.emit(f"未知错误: {str(e)}", self.temp_id)
-
-
-class AccountCard(QtWidgets.QFrame):
-    # 在类级别定义信号
-    clicked = QtCore.pyqtSignal(str)
-    doubleClicked = QtCore.pyqtSignal(str)
-    deleteRequested = QtCore.pyqtSignal(str)  # 新增删除请求信号
-    moveToGroupRequested = QtCore.pyqtSignal(str, str)  # 新增移动至分组请求信号 (account_id, group_id)
-    
-    # 类级别缓存配置，避免重复获取
-    _card_config = None
-    _label_styles = {}  # 缓存标签样式
-    
-    @classmethod
-    def _get_card_config(cls):
-        if cls._card_config is None:
-            cls._card_config = get_card_config()
-        return cls._card_config
-    
-    @classmethod
-    def _get_label_style(cls, role: str):
-        """缓存标签样式以提高创建性能"""
-        if role not in cls._label_styles:
-            cls._label_styles[role] = f"[role=\"{role}\"] {{ }}"
-        return cls._label_styles[role]
-    
-    def __init__(self, account: Account, group_name: str, show_passwords: bool, groups: list = None, parent=None):
-        super().__init__(parent)
-        self.account = account
-        self.show_passwords = show_passwords
-        self.selected = False
-        self.groups = groups or []  # 存储所有分组信息
-        
-        self.setObjectName("AccountCard")
-        card_config = self._get_card_config()
-        self.setFixedHeight(card_config['fixed_height'])
-        self.setContentsMargins(0, 0, 0, 0)
-        
-        # 设置鼠标跟踪以支持悬停效果
-        self.setMouseTracking(True)
-        
-        # 预创建所有可能需要的标签以提高性能
-        self._setup_ui(group_name)
-
-    def _setup_ui(self, group_name: str):
-        """预创建UI组件以提高性能"""
-        card_config = self._get_card_config()
-        
-        # 创建布局
-        layout = QtWidgets.QVBoxLayout(self)
-        card_margins = card_config['margins']
-        layout.setContentsMargins(card_margins['card'], card_margins['content'], card_margins['card'], card_margins['content'])
-        layout.setSpacing(6)
-        
-        # 标题行
-        title_layout = QtWidgets.QHBoxLayout()
-        title_layout.setContentsMargins(0, 0, 0, 0)
-        
-        self.name_label = QtWidgets.QLabel(self.account.name or get_text('default_values', 'unnamed_account'))
-        self.name_label.setProperty("role", "title")
-        self.name_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-        title_layout.addWidget(self.name_label)
-        
-        title_layout.addStretch()
-        
-        self.group_label = QtWidgets.QLabel(group_name)
-        self.group_label.setObjectName("GroupTag")
-        self.group_label.setProperty("role", "muted")
-        self.group_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-        title_layout.addWidget(self.group_label)
-        
-        layout.addLayout(title_layout)
-        
-        # 用户名
-        username_prefix = get_text('labels', 'username')
-        self.username_label = QtWidgets.QLabel(f"{username_prefix}{self.account.username or ''}")
-        self.username_label.setProperty("role", "muted")
-        self.username_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-        layout.addWidget(self.username_label)
-        
-        # 密码
-        self.password_label = QtWidgets.QLabel()
-        self.password_label.setProperty("role", "muted")
-        self.password_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-        layout.addWidget(self.password_label)
-        self.set_show_passwords(self.show_passwords)
-        
-        # URL（延迟创建，仅在需要时创建）
-        self.url_label = None
-        if self.account.url:
-            url_prefix = get_text('labels', 'url')
-            self.url_label = QtWidgets.QLabel(f"{url_prefix}{self.account.url}")
-            self.url_label.setProperty("role", "muted")
-            self.url_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-            layout.addWidget(self.url_label)
-        
-        # 备注（延迟创建，仅在需要时创建）
-        self.notes_label = None
-        if self.account.notes:
-            notes_prefix = get_text('labels', 'notes')
-            self.notes_label = QtWidgets.QLabel(f"{notes_prefix}{self.account.notes}")
-            self.notes_label.setProperty("role", "notes")
-            self.notes_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-            layout.addWidget(self.notes_label)
-
-    def set_show_passwords(self, show: bool):
-        """设置是否显示密码"""
-        self.show_passwords = show
-        password_prefix = get_text('labels', 'password')
-        if show:
-            self.password_label.setText(f"{password_prefix}{self.account.password or ''}")
-        else:
-            self.password_label.setText(password_prefix + "*" * len(self.account.password or ""))
-
-    def set_selected(self, selected: bool):
-        """设置选中状态"""
-        self.selected = selected
-        self.setProperty("selected", selected)
-        self.style().unpolish(self)
-        self.style().polish(self)
-        self.update()
-
-    # Click/DoubleClick passthrough
-    def mousePressEvent(self, e: QtGui.QMouseEvent):
-        # 只处理左键和右键，其他按键直接忽略
-        if e.button() == QtCore.Qt.LeftButton:
-            self.clicked.emit(self.account.id)
-            e.accept()
-        elif e.button() == QtCore.Qt.RightButton:
-            self._show_context_menu(e.globalPos())
-            e.accept()
-        # 移除else分支，减少不必要的事件传播
-
-    def mouseDoubleClickEvent(self, e: QtGui.QMouseEvent):
-        if e.button() == QtCore.Qt.LeftButton:
-            self.doubleClicked.emit(self.account.id)
-            e.accept()  # 阻止事件继续传播
-            return
-        super().mouseDoubleClickEvent(e)
-
-    def _show_context_menu(self, pos: QtCore.QPoint):
-        """显示账号卡片的右键菜单"""
-        menu = QtWidgets.QMenu(self)
-        
-        edit_action = menu.addAction("编辑")
-        edit_action.triggered.connect(lambda: self.doubleClicked.emit(self.account.id))
-        
-        copy_menu = menu.addMenu("复制")
-        copy_username = copy_menu.addAction("复制用户名")
-        copy_username.triggered.connect(lambda: self._copy_to_clipboard(self.account.username))
-        copy_password = copy_menu.addAction("复制密码")
-        copy_password.triggered.connect(lambda: self._copy_to_clipboard(self.account.password))
-        copy_url = copy_menu.addAction("复制网址")
-        copy_url.triggered.connect(lambda: self._copy_to_clipboard(self.account.url))
-        
-        # 添加移动至分组的子菜单
-        if self.groups:
-            menu.addSeparator()
-            move_to_group_text = get_text('labels', 'move_to_group')
-            move_menu = menu.addMenu(move_to_group_text)
-            
-            # 获取当前账号所在的分组ID
-            current_group_id = self.account.group_id
-            
-            for group in self.groups:
-                # 如果是当前分组，则跳过
-                if group.id == current_group_id:
-                    continue
-                    
-                move_action = move_menu.addAction(group.name)
-                # 使用lambda的默认参数来捕获group.id的值
-                move_action.triggered.connect(
-                    lambda checked, gid=group.id: self.moveToGroupRequested.emit(self.account.id, gid)
-                )
-        
-        menu.addSeparator()
-        delete_action = menu.addAction("删除")
-        delete_action.triggered.connect(lambda: self.deleteRequested.emit(self.account.id))
-        
-        # 执行菜单并在完成后清理
-        try:
-            menu.exec_(pos)
-        finally:
-            # 确保菜单被正确销毁
-            menu.deleteLater()
-
-    def _copy_to_clipboard(self, text: str):
-        """复制文本到剪贴板"""
-        if text:
-            clipboard = QtWidgets.QApplication.clipboard()
-            clipboard.setText(text)
-            # 可以添加一个临时提示
-            QtWidgets.QToolTip.showText(QtGui.QCursor.pos(), "已复制到剪贴板", self, QtCore.QRect(), 1500)
-
-    def enterEvent(self, event):
-        """鼠标悬停效果"""
-        self.setProperty("hovered", True)
-        self.style().unpolish(self)
-        self.style().polish(self)
-        self.update()
-        super().enterEvent(event)
-
-    def leaveEvent(self, event):
-        """鼠标离开效果"""
-        self.setProperty("hovered", False)
-        self.style().unpolish(self)
-        self.style().polish(self)
-        self.update()
-        super().leaveEvent(event)
-    
-    def __del__(self):
-        """析构函数：确保信号正确断开"""
-        try:
-            # 断开所有信号连接
-            self.clicked.disconnect()
-            self.doubleClicked.disconnect()
-            self.deleteRequested.disconnect()
-            self.moveToGroupRequested.disconnect()
-        except (TypeError, RuntimeError):
-            # 信号已经断开或对象已被销毁
-            pass
-    
-    def cleanup_signals(self):
-        """手动清理信号连接"""
-        try:
-            self.clicked.disconnect()
-            self.doubleClicked.disconnect()
-            self.deleteRequested.disconnect()
-            self.moveToGroupRequested.disconnect()
-        except (TypeError, RuntimeError):
-            # 信号已经断开或对象已被销毁
-            pass
+# 分组树项中保存分组名称的数据角色（显示文本还包含账号数量）
+_GROUP_NAME_ROLE = QtCore.Qt.UserRole + 1
 
 
 class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self, storage: VaultStorage):
+    def __init__(self, storage: VaultStorage, load_data: bool = True):
         super().__init__()
         self.setWindowTitle(get_text('default_values', 'app_title') or "Mima 密码保险箱")
         self.storage = storage
         self.show_passwords = False
-        self._card_items: Dict[str, Tuple[QtWidgets.QListWidgetItem, AccountCard]] = {}
-        # 账号缓存：ID -> Account对象，提高查找效率
-        self._account_cache: Dict[str, Account] = {}
-        # 分组缓存：ID -> Group对象
-        self._group_cache: Dict[str, Group] = {}
-        # 正则表达式缓存：避免重复编译
-        self._regex_cache: Dict[str, re.Pattern] = {}
-        # 搜索结果缓存
-        self._search_cache: Dict[str, Dict[str, bool]] = {}
-        # 筛选结果缓存
-        self._filter_cache: Dict[str, bool] = {}
+        # 上一次应用的筛选条件 (搜索文本, 分组ID)，条件变化时列表回到顶部
+        self._last_filter: Optional[Tuple[str, Optional[str]]] = None
         # 搜索防抖定时器
         self._search_timer = QtCore.QTimer()
         self._search_timer.setSingleShot(True)
         self._search_timer.timeout.connect(self._do_apply_filter)
-        # 添加分页加载相关属性
-        ui_config = get_ui_config()
-        self._batch_size = ui_config['batch_load_size']  # 每批加载的卡片数量
-        self._current_batch = 0  # 当前已加载的批次数
-        self._pending_accounts = []  # 待加载的账号列表
         # 添加初始化完成标志
         self._initialization_complete = False
+        # 所有修改经由保存调度器合并后在后台写盘
+        self._save_scheduler = SaveScheduler(storage, self)
+        self._save_scheduler.save_failed.connect(self._on_save_failed)
+        # 搜索在后台线程中进行，结果分块送回后再更新卡片列表
+        self._search = SearchController(storage, self)
+        self._search.rowsReady.connect(self._on_search_rows)
+        self._search.finished.connect(self._on_search_finished)
+        self._search_keep_position = False
+        # 分组ID -> 分组树中的项
+        self._group_items: Dict[str, QtWidgets.QTreeWidgetItem] = {}
+        # 有搜索文本时各分组的命中数量，没有搜索文本时为 None
+        self._search_group_counts: Optional[Dict[Optional[str], int]] = None
 
         self._init_ui()
-        # 延迟加载数据以提高窗口显示速度
+        # 延迟加载数据以提高窗口显示速度；load_data=False 时由调用方在解锁完成后调用 start_loading()
+        if load_data:
+            self.start_loading()
+
+    def start_loading(self):
+        """保险库解锁完成后开始绑定数据"""
         QtCore.QTimer.singleShot(10, self._load_data)
 
     def _init_ui(self):
@@ -417,25 +128,20 @@ class MainWindow(QtWidgets.QMainWindow):
         lyt_right = QtWidgets.QVBoxLayout(right)
         lyt_right.setContentsMargins(layout_margin, layout_margin, layout_margin, layout_margin)
 
-        self.card_list = QtWidgets.QListWidget()
-        self.card_list.setObjectName("CardList")
-        self.card_list.setViewMode(QtWidgets.QListView.IconMode)
-        self.card_list.setResizeMode(QtWidgets.QListView.Adjust)
-        self.card_list.setMovement(QtWidgets.QListView.Static)
-        self.card_list.setWrapping(True)
-        self.card_list.setSpacing(10)
-        self.card_list.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
-        self.card_list.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
-        self.card_list.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
-        self.card_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
-        self.card_list.setFocusPolicy(QtCore.Qt.NoFocus)
-        self.card_list.itemSelectionChanged.connect(self._on_card_selection_changed)
-        self.card_list.itemDoubleClicked.connect(lambda _: self._edit_selected())
-        # default card size
-        card_config = get_card_config()
-        self.card_size = QtCore.QSize(card_config['width'], card_config['height'])
-        grid_spacing = card_config['grid_spacing']
-        self.card_list.setGridSize(self.card_size + QtCore.QSize(grid_spacing, grid_spacing))
+        # 模型只保存当前显示的账号ID；卡片由委托按需绘制，或由复用池中的 AccountCard 控件显示
+        self.card_model = AccountListModel(self.storage, self)
+        self.card_list = AccountListView()
+        self.card_list.setModel(self.card_model)
+        ui_config = get_ui_config()
+        if ui_config.get('card_render_mode', 'delegate') == 'widgets':
+            self.card_list.setItemDelegate(CardSlotDelegate(self.card_list))
+            self._card_pool = AccountCardPool(self.card_list, ui_config.get('card_pool_overscan', 1))
+        else:
+            self.card_list.setItemDelegate(AccountCardDelegate(self.card_list))
+            self._card_pool = None
+        self.card_list.editRequested.connect(self._edit_account)
+        self.card_list.deleteRequested.connect(self._delete_account_by_id)
+        self.card_list.moveToGroupRequested.connect(self._move_account_to_group)
 
         lyt_right.addWidget(self.card_list)
 
@@ -456,22 +162,16 @@ class MainWindow(QtWidgets.QMainWindow):
 
         # Status bar
         self.statusBar().showMessage("就绪")
+        self.save_status_label = QtWidgets.QLabel(self._save_scheduler.status_text())
+        self.statusBar().addPermanentWidget(self.save_status_label)
+        self._save_scheduler.status_changed.connect(self.save_status_label.setText)
 
     # ----- Data binding -----
     def _load_data(self):
-        self._rebuild_caches()
         self._refresh_groups()
-        self._refresh_table_initial()  # 使用增量加载方式初始化表格
+        self._refresh_table()
         self._initialization_complete = True
 
-    def _rebuild_caches(self):
-        """重建账号和分组缓存"""
-        self._account_cache = {a.id: a for a in self.storage.vault.accounts}
-        self._group_cache = {g.id: g for g in self.storage.vault.groups}
-        # 清空搜索和筛选缓存
-        self._search_cache.clear()
-        self._filter_cache.clear()
-
     def _refresh_groups(self):
         selected_gid = self._current_group_id()
         def_gid = self.storage.default_group_id()
@@ -485,6 +185,7 @@ class MainWindow(QtWidgets.QMainWindow):
             item = self.group_tree.topLevelItem(i)
             gid = item.data(0, QtCore.Qt.UserRole)
             existing_items[gid] = item
+        group_items = {}
         
         # 批量更新UI
         self.group_tree.setUpdatesEnabled(False)
@@ -507,8 +208,7 @@ class MainWindow(QtWidgets.QMainWindow):
                 if g.id in existing_items:
                     # 更新现有项目
                     item = existing_items[g.id]
-                    if item.text(0) != g.name:
-                        item.setText(0, g.name)
+                    self._set_group_item(item, g.id, g.name)
                     # 确保项目在正确位置
                     current_index = self.group_tree.indexOfTopLevelItem(item)
                     if current_index != i:
@@ -516,26 +216,58 @@ class MainWindow(QtWidgets.QMainWindow):
                         self.group_tree.insertTopLevelItem(i, item)
                 else:
                     # 添加新项目
-                    item = QtWidgets.QTreeWidgetItem([g.name])
+                    item = QtWidgets.QTreeWidgetItem()
                     item.setData(0, QtCore.Qt.UserRole, g.id)
+                    self._set_group_item(item, g.id, g.name)
                     self.group_tree.insertTopLevelItem(i, item)
+                group_items[g.id] = item
                 
                 if g.id == selected_gid:
                     to_select_item = item
+            self._group_items = group_items
             
             # 恢复选中状态
-            if to_select_item is None and def_gid in current_groups:
-                for i in range(self.group_tree.topLevelItemCount()):
-                    item = self.group_tree.topLevelItem(i)
-                    if item.data(0, QtCore.Qt.UserRole) == def_gid:
-                        to_select_item = item
-                        break
+            if to_select_item is None:
+                to_select_item = group_items.get(def_gid)
             
             if to_select_item is not None:
                 self.group_tree.setCurrentItem(to_select_item)
         finally:
             self.group_tree.setUpdatesEnabled(True)
 
+    def _set_group_item(self, item: QtWidgets.QTreeWidgetItem, gid: str, name: str):
+        """设置分组树项的名称和显示文本：名称 (账号数)，有搜索文本时为 名称 (命中数/账号数)"""
+        item.setData(0, _GROUP_NAME_ROLE, name)
+        total = self.storage.vault.group_size(gid)
+        if self._search_group_counts is None:
+            label = f"{name} ({total})"
+        else:
+            label = f"{name} ({self._search_group_counts.get(gid, 0)}/{total})"
+        if item.text(0) != label:
+            item.setText(0, label)
+
+    def _update_group_counts(self, *gids: Optional[str]):
+        """刷新分组树中指定分组（不指定时为全部分组）的账号数量
+
+        数量直接取自存储层的分组成员索引，每个分组 O(1)，不需要遍历账号。
+        """
+        for gid in gids or tuple(self._group_items):
+            item = self._group_items.get(gid)
+            if item is not None:
+                self._set_group_item(item, gid, item.data(0, _GROUP_NAME_ROLE))
+
+    def _apply_theme(self) -> bool:
+        """按当前主题配置重新应用样式，只处理发生变化的部分；返回全局样式表是否重新设置"""
+        # 主题配置未变化时不重设全局样式表，避免所有控件重新 polish
+        restyled = apply_app_style(QtWidgets.QApplication.instance())
+        # 卡片的颜色和字体由委托（或复用池）缓存，清空后只重绘视口内的卡片，不重建数据
+        if self._card_pool is not None:
+            self._card_pool.reload_theme()
+        else:
+            self.card_list.itemDelegate().reload_theme()
+            self.card_list.viewport().update()
+        return restyled
+
     # ----- Group actions -----
     def _group_menu(self, pos):
         item = self.group_tree.itemAt(pos)
@@ -578,33 +310,23 @@ class MainWindow(QtWidgets.QMainWindow):
             self.setUpdatesEnabled(False)
             try:
                 self.storage.delete_group(gid, migrate_to)
-                # 重建缓存以反映分组变化
-                self._rebuild_caches()
                 # 删除后自动选中默认分组，避免筛选导致误以为账号丢失
                 def_gid = self.storage.default_group_id()
                 self._refresh_groups()
-                for i in range(self.group_tree.topLevelItemCount()):
-                    it = self.group_tree.topLevelItem(i)
-                    if it.data(0, QtCore.Qt.UserRole) == def_gid:
-                        self.group_tree.setCurrentItem(it)
-                        break
+                it = self._group_items.get(def_gid)
+                if it is not None:
+                    self.group_tree.setCurrentItem(it)
                 self._refresh_table()
             finally:
                 # 恢复UI更新
                 self.setUpdatesEnabled(True)
                 
-            try:
-                self.storage.save()
-            except VaultError as e:
-                QtWidgets.QMessageBox.critical(self, "错误", str(e))
+            self._save_scheduler.mark_dirty()
             self._refresh_table()
 
     # ----- Account actions -----
     def _selected_account_id(self) -> Optional[str]:
-        items = self.card_list.selectedItems()
-        if not items:
-            return None
-        return items[0].data(QtCore.Qt.UserRole)
+        return self.card_list.current_account_id()
 
     def _add_account(self):
         gid = self._current_group_id()
@@ -612,90 +334,49 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             if dlg.exec_() == QtWidgets.QDialog.Accepted:
                 acc = dlg.get_account(gid)
+                self.storage.add_account(acc)
+                self._update_group_counts(acc.group_id)
                 
-                # 立即添加到内存缓存，避免阻塞UI
-                self._account_cache[acc.id] = acc
-                
-                # 立即在界面显示新账号
-                default_group_name = get_text('default_values', 'default_group') or "未分组"
-                group_name = next((g.name for g in self.storage.vault.groups if g.id == gid), default_group_name)
-                self._create_account_card(acc, group_name)
-                
-                # 延迟应用筛选条件，避免立即阻塞UI
-                QtCore.QTimer.singleShot(10, self._apply_filter)
+                # 重新筛选，新账号按当前搜索条件显示
+                self._refresh_table()
                 
-                # 异步添加到存储并保存，完全避免阻塞界面
-                QtCore.QTimer.singleShot(50, lambda: self._add_account_async(acc))
+                # 合并保存，写盘在后台线程进行
+                self._save_scheduler.mark_dirty()
         finally:
             # 确保对话框被正确释放
             dlg.deleteLater()
     
-    def _add_account_async(self, account: Account):
-        """异步添加账号到存储"""
-        # 如果已有保存线程在运行，则跳过
-        if hasattr(self, '_add_thread') and self._add_thread.isRunning():
-            return
-            
-        # 创建添加账号线程
-        self._add_thread = AddAccountThread(self.storage, account)
-        self._add_thread.add_completed.connect(self._on_add_completed)
-        self._add_thread.add_failed.connect(self._on_add_failed)
-        self._add_thread.start()
-    
-    def _on_add_completed(self):
-        """添加账号完成回调"""
-        self.statusBar().showMessage("账号已保存", 2000)
-    
-    def _on_add_failed(self, error_msg: str):
-        """添加账号失败回调"""
-        QtWidgets.QMessageBox.critical(self, "错误", f"保存失败: {error_msg}")
-        self.statusBar().showMessage("保存失败", 3000)
-    
-    def _save_async(self):
-        """异步保存数据到文件"""
-        # 如果已有保存线程在运行，则跳过
-        if hasattr(self, '_save_thread') and self._save_thread.isRunning():
-            return
-            
-        # 创建保存线程
-        self._save_thread = SaveThread(self.storage)
-        self._save_thread.save_completed.connect(self._on_save_completed)
-        self._save_thread.save_failed.connect(self._on_save_failed)
-        self._save_thread.start()
-    
-    def _on_save_completed(self):
-        """保存完成回调"""
-        self.statusBar().showMessage("账号已保存", 2000)
-    
     def _on_save_failed(self, error_msg: str):
         """保存失败回调"""
         QtWidgets.QMessageBox.critical(self, "错误", f"保存失败: {error_msg}")
         self.statusBar().showMessage("保存失败", 3000)
 
     def _get_account(self, aid: str) -> Optional[Account]:
-        """从缓存中快速获取账号对象"""
-        return self._account_cache.get(aid)
+        """按ID获取账号对象（存储层索引，O(1)）"""
+        return self.storage.get_account(aid)
 
     def _edit_selected(self):
         aid = self._selected_account_id()
-        if not aid:
-            return
+        if aid:
+            self._edit_account(aid)
+
+    def _edit_account(self, aid: str):
         a = self._get_account(aid)
         if not a:
             return
         dlg = AccountDialog(a, self)
         try:
             if dlg.exec_() == QtWidgets.QDialog.Accepted:
+                old_gid = self.storage.vault.account_group_id(aid)
                 na = dlg.get_account(a.group_id)
                 self.storage.update_account(na)
-                # 更新缓存
-                self._account_cache[na.id] = na
+                self._update_group_counts(old_gid, na.group_id)
                 
                 # 延迟刷新表格，避免立即阻塞UI
                 QtCore.QTimer.singleShot(10, self._refresh_table)
                 
-                # 异步保存，避免阻塞UI
-                QtCore.QTimer.singleShot(50, self._save_async)
+                # 合并保存，写盘在后台线程进行
+                self._save_scheduler.mark_dirty()
         finally:
             # 确保对话框被正确释放
             dlg.deleteLater()
@@ -705,15 +386,15 @@ class MainWindow(QtWidgets.QMainWindow):
         if not aid:
             return
         if QtWidgets.QMessageBox.question(self, "确认", "确定删除选中账号？") == QtWidgets.QMessageBox.Yes:
+            gid = self.storage.vault.account_group_id(aid)
             self.storage.delete_account(aid)
-            # 从缓存中移除
-            self._account_cache.pop(aid, None)
+            self._update_group_counts(gid)
             
             # 延迟刷新表格，避免立即阻塞UI
             QtCore.QTimer.singleShot(10, self._refresh_table)
             
-            # 异步保存，避免阻塞UI
-            QtCore.QTimer.singleShot(50, self._save_async)
+            # 合并保存，写盘在后台线程进行
+            self._save_scheduler.mark_dirty()
 
     def _delete_account_by_id(self, account_id: str):
         """根据账号ID删除账号"""
@@ -731,37 +412,17 @@ class MainWindow(QtWidgets.QMainWindow):
         if reply == QtWidgets.QMessageBox.Yes:
             try:
                 self.storage.delete_account(account_id)
-                # 从缓存中移除
-                self._account_cache.pop(account_id, None)
+                self._update_group_counts(account.group_id)
                 
                 # 延迟刷新表格，避免立即阻塞UI
                 QtCore.QTimer.singleShot(10, self._refresh_table)
                 
-                # 异步保存，避免阻塞UI
-                QtCore.QTimer.singleShot(50, self._save_async)
+                # 合并保存，写盘在后台线程进行
+                self._save_scheduler.mark_dirty()
                 
             except VaultError as e:
                 QtWidgets.QMessageBox.critical(self, "错误", str(e))
 
-    # ----- Card interactions -----
-    def _on_card_clicked(self, aid: str):
-        # select corresponding QListWidgetItem
-        item, _ = self._card_items.get(aid, (None, None))
-        if item:
-            self.card_list.setCurrentItem(item)
-
-    def _on_card_selection_changed(self):
-        # update selected property on widgets
-        selected_ids = set()
-        for it in self.card_list.selectedItems():
-            selected_ids.add(it.data(QtCore.Qt.UserRole))
-        
-        # 只更新状态发生变化的卡片，减少不必要的UI更新
-        for aid, (it, w) in self._card_items.items():
-            new_selected = aid in selected_ids
-            if w.selected != new_selected:
-                w.set_selected(new_selected)
-
     # ----- Filter/Search -----
     def _current_group_id(self) -> Optional[str]:
         items = self.group_tree.selectedItems()
@@ -771,9 +432,6 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_search_text_changed(self):
         """搜索文本变化时的防抖处理"""
-        # 清空搜索缓存以确保结果准确性
-        self._search_cache.clear()
-        
         self._search_timer.stop()
         # 减少防抖延迟，提高响应速度
         self._search_timer.start(150)  # 150ms防抖延迟
@@ -784,125 +442,68 @@ class MainWindow(QtWidgets.QMainWindow):
         self._do_apply_filter()
     
     def _do_apply_filter(self):
-        """执行实际的过滤操作"""
+        """执行实际的过滤操作：有搜索文本时交给后台搜索，结果送回后再更新列表"""
         text = self.search_edit.text().strip()
         gid = self._current_group_id()
-        visible_count = 0
-        
-        # 批量处理UI更新以提高性能
-        self.card_list.setUpdatesEnabled(False)
-        try:
-            for aid, (item, widget) in self._card_items.items():
-                a = self._get_account(aid)
-                if not a:
-                    if not item.isHidden():
-                        item.setHidden(True)
-                    continue
-                
-                group_match = True if gid is None else (a.group_id == gid)
-                text_match = self._match_text(text, a)
-                should_show = group_match and text_match
-                
-                # 仅在状态改变时更新UI
-                if item.isHidden() == should_show:
-                    item.setHidden(not should_show)
-                
-                if should_show:
-                    visible_count += 1
-        finally:
-            self.card_list.setUpdatesEnabled(True)
-        
+        # 新的查询把排名最靠前的结果显示在最上面；数据修改后的重新筛选保持已加载的行和滚动位置
+        changed = self._last_filter != (text, gid)
+        self._last_filter = (text, gid)
+        if text:
+            # 恢复滚动位置需要完整的结果，此时不分块
+            if self._search.submit(text, gid, chunked=changed):
+                self._search_keep_position = not changed
+            return
+        # 没有搜索文本时只按分组筛选，不需要后台查找
+        self._search.cancel()
+        if self._search_group_counts is not None:
+            self._search_group_counts = None
+            self._update_group_counts()
+        vault = self.storage.vault
+        if gid is None:
+            rows = list(vault.account_ids())
+        else:
+            in_group = vault.account_ids_in_group(gid)
+            rows = [aid for aid in vault.account_ids() if aid in in_group]
+        self._set_card_rows(rows, {}, keep_position=not changed)
+        if changed:
+            self.card_list.scrollToTop()
+        self._show_record_count(len(rows))
+
+    def _on_search_rows(self, rows: List[str], highlights: Dict[str, Tuple[str, Tuple[Tuple[int, int], ...]]],
+                        first: bool):
+        """后台搜索送回一块结果：第一块替换列表，其余追加在末尾"""
+        if not first:
+            self.card_model.append_rows(rows)
+            return
+        self._set_card_rows(rows, highlights, keep_position=self._search_keep_position)
+        if not self._search_keep_position:
+            self.card_list.scrollToTop()
+
+    def _on_search_finished(self, total: int, note: str, matched: AbstractSet[str]):
+        self._show_record_count(total, note)
+        # 分组树同时显示各分组的命中数量
+        self._search_group_counts = self.storage.vault.count_by_group(matched)
+        self._update_group_counts()
+
+    def _show_record_count(self, count: int, note: str = ""):
         # 减少状态栏更新频率
         current_message = self.statusBar().currentMessage()
-        new_message = f"显示 {visible_count} 条记录"
+        new_message = f"显示 {count} 条记录" + (f"（{note}）" if note else "")
         if current_message != new_message:
             self.statusBar().showMessage(new_message)
     
-    def _match_text(self, search_text: str, account: Account) -> bool:
-        """智能匹配文本：自动检测正则表达式，否则使用模糊匹配"""
-        if not search_text:
-            return True
-        
-        # 检查搜索缓存
-        cache_key = f"{search_text}:{account.id}"
-        if cache_key in self._search_cache:
-            return self._search_cache[cache_key]
-        
-        # 搜索字段
-        fields = [
-            account.name or "",
-            account.username or "",
-            account.url or ""
-        ]
-        
-        result = False
-        
-        # 检测是否为正则表达式（包含特殊字符）
-        regex_chars = r'[.*+?^${}()|[\]\\]'
-        is_regex = bool(re.search(regex_chars, search_text))
-        
-        if is_regex:
-            # 使用缓存的正则表达式
-            pattern = self._regex_cache.get(search_text)
-            if pattern is None:
-                try:
-                    pattern = re.compile(search_text, re.IGNORECASE)
-                    self._regex_cache[search_text] = pattern
-                    # 限制缓存大小，避免内存泄漏
-                    if len(self._regex_cache) > 50:
-                        # 清除最旧的缓存项
-                        oldest_key = next(iter(self._regex_cache))
-                        del self._regex_cache[oldest_key]
-                except re.error:
-                    # 正则表达式错误时回退到模糊匹配
-                    pattern = None
-            
-            if pattern:
-                result = any(pattern.search(field) for field in fields)
-        
-        if not result:
-            # 默认使用模糊匹配
-            search_lower = search_text.lower()
-            for field in fields:
-                field_lower = field.lower()
-                if self._fuzzy_match(search_lower, field_lower):
-                    result = True
-                    break
-        
-        # 缓存结果（限制缓存大小）
-        if len(self._search_cache) > 200:
-            # 清除一半的缓存
-            keys_to_remove = list(self._search_cache.keys())[:100]
-            for key in keys_to_remove:
-                del self._search_cache[key]
-        
-        self._search_cache[cache_key] = result
-        return result
-    
-    def _fuzzy_match(self, pattern: str, text: str) -> bool:
-        """优化的模糊匹配算法"""
-        if not pattern:
-            return True
-        if not text:
-            return False
-        
-        pattern_len = len(pattern)
-        text_len = len(text)
-        
-        # 如果模式长度大于文本长度，不可能匹配
-        if pattern_len > text_len:
-            return False
-            
-        # 简单的子序列匹配优化
-        pattern_idx = 0
-        for char in text:
-            if pattern_idx < pattern_len and char.lower() == pattern[pattern_idx].lower():
-                pattern_idx += 1
-                # 如果已经匹配完所有字符，直接返回True
-                if pattern_idx == pattern_len:
-                    return True
-        
-        return pattern_idx == pattern_len
+    def _set_card_rows(self, rows: List[str], highlights: Dict[str, Tuple[str, Tuple[Tuple[int, int], ...]]],
+                       keep_position: bool = False):
+        """更新卡片列表显示的账号；选中的账号仍在已加载的行中时保持选中"""
+        selected = self.card_list.current_account_id()
+        bar = self.card_list.verticalScrollBar()
+        position = bar.value()
+        self.card_model.set_rows(rows, highlights, keep_loaded=keep_position)
+        if selected is not None:
+            self.card_list.select_account(selected, load=False)
+        if keep_position:
+            self.card_list.executeDelayedItemsLayout()
+            bar.setValue(position)
 
     def _toggle_passwords(self, checked: bool):
         # 如果状态没有变化，直接返回
@@ -911,20 +512,12 @@ class MainWindow(QtWidgets.QMainWindow):
             
         self.show_passwords = checked
         self.toggle_pw_btn.setText("隐藏密码" if checked else "显示密码")
-        
-        # 批量更新UI以提高性能
-        self.card_list.setUpdatesEnabled(False)
-        try:
-            for aid, (item, w) in self._card_items.items():
-                if not item.isHidden():  # 只更新可见的卡片
-                    w.set_show_passwords(checked)
-        finally:
-            self.card_list.setUpdatesEnabled(True)
+        self.card_list.set_show_passwords(checked)
 
     # ----- Menu actions -----
     def _save(self):
         try:
-            self.storage.save()
+            self._save_scheduler.save_now()
             QtWidgets.QMessageBox.information(self, "提示", "已保存")
         except VaultError as e:
             QtWidgets.QMessageBox.critical(self, "错误", str(e))
@@ -934,9 +527,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if not path:
             return
         if path.endswith(".mima"):
-            data = self.storage.export_encrypted()
             with open(path, "wb") as f:
-                f.write(data)
+                self.storage.export_encrypted_to(f)
         else:
             text = self.storage.export_plain()
             with open(path, "w", encoding="utf-8") as f:
@@ -949,23 +541,20 @@ class MainWindow(QtWidgets.QMainWindow):
             return
         try:
             with open(path, "rb") as f:
-                blob = f.read()
-            # auto detect format: encrypted starts with 0x10 and length >= 17, json likely starts with '{' or '[' or whitespace
-            is_encrypted = len(blob) >= 17 and blob[0] == 16
-            if is_encrypted:
-                # Ask password (optional)
-                text, ok = QtWidgets.QInputDialog.getText(self, "导入加密文件", "输入密码（留空使用当前主密码）：")
-                pwd = text if ok and text else None
-                self.storage.import_encrypted(blob, password=pwd, merge=True)
-            else:
-                text = blob.decode("utf-8")
-                self.storage.import_plain(text, merge=True)
-            
-            # 使用批量更新模式
-            self._batch_updating = True
-            self._rebuild_caches()
+                # auto detect format: encrypted files start with the vault header (or the legacy ephemeral key length)
+                if is_encrypted_blob(f.read(ENCRYPTED_PROBE_SIZE)):
+                    # Ask password (optional)
+                    text, ok = QtWidgets.QInputDialog.getText(self, "导入加密文件", "输入密码（留空使用当前主密码）：")
+                    pwd = text if ok and text else None
+                    f.seek(0)
+                    # 加密文件逐块读取解密，不整体读入
+                    self.storage.import_encrypted(f, password=pwd, merge=True)
+                else:
+                    f.seek(0)
+                    text = f.read().decode("utf-8")
+                    self.storage.import_plain(text, merge=True)
+            self._save_scheduler.mark_dirty()
             self._refresh_groups()
-            self._batch_updating = False
             self._refresh_table()
             
             QtWidgets.QMessageBox.information(self, "提示", "导入成功")
@@ -1027,6 +616,7 @@ class MainWindow(QtWidgets.QMainWindow):
     
     def _open_settings(self):
         """打开设置对话框"""
+        from .settings_dialog import SettingsDialog
         dialog = SettingsDialog(self)
         dialog.settingsChanged.connect(self._on_settings_changed)
         try:
@@ -1040,20 +630,15 @@ class MainWindow(QtWidgets.QMainWindow):
         dialog = ConfigEditorDialog(self)
         try:
             if dialog.exec_() == QtWidgets.QDialog.Accepted:
-                # 配置已更改，刷新界面
+                # 配置已更改：分组树里有可配置的文字，重建后再刷新样式
+                self._refresh_groups()
                 self._on_settings_changed()
         finally:
             dialog.deleteLater()
     
     def _on_settings_changed(self):
         """设置更改后的处理"""
-        # 重新加载样式
-        from .style import load_app_style
-        QtWidgets.QApplication.instance().setStyleSheet(load_app_style())
-        
-        # 刷新界面
-        self._refresh_table()
-        self._refresh_groups()
+        self._apply_theme()
         
         # 显示提示
         QtWidgets.QMessageBox.information(self, "设置已保存", "界面设置已更新并应用。")
@@ -1065,63 +650,30 @@ class MainWindow(QtWidgets.QMainWindow):
             if dlg.exec_() == QtWidgets.QDialog.Accepted:
                 name = dlg.get_text()
                 if name:
-                    # 立即在UI中显示新分组，避免阻塞
-                    from .models import Group
-                    import uuid
-                    
-                    # 创建临时分组对象用于UI显示
-                    temp_group = Group(id=str(uuid.uuid4()), name=name)
+                    try:
+                        new_group = self.storage.add_group(name)
+                    except VaultError as e:
+                        QtWidgets.QMessageBox.critical(self, "错误", f"添加分组失败: {e}")
+                        return
                     
                     # 直接在分组树中添加新项
-                    item = QtWidgets.QTreeWidgetItem([temp_group.name])
-                    item.setData(0, QtCore.Qt.UserRole, temp_group.id)
+                    item = QtWidgets.QTreeWidgetItem()
+                    item.setData(0, QtCore.Qt.UserRole, new_group.id)
+                    self._set_group_item(item, new_group.id, new_group.name)
                     self.group_tree.addTopLevelItem(item)
+                    self._group_items[new_group.id] = item
                     
                     # 选中新创建的分组
                     self.group_tree.setCurrentItem(item)
                     
-                    # 异步添加到存储并保存，完全避免阻塞界面
-                    QtCore.QTimer.singleShot(50, lambda: self._add_group_async(name, temp_group.id))
+                    # 合并保存，写盘在后台线程进行
+                    self._save_scheduler.mark_dirty()
         finally:
             dlg.deleteLater()
-    
-    def _add_group_async(self, group_name: str, temp_id: str):
-        """异步添加分组到存储"""
-        # 如果已有添加分组线程在运行，则跳过
-        if hasattr(self, '_add_group_thread') and self._add_group_thread.isRunning():
-            return
-            
-        # 创建添加分组线程
-        self._add_group_thread = AddGroupThread(self.storage, group_name, temp_id)
-        self._add_group_thread.group_added.connect(self._on_group_added)
-        self._add_group_thread.group_add_failed.connect(self._on_group_add_failed)
-        self._add_group_thread.start()
-    
-    def _on_group_added(self, real_group_id: str, temp_id: str):
-        """分组添加完成回调"""
-        # 更新UI中的分组ID为真实ID
-        for i in range(self.group_tree.topLevelItemCount()):
-            item = self.group_tree.topLevelItem(i)
-            if item.data(0, QtCore.Qt.UserRole) == temp_id:
-                item.setData(0, QtCore.Qt.UserRole, real_group_id)
-                break
-        
-        self.statusBar().showMessage("分组已保存", 2000)
-    
-    def _on_group_add_failed(self, error_msg: str, temp_id: str):
-        """分组添加失败回调"""
-        # 从UI中移除临时分组
-        for i in range(self.group_tree.topLevelItemCount()):
-            item = self.group_tree.topLevelItem(i)
-            if item.data(0, QtCore.Qt.UserRole) == temp_id:
-                self.group_tree.takeTopLevelItem(i)
-                break
-        
-        QtWidgets.QMessageBox.critical(self, "错误", f"添加分组失败: {error_msg}")
-        self.statusBar().showMessage("添加分组失败", 3000)
 
     def _rename_group(self, gid: str):
-        old = next((g.name for g in self.storage.vault.groups if g.id == gid), "")
+        group = self.storage.get_group(gid)
+        old = group.name if group else ""
         dlg = InputDialog("重命名分组", "新的分组名称：", old)
         try:
             if dlg.exec_() == QtWidgets.QDialog.Accepted:
@@ -1132,168 +684,24 @@ class MainWindow(QtWidgets.QMainWindow):
                         self.storage.rename_group(gid, name)
                         
                         # 直接更新分组树中的对应项
-                        for i in range(self.group_tree.topLevelItemCount()):
-                            item = self.group_tree.topLevelItem(i)
-                            if item.data(0, QtCore.Qt.UserRole) == gid:
-                                item.setText(0, name)
-                                break
+                        item = self._group_items.get(gid)
+                        if item is not None:
+                            self._set_group_item(item, gid, name)
                         
                         # 延迟刷新表格以更新分组标签，避免立即阻塞
                         QtCore.QTimer.singleShot(10, self._refresh_table)
                         
-                        # 异步保存，避免阻塞UI
-                        QtCore.QTimer.singleShot(50, self._save_async)
+                        # 合并保存，写盘在后台线程进行
+                        self._save_scheduler.mark_dirty()
                         
                     except VaultError as e:
                         QtWidgets.QMessageBox.critical(self, "错误", str(e))
         finally:
             dlg.deleteLater()
 
-    def _refresh_table_initial(self):
-        """初始表格刷新，使用分批加载方式"""
-        # 清空现有卡片
-        self.card_list.clear()
-        self._card_items.clear()
-        
-        # 准备待加载的账号列表
-        self._pending_accounts = list(self.storage.vault.accounts)
-        self._current_batch = 0
-        
-        # 开始分批加载
-        self._load_next_batch()
-
-    def _load_next_batch(self):
-        """加载下一批账号卡片"""
-        start_idx = self._current_batch * self._batch_size
-        end_idx = min(start_idx + self._batch_size, len(self._pending_accounts))
-        
-        # 获取当前批次的账号
-        batch_accounts = self._pending_accounts[start_idx:end_idx]
-        
-        if not batch_accounts:
-            # 所有账号加载完成，应用筛选条件
-            self._apply_filter()
-            return
-        
-        # 分组名映射
-        group_name_map = {g.id: g.name for g in self.storage.vault.groups}
-        
-        # 批量更新UI以提高性能
-        self.card_list.setUpdatesEnabled(False)
-        try:
-            default_group_name = get_text('default_values', 'default_group') or "未分组"
-            for a in batch_accounts:
-                gname = group_name_map.get(a.group_id, default_group_name)
-                self._create_account_card(a, gname)
-        finally:
-            self.card_list.setUpdatesEnabled(True)
-        
-        self._current_batch += 1
-        
-        # 如果还有更多账号需要加载，安排下一批加载
-        if end_idx < len(self._pending_accounts):
-            # 使用单次定时器来避免阻塞UI线程
-            QtCore.QTimer.singleShot(1, self._load_next_batch)
-        else:
-            # 所有账号加载完成，应用筛选条件
-            self._apply_filter()
-
     def _refresh_table(self):
-        """优化的表格刷新方法，支持增量更新"""
-        # 获取当前账号ID集合
-        current_account_ids = {a.id for a in self.storage.vault.accounts}
-        existing_account_ids = set(self._card_items.keys())
-        
-        # 分组名映射
-        group_name_map = {g.id: g.name for g in self.storage.vault.groups}
-        
-        # 批量处理UI更新以提高性能
-        self.card_list.setUpdatesEnabled(False)
-        try:
-            # 移除已删除的账号卡片
-            for aid in existing_account_ids - current_account_ids:
-                item, card = self._card_items.pop(aid)
-                # 使用新的cleanup_signals方法
-                card.cleanup_signals()
-                row = self.card_list.row(item)
-                if row >= 0:
-                    self.card_list.takeItem(row)
-                # 显式删除卡片对象
-                card.deleteLater()
-            
-            # 添加新账号卡片或更新现有卡片
-            default_group_name = get_text('default_values', 'default_group') or "未分组"
-            for a in self.storage.vault.accounts:
-                gname = group_name_map.get(a.group_id, default_group_name)
-                
-                if a.id in self._card_items:
-                    # 更新现有卡片 - 只在数据真正变化时才重建
-                    item, card = self._card_items[a.id]
-                    if (card.account.name != a.name or 
-                        card.account.username != a.username or 
-                        card.account.password != a.password or 
-                        card.account.url != a.url or 
-                        card.account.notes != a.notes):
-                        
-                        # 更新卡片数据而不重建整个卡片
-                        card.account = a
-                        card.name_label.setText(a.name or "未命名")
-                        card.username_label.setText(f"用户名: {a.username or ''}")
-                        card.set_show_passwords(self.show_passwords)
-                        
-                        # 更新URL标签（如果存在）
-                        if hasattr(card, 'url_label') and card.url_label is not None:
-                            if a.url:
-                                card.url_label.setText(f"网址: {a.url}")
-                                card.url_label.show()
-                            else:
-                                card.url_label.hide()
-                        elif a.url and (not hasattr(card, 'url_label') or card.url_label is None):
-                            # 如果账号有URL但卡片没有URL标签，创建一个
-                            card.url_label = QtWidgets.QLabel(f"网址: {a.url}")
-                            card.url_label.setProperty("role", "muted")
-                            card.url_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-                            card.layout().addWidget(card.url_label)
-                        
-                        # 更新备注标签（如果存在）
-                        if hasattr(card, 'notes_label') and card.notes_label is not None:
-                            if a.notes:
-                                card.notes_label.setText(f"备注: {a.notes}")
-                                card.notes_label.show()
-                            else:
-                                card.notes_label.hide()
-                        elif a.notes and (not hasattr(card, 'notes_label') or card.notes_label is None):
-                            # 如果账号有备注但卡片没有备注标签，创建一个
-                            card.notes_label = QtWidgets.QLabel(f"备注: {a.notes}")
-                            card.notes_label.setProperty("role", "notes")
-                            card.notes_label.setTextInteractionFlags(QtCore.Qt.NoTextInteraction)
-                            card.layout().addWidget(card.notes_label)
-                else:
-                    # 添加新卡片（仅在非初始化加载时直接添加）
-                    if not self._pending_accounts:  # 不在分批加载过程中
-                        self._create_account_card(a, gname)
-        finally:
-            self.card_list.setUpdatesEnabled(True)
-        
-        # 延迟应用筛选条件以避免阻塞UI
-        QtCore.QTimer.singleShot(10, self._apply_filter)
-    
-    def _create_account_card(self, account: Account, group_name: str):
-        """创建新的账号卡片"""
-        # 传递所有分组信息给卡片
-        groups = self.storage.vault.groups
-        card = AccountCard(account, group_name, self.show_passwords, groups, self.card_list)
-        card.clicked.connect(functools.partial(self._on_card_clicked, account.id))
-        card.doubleClicked.connect(self._create_double_click_handler(account.id))
-        card.deleteRequested.connect(functools.partial(self._delete_account_by_id, account.id))
-        card.moveToGroupRequested.connect(self._move_account_to_group)
-
-        item = QtWidgets.QListWidgetItem()
-        item.setData(QtCore.Qt.UserRole, account.id)
-        item.setSizeHint(self.card_size)
-        self.card_list.addItem(item)
-        self.card_list.setItemWidget(item, card)
-        self._card_items[account.id] = (item, card)
+        """账号数据变化后刷新卡片列表：按当前筛选条件重新生成显示的行，只重绘可见的卡片"""
+        self._apply_filter()
 
     def _move_account_to_group(self, account_id: str, group_id: str):
         """移动账号到指定分组"""
@@ -1307,29 +715,23 @@ class MainWindow(QtWidgets.QMainWindow):
                 return
             
             # 获取目标分组信息
-            target_group = None
-            for group in self.storage.vault.groups:
-                if group.id == group_id:
-                    target_group = group
-                    break
-            
+            target_group = self.storage.get_group(group_id)
             if not target_group:
                 error_title = get_text('dialog_titles', 'error')
                 error_msg = get_text('error_messages', 'group_not_found')
                 QtWidgets.QMessageBox.warning(self, error_title, error_msg)
                 return
             
-            # 更新账号的分组ID
-            account.group_id = group_id
-            
-            # 更新存储
-            self.storage.update_account(account)
+            # 更新账号的分组（同步存储层的分组成员索引）
+            old_gid = self.storage.vault.account_group_id(account_id)
+            self.storage.move_account(account_id, group_id)
+            self._update_group_counts(old_gid, group_id)
             
             # 刷新界面
             self._refresh_table()
             
-            # 异步保存
-            QtCore.QTimer.singleShot(50, self._save_async)
+            # 合并保存
+            self._save_scheduler.mark_dirty()
             
         except Exception as e:
             error_title = get_text('dialog_titles', 'error')
@@ -1337,29 +739,20 @@ class MainWindow(QtWidgets.QMainWindow):
             error_msg = error_template.format(error=str(e))
             QtWidgets.QMessageBox.critical(self, error_title, error_msg)
 
-    def _create_double_click_handler(self, account_id: str):
-        """创建双击处理器，避免lambda闭包问题"""
-        def handler():
-            # 直接编辑指定账号，避免通过选中状态间接获取
-            a = self._get_account(account_id)
-            if not a:
-                return
-            dlg = AccountDialog(a, self)
-            if dlg.exec_() == QtWidgets.QDialog.Accepted:
-                na = dlg.get_account(a.group_id)
-                self.storage.update_account(na)
-                # 更新缓存
-                self._account_cache[na.id] = na
-                
-                # 延迟刷新表格，避免立即阻塞UI
-                QtCore.QTimer.singleShot(10, self._refresh_table)
-                
-                # 异步保存，避免阻塞UI
-                QtCore.QTimer.singleShot(50, self._save_async)
-        return handler
-
     def closeEvent(self, event: QtGui.QCloseEvent):
-        # 直接关闭程序，不做其他操作
+        # 关闭前同步落盘尚未保存的修改
+        try:
+            self._save_scheduler.shutdown()
+        except VaultError as e:
+            reply = QtWidgets.QMessageBox.question(
+                self, "保存失败", f"保存失败: {e}\n仍要退出吗？未保存的修改将会丢失。",
+                QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                QtWidgets.QMessageBox.No
+            )
+            if reply != QtWidgets.QMessageBox.Yes:
+                event.ignore()
+                return
+        self._search.shutdown()
         event.accept()
         super().closeEvent(event)
     
@@ -1378,30 +771,6 @@ class MainWindow(QtWidgets.QMainWindow):
                 except (TypeError, RuntimeError):
                     pass
             
-            # 快速清理所有账号卡片的信号
-            if hasattr(self, '_card_items'):
-                for aid, (item, card) in list(self._card_items.items()):
-                    try:
-                        card.cleanup_signals()
-                        card.deleteLater()
-                    except (RuntimeError, AttributeError):
-                        pass
-                self._card_items.clear()
-            
-            # 清理缓存
-            if hasattr(self, '_account_cache'):
-                self._account_cache.clear()
-            if hasattr(self, '_group_cache'):
-                self._group_cache.clear()
-            if hasattr(self, '_regex_cache'):
-                self._regex_cache.clear()
-            
-            # 清空缓存
-            self._card_items.clear()
-            self._account_cache.clear()
-            self._group_cache.clear()
-            self._regex_cache.clear()
-            
         except (TypeError, RuntimeError, AttributeError):
             # 对象可能已被销毁或信号已断开
             pass
\ No newline at end of file
@@ -1,6 +1,8 @@
+import sys
 import uuid
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import AbstractSet, Dict, Iterable, KeysView, Optional, Set, ValuesView
 import re
 from .config import get_password_strength_config
 
@@ -9,7 +11,12 @@ def gen_id():
     return uuid.uuid4().hex
 
 
-@dataclass
+def intern_id(value: Optional[str]) -> Optional[str]:
+    """驻留分组ID：同一分组的所有账号共用一个字符串对象，而不是各自保存一份副本"""
+    return value if value is None else sys.intern(value)
+
+
+@dataclass(slots=True)
 class Account:
     id: str
     name: str
@@ -19,18 +26,161 @@ class Account:
     notes: str = ""
     group_id: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Account":
+        """由 asdict 格式的字典创建（按位置传参，不经过 **kwargs 展开；未知字段忽略）"""
+        try:
+            return cls(d["id"], d["name"], d["username"], d["password"],
+                       d.get("url", ""), d.get("notes", ""), intern_id(d.get("group_id")))
+        except KeyError as e:
+            raise TypeError(f"账号缺少字段 {e}") from None
 
-@dataclass
+
+@dataclass(slots=True)
 class Group:
     id: str
     name: str
 
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Group":
+        """由 asdict 格式的字典创建"""
+        try:
+            return cls(intern_id(d["id"]), d["name"])
+        except KeyError as e:
+            raise TypeError(f"分组缺少字段 {e}") from None
+
 
-@dataclass
 class VaultData:
-    groups: List[Group] = field(default_factory=list)
-    accounts: List[Account] = field(default_factory=list)
-    version: int = 1
+    """保险库数据
+
+    内部以有序字典按ID索引（保持插入顺序），并维护分组名称索引和分组成员索引；
+    按ID查找、增删改以及移动账号都是O(1)。groups/accounts 返回只读视图，
+    修改必须通过下面的方法进行，索引才能保持一致。
+    """
+
+    def __init__(self, groups: Optional[Iterable[Group]] = None,
+                 accounts: Optional[Iterable[Account]] = None, version: int = 1):
+        self.version = version
+        self._groups: Dict[str, Group] = {}
+        self._group_by_name: Dict[str, Group] = {}
+        self._accounts: Dict[str, Account] = {}
+        # 账号ID -> 入库时的分组ID（账号对象可能在外部被修改，需要记录旧值）
+        self._account_group: Dict[str, Optional[str]] = {}
+        # 分组ID -> 账号ID集合
+        self._members: Dict[Optional[str], Set[str]] = {}
+        self.groups = groups or ()
+        self.accounts = accounts or ()
+
+    # ----- 视图 -----
+    @property
+    def groups(self) -> ValuesView[Group]:
+        return self._groups.values()
+
+    @groups.setter
+    def groups(self, groups: Iterable[Group]):
+        self._groups = {}
+        self._group_by_name = {}
+        for g in groups:
+            self.put_group(g)
+
+    @property
+    def accounts(self) -> ValuesView[Account]:
+        return self._accounts.values()
+
+    @accounts.setter
+    def accounts(self, accounts: Iterable[Account]):
+        self._accounts = {}
+        self._account_group = {}
+        self._members = {}
+        for a in accounts:
+            self.put_account(a)
+
+    # ----- 分组 -----
+    def get_group(self, gid: str) -> Optional[Group]:
+        return self._groups.get(gid)
+
+    def group_by_name(self, name: str) -> Optional[Group]:
+        return self._group_by_name.get(name)
+
+    def put_group(self, g: Group):
+        """新增或替换分组（替换时保持原有顺序）"""
+        old = self._groups.get(g.id)
+        if old is not None and self._group_by_name.get(old.name) is old:
+            del self._group_by_name[old.name]
+        g.id = intern_id(g.id)
+        self._groups[g.id] = g
+        self._group_by_name[g.name] = g
+
+    def rename_group(self, gid: str, name: str) -> Group:
+        g = self._groups[gid]
+        if self._group_by_name.get(g.name) is g:
+            del self._group_by_name[g.name]
+        g.name = name
+        self._group_by_name[name] = g
+        return g
+
+    def remove_group(self, gid: str) -> Optional[Group]:
+        g = self._groups.pop(gid, None)
+        if g is not None and self._group_by_name.get(g.name) is g:
+            del self._group_by_name[g.name]
+        return g
+
+    # ----- 账号 -----
+    def get_account(self, aid: str) -> Optional[Account]:
+        return self._accounts.get(aid)
+
+    def account_ids(self) -> KeysView[str]:
+        """全部账号ID（只读视图，按添加顺序）"""
+        return self._accounts.keys()
+
+    def account_ids_in_group(self, gid: Optional[str]) -> AbstractSet[str]:
+        """分组内账号ID集合（只读，调用方不要修改）"""
+        return self._members.get(gid, _EMPTY_SET)
+
+    def group_size(self, gid: Optional[str]) -> int:
+        """分组内账号数量（O(1)）"""
+        return len(self._members.get(gid, _EMPTY_SET))
+
+    def account_group_id(self, aid: str) -> Optional[str]:
+        """账号所在分组的ID（按成员索引，O(1)）"""
+        return self._account_group.get(aid)
+
+    def count_by_group(self, aids: Iterable[str]) -> Dict[Optional[str], int]:
+        """统计一组账号在各分组中的数量（用于搜索结果的分组计数）"""
+        return Counter(self._account_group.get(aid) for aid in aids)
+
+    def put_account(self, a: Account):
+        """新增或替换账号（替换时保持原有顺序），同步分组成员索引"""
+        if a.id in self._accounts:
+            self._detach(a.id)
+        a.group_id = intern_id(a.group_id)
+        self._accounts[a.id] = a
+        self._account_group[a.id] = a.group_id
+        self._members.setdefault(a.group_id, set()).add(a.id)
+
+    def move_account(self, aid: str, gid: Optional[str]) -> Account:
+        a = self._accounts[aid]
+        self._detach(aid)
+        gid = intern_id(gid)
+        a.group_id = gid
+        self._account_group[aid] = gid
+        self._members.setdefault(gid, set()).add(aid)
+        return a
+
+    def remove_account(self, aid: str) -> Optional[Account]:
+        a = self._accounts.pop(aid, None)
+        if a is not None:
+            self._detach(aid)
+            del self._account_group[aid]
+        return a
+
+    def _detach(self, aid: str):
+        gid = self._account_group.get(aid)
+        members = self._members.get(gid)
+        if members is not None:
+            members.discard(aid)
+            if not members:
+                del self._members[gid]
 
     def to_dict(self):
         return {
@@ -41,11 +191,14 @@ class VaultData:
 
     @staticmethod
     def from_dict(d: Dict):
-        vd = VaultData()
-        vd.version = d.get("version", 1)
-        vd.groups = [Group(**g) for g in d.get("groups", [])]
-        vd.accounts = [Account(**a) for a in d.get("accounts", [])]
-        return vd
+        return VaultData(
+            groups=[Group.from_dict(g) for g in d.get("groups", [])],
+            accounts=[Account.from_dict(a) for a in d.get("accounts", [])],
+            version=d.get("version", 1),
+        )
+
+
+_EMPTY_SET = frozenset()
 
 
 # Password strength scoring 0-100
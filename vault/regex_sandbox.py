@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+正则沙箱
+在子进程中执行搜索框里的正则表达式。re 模块匹配期间不释放 GIL，也无法从外部中断，
+回溯爆炸的表达式（如 (a+)+$）放在线程里同样会卡住界面；放到子进程中，超过时间预算或被取消时
+直接结束子进程即可。
+
+子进程常驻：各字段原文只在索引副本变化后发送一次，之后每次查询只发送正则和候选文档号。
+子进程被结束后，下一次查询时重新启动。本模块不依赖 Qt，子进程只需导入搜索模块。
+"""
+import multiprocessing
+import re
+import time
+from typing import Callable, List, Optional, Sequence
+
+from .search import RegexHits, RegexTimeout, match_regex
+
+# 等待结果时检查取消请求的间隔（秒）
+_POLL_INTERVAL = 0.02
+
+
+def _serve(conn):
+    """子进程主循环：接收字段原文或查询，返回正则命中结果"""
+    columns: Sequence[List[str]] = ()
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message[0] == "columns":
+            columns = message[1]
+            # 确认已收下字段原文，调用方收到后才开始计时
+            conn.send(None)
+            continue
+        _, query, docs = message
+        try:
+            pattern = re.compile(query, re.IGNORECASE)
+        except re.error:
+            conn.send({})
+            continue
+        conn.send(match_regex(columns, pattern, docs))
+
+
+class RegexSandbox:
+    """在子进程中限时执行正则（由同一个线程串行调用）
+
+    Args:
+        timeout: 每次查询的时间预算（秒），不含启动子进程和发送字段原文的时间
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._conn = None
+        self._columns = None  # 子进程中当前的字段原文（按对象身份判断是否需要重新发送）
+
+    def match(self, columns: Sequence[List[str]], query: str, docs: List[int],
+              checkpoint: Optional[Callable[[], None]] = None) -> RegexHits:
+        """执行正则，返回与 search.match_regex 相同的结果
+
+        Raises:
+            RegexTimeout: 超过时间预算（子进程随之结束）
+            SearchCancelled: checkpoint 请求取消（子进程随之结束）
+        """
+        if not docs:
+            return {}
+        self._ensure_started()
+        try:
+            if self._columns is not columns:
+                self._conn.send(("columns", columns))
+                # 等子进程启动并收下字段原文（期间仍可取消），不占用正则的时间预算
+                self._wait(checkpoint)
+                self._conn.recv()
+                self._columns = columns
+            self._conn.send(("match", query, docs))
+            self._wait(checkpoint, time.monotonic() + self.timeout, query)
+            return self._conn.recv()
+        except (EOFError, OSError):
+            # 子进程异常退出（如匹配时内存耗尽）与超时一样，这次查询放弃正则部分
+            self.close()
+            raise RegexTimeout(query)
+        except BaseException:
+            # 子进程可能仍在匹配，且管道中可能残留这次的结果，直接结束
+            self.close()
+            raise
+
+    def _wait(self, checkpoint: Optional[Callable[[], None]], deadline: Optional[float] = None, query: str = ""):
+        """等待子进程回复，期间定期调用 checkpoint；给出 deadline 时超时抛出 RegexTimeout"""
+        while not self._conn.poll(_POLL_INTERVAL):
+            if checkpoint is not None:
+                checkpoint()
+            if deadline is not None and time.monotonic() >= deadline:
+                raise RegexTimeout(query)
+
+    def close(self):
+        """结束子进程"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join()
+            self._process = None
+        self._columns = None
+
+    def _ensure_started(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self.close()
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_serve, args=(child_conn,), daemon=True,
+                                        name="vault-regex-sandbox")
+        process.start()
+        child_conn.close()
+        self._process, self._conn = process, parent_conn
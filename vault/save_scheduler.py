@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+保存调度
+界面上的所有修改只标记"有未保存的变更"，由调度器合并后在后台线程写盘：
+停顿 save_debounce 毫秒后写入一次，持续修改时最迟 auto_save_interval 秒也会写入；
+同一时间最多只有一次写入在进行。
+"""
+import time
+from typing import Optional
+
+from PyQt5 import QtCore
+
+from .storage import VaultStorage, VaultError
+from .config import get_ui_config
+
+
+class _SaveWorker(QtCore.QObject):
+    """常驻后台线程的保存执行者"""
+    finished = QtCore.pyqtSignal(bool, str, float)  # 是否成功, 错误信息, 耗时(毫秒)
+
+    def __init__(self, storage: VaultStorage):
+        super().__init__()
+        self.storage = storage
+
+    @QtCore.pyqtSlot()
+    def save(self):
+        start = time.perf_counter()
+        try:
+            self.storage.save()
+            self.finished.emit(True, "", (time.perf_counter() - start) * 1000)
+        except VaultError as e:
+            self.finished.emit(False, str(e), (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            self.finished.emit(False, f"未知错误: {str(e)}", (time.perf_counter() - start) * 1000)
+
+
+class SaveScheduler(QtCore.QObject):
+    """合并连续修改的保存调度器（在GUI线程中使用）"""
+    save_completed = QtCore.pyqtSignal()
+    save_failed = QtCore.pyqtSignal(str)
+    status_changed = QtCore.pyqtSignal(str)
+    _request_save = QtCore.pyqtSignal()
+
+    def __init__(self, storage: VaultStorage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self._dirty = False
+        self._dirty_since = 0.0
+        self._in_flight = False
+        # 尚未落盘的修改次数 / 正在写入的修改次数
+        self._pending_edits = 0
+        self._in_flight_edits = 0
+
+        # 统计信息
+        self.save_count = 0
+        self.coalesced_edits = 0
+        self.last_save_time: Optional[float] = None
+        self.last_save_ms = 0.0
+        self.last_error = ""
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._flush)
+
+        self._thread = QtCore.QThread(self)
+        self._worker = _SaveWorker(storage)
+        self._worker.moveToThread(self._thread)
+        self._request_save.connect(self._worker.save)
+        self._worker.finished.connect(self._on_finished)
+        self._thread.start()
+
+    @property
+    def pending_edits(self) -> int:
+        return self._pending_edits + self._in_flight_edits
+
+    @property
+    def saving(self) -> bool:
+        return self._in_flight
+
+    def mark_dirty(self):
+        """记录一次修改，安排合并保存"""
+        self._pending_edits += 1
+        if not self._dirty:
+            self._dirty = True
+            self._dirty_since = time.monotonic()
+        self._schedule()
+        self._emit_status()
+
+    def save_now(self):
+        """在当前线程同步保存，返回时所有修改均已落盘
+
+        与后台写入共用存储层的提交锁，不会并发写文件。
+
+        Raises:
+            VaultError: 保存失败
+        """
+        self._timer.stop()
+        start = time.perf_counter()
+        edits = self.pending_edits
+        self.storage.save()
+        self._dirty = False
+        self._pending_edits = 0
+        self._in_flight_edits = 0
+        self._record_success(edits, (time.perf_counter() - start) * 1000)
+        self._emit_status()
+
+    def shutdown(self):
+        """关闭前落盘剩余修改并停止后台线程
+
+        Raises:
+            VaultError: 保存失败（后台线程仍会被停止）
+        """
+        try:
+            if self._dirty or self._in_flight or self.storage.has_pending_changes:
+                self.save_now()
+        finally:
+            self._thread.quit()
+            self._thread.wait()
+
+    def _schedule(self):
+        if self._in_flight:
+            # 写入完成后再安排下一次，保证同一时间只有一次写入
+            return
+        ui_config = get_ui_config()
+        debounce = ui_config.get('save_debounce', 500)
+        max_latency = ui_config.get('auto_save_interval', 30) * 1000
+        waited = (time.monotonic() - self._dirty_since) * 1000
+        self._timer.start(int(max(0, min(debounce, max_latency - waited))))
+
+    def _flush(self):
+        if not self._dirty or self._in_flight:
+            return
+        self._dirty = False
+        self._in_flight = True
+        self._in_flight_edits = self._pending_edits
+        self._pending_edits = 0
+        self._emit_status()
+        self._request_save.emit()
+
+    def _on_finished(self, ok: bool, error: str, elapsed_ms: float):
+        self._in_flight = False
+        edits, self._in_flight_edits = self._in_flight_edits, 0
+        if ok:
+            self._record_success(edits, elapsed_ms)
+            self.save_completed.emit()
+        else:
+            # 修改仍在内存中，等待下一次修改或手动保存时重试，避免反复弹出错误
+            self._pending_edits += edits
+            if edits and not self._dirty:
+                self._dirty = True
+                self._dirty_since = time.monotonic()
+            self.last_error = error
+            self.save_failed.emit(error)
+        if self._dirty and ok:
+            self._schedule()
+        self._emit_status()
+
+    def _record_success(self, edits: int, elapsed_ms: float):
+        self.save_count += 1
+        self.coalesced_edits += edits
+        self.last_save_time = time.time()
+        self.last_save_ms = elapsed_ms
+        self.last_error = ""
+
+    def status_text(self) -> str:
+        """状态栏显示的保存状态"""
+        if self._in_flight:
+            text = f"正在保存 {self._in_flight_edits} 项修改…"
+            if self._pending_edits:
+                text += f"（另有 {self._pending_edits} 项待保存）"
+            return text
+        if self.last_error:
+            return f"保存失败，{self._pending_edits} 项修改未保存" if self._pending_edits else "保存失败"
+        if self._pending_edits:
+            return f"{self._pending_edits} 项修改待保存"
+        if self.last_save_time is None:
+            return "已保存"
+        saved_at = time.strftime("%H:%M:%S", time.localtime(self.last_save_time))
+        return f"已保存 {saved_at}（{self.last_save_ms:.0f} ms）"
+
+    def _emit_status(self):
+        self.status_changed.emit(self.status_text())
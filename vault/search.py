@@ -0,0 +1,527 @@
+# -*- coding: utf-8 -*-
+"""
+账号搜索索引
+搜索框的匹配规则：包含正则特殊字符时按正则表达式匹配（忽略大小写），
+否则（或正则未命中时）按子序列模糊匹配；匹配范围为名称、用户名、网址中的任一字段。
+
+倒排索引为字符位图：每个字符一个整数位图，第 n 位表示第 n 个文档包含该字符。
+- 模糊匹配要求字段包含查询中的全部字符，位图按位与即得到候选集
+- 正则匹配从表达式中提取必须出现的字面量，同样用其中的字符缩小候选集
+候选文档由编译好的正则表达式在 C 层批量验证（itertools.compress + map），
+不经过 Python 层的逐账号循环。
+
+排序（rank）参考 fzf 的打分方式：每个匹配字符得分，连续匹配、单词边界（含开头）、
+驼峰/数字边界额外加分，间隔扣分；名称字段另有加分。只对命中的账号打分，
+用堆取前 K 个，不对整个保险库排序，并返回匹配位置供界面高亮。
+
+文档号只增不减：更新账号时分配新文档号，旧文档号从存活位图中清除；
+失效文档过多时整体重建。
+
+用户输入的正则可能发生回溯爆炸，且匹配期间不释放 GIL。正则部分通过 regex_runner 执行，
+界面使用时由 regex_sandbox 放到子进程中并限定时间；查找本身在后台线程中对 snapshot() 得到的副本进行，
+checkpoint 回调用于在长时间的打分循环中响应取消。
+"""
+import heapq
+import re
+from itertools import compress
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from .models import Account
+
+try:
+    # Python 3.11 起 sre_parse 移入 re 包内部，直接导入旧模块名会产生弃用警告
+    from re import _parser as _sre_parse
+except ImportError:
+    import sre_parse as _sre_parse
+
+
+# 与搜索框原有规则一致：包含这些字符即视为正则表达式
+_REGEX_CHARS = re.compile(r'[.*+?^${}()|[\]\\]')
+# 字段分隔符：验证模糊匹配时不允许跨字段
+_SEP = "\x00"
+# bin() 输出的 '0'/'1' 转换为 compress 使用的选择字节
+_BIT_SELECTORS = bytes.maketrans(b"01", b"\x00\x01")
+_MAX_PATTERN_CACHE = 64
+# 打分循环中每隔多少个账号调用一次 checkpoint
+_CHECKPOINT_INTERVAL = 1024
+# 正则解析结果中的字面量节点
+_LITERAL = _sre_parse.LITERAL
+
+# 打分参数（与 fzf 一致）
+_SCORE_MATCH = 16
+_SCORE_GAP_START = -3
+_SCORE_GAP_EXTENSION = -1
+_BONUS_BOUNDARY = _SCORE_MATCH // 2
+_BONUS_NON_WORD = _SCORE_MATCH // 2
+_BONUS_CAMEL123 = _BONUS_BOUNDARY + _SCORE_GAP_EXTENSION
+_BONUS_CONSECUTIVE = -(_SCORE_GAP_START + _SCORE_GAP_EXTENSION)
+_BONUS_FIRST_CHAR_MULTIPLIER = 2
+# 各字段的额外得分（名称命中优先）
+_FIELD_BONUS = (_SCORE_MATCH, 0, 0)
+
+# 字符类别
+_CHAR_NON_WORD, _CHAR_LOWER, _CHAR_UPPER, _CHAR_LETTER, _CHAR_NUMBER = range(5)
+
+
+Span = Tuple[int, int]
+# 正则命中的文档号 -> 各字段第一个匹配的区间（该字段未命中为 None）
+RegexHits = Dict[int, Tuple[Optional[Span], ...]]
+# 在给定文档中执行正则：(各字段原文列, 正则文本, 候选文档号) -> 命中结果
+RegexRunner = Callable[[Sequence[List[str]], str, List[int]], RegexHits]
+
+
+class SearchCancelled(Exception):
+    """查找被调用方取消（由 checkpoint 抛出）"""
+
+
+class RegexTimeout(Exception):
+    """正则表达式在时间预算内没有执行完"""
+
+
+class SearchHit(NamedTuple):
+    """一条排序后的搜索结果"""
+    account_id: str
+    score: int
+    field: str  # 得分最高的字段名
+    spans: Tuple[Tuple[int, int], ...]  # 该字段中的匹配区间 [start, end)
+
+
+def is_regex_query(query: str) -> bool:
+    return bool(_REGEX_CHARS.search(query))
+
+
+def _required_literals(pattern: str) -> List[str]:
+    """提取正则表达式中必须出现的字面量片段（保守估计，无法确定时返回空列表）
+
+    遍历 sre_parse 的解析结果，只取顶层连续的 LITERAL 节点（转义写法如 \\x61 已解析为字符本身）；
+    分组、字符类、转义类、量词、分支等其他节点都会打断片段。带内联标志（如 (?x)）的表达式不提取。
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except (re.error, OverflowError, RecursionError):
+        return []
+    if parsed.state.flags & ~re.UNICODE:
+        return []
+    runs: List[str] = []
+    current: List[str] = []
+    for op, av in parsed:
+        if op is _LITERAL:
+            current.append(chr(av))
+        elif current:
+            runs.append("".join(current))
+            current = []
+    if current:
+        runs.append("".join(current))
+    return [r.lower() for r in runs]
+
+
+def _char_class(c: str) -> int:
+    if c.islower():
+        return _CHAR_LOWER
+    if c.isupper():
+        return _CHAR_UPPER
+    if c.isdigit():
+        return _CHAR_NUMBER
+    if c.isalpha():
+        return _CHAR_LETTER
+    return _CHAR_NON_WORD
+
+
+def _bonus_for(prev_class: int, cls: int) -> int:
+    if prev_class == _CHAR_NON_WORD and cls != _CHAR_NON_WORD:
+        return _BONUS_BOUNDARY
+    if (prev_class == _CHAR_LOWER and cls == _CHAR_UPPER) or \
+            (prev_class != _CHAR_NUMBER and cls == _CHAR_NUMBER):
+        return _BONUS_CAMEL123
+    if cls == _CHAR_NON_WORD:
+        return _BONUS_NON_WORD
+    return 0
+
+
+# 打分热路径使用查表代替函数调用：字符类别缓存与 [前一类别][当前类别] 加分表
+_CLASS_CACHE: Dict[str, int] = {}
+_BONUS_TABLE = tuple(tuple(_bonus_for(p, c) for c in range(5)) for p in range(5))
+
+
+def _to_spans(positions: Iterable[int]) -> Tuple[Tuple[int, int], ...]:
+    """把匹配位置合并为连续区间"""
+    spans: List[List[int]] = []
+    for pos in positions:
+        if spans and spans[-1][1] == pos:
+            spans[-1][1] = pos + 1
+        else:
+            spans.append([pos, pos + 1])
+    return tuple((start, end) for start, end in spans)
+
+
+def fuzzy_score(query: str, text: str, positions: Optional[List[int]] = None) -> Optional[int]:
+    """子序列匹配打分，不匹配时返回 None；传入 positions 时追加匹配位置
+
+    query 须为小写。先正向找到最早的匹配终点，再从终点反向收紧起点，
+    只在最短窗口内逐字符计算得分，耗时与字段长度成线性关系。
+    """
+    if not query:
+        return 0
+    lower = text.lower()
+    if len(lower) != len(text):
+        # 个别字符小写后长度变化，逐字符转换以保持位置对应
+        lower = "".join(c.lower()[:1] or c for c in text)
+    end = 0
+    for c in query:
+        end = lower.find(c, end) + 1
+        if not end:
+            return None
+    start = end
+    for c in reversed(query):
+        start = lower.rfind(c, 0, start)
+
+    classes = _CLASS_CACHE
+    score = 0
+    in_gap = False
+    consecutive = 0
+    first_bonus = 0
+    if start > 0:
+        c = text[start - 1]
+        prev_class = classes.get(c)
+        if prev_class is None:
+            prev_class = classes[c] = _char_class(c)
+    else:
+        prev_class = _CHAR_NON_WORD
+    qi = 0
+    for i in range(start, end):
+        c = text[i]
+        cls = classes.get(c)
+        if cls is None:
+            cls = classes[c] = _char_class(c)
+        if lower[i] == query[qi]:
+            if positions is not None:
+                positions.append(i)
+            bonus = _BONUS_TABLE[prev_class][cls]
+            if consecutive == 0:
+                first_bonus = bonus
+                if qi == 0:
+                    bonus *= _BONUS_FIRST_CHAR_MULTIPLIER
+            else:
+                # 连续匹配沿用片段首字符的加分
+                if bonus >= _BONUS_BOUNDARY and bonus > first_bonus:
+                    first_bonus = bonus
+                if bonus < first_bonus:
+                    bonus = first_bonus
+                if bonus < _BONUS_CONSECUTIVE:
+                    bonus = _BONUS_CONSECUTIVE
+            score += _SCORE_MATCH + bonus
+            in_gap = False
+            consecutive += 1
+            qi += 1
+        else:
+            score += _SCORE_GAP_EXTENSION if in_gap else _SCORE_GAP_START
+            in_gap = True
+            consecutive = 0
+            first_bonus = 0
+        prev_class = cls
+    return score
+
+
+def match_regex(columns: Sequence[List[str]], pattern: re.Pattern, docs: List[int]) -> RegexHits:
+    """在指定文档中逐字段执行正则（不跨字段），返回命中的文档及各字段第一个匹配的区间"""
+    search = pattern.search
+    matched = map(any, zip(*(map(search, map(column.__getitem__, docs)) for column in columns)))
+    hits: RegexHits = {}
+    # 只为命中的文档再取一次匹配区间
+    for doc in compress(docs, matched):
+        hits[doc] = tuple(m.span() if m else None for m in (search(column[doc]) for column in columns))
+    return hits
+
+
+def _regex_score(text: str, span: Span, positions: Optional[List[int]] = None) -> Optional[int]:
+    """正则匹配打分：按连续匹配处理第一个匹配，空匹配不计分"""
+    start, end = span
+    if end == start:
+        return None
+    prev_class = _char_class(text[start - 1]) if start > 0 else _CHAR_NON_WORD
+    bonus = max(_bonus_for(prev_class, _char_class(text[start])), _BONUS_CONSECUTIVE)
+    if positions is not None:
+        positions.extend(range(start, end))
+    length = end - start
+    return length * _SCORE_MATCH + bonus * (_BONUS_FIRST_CHAR_MULTIPLIER + length - 1)
+
+
+class SearchIndex:
+    """账号名称/用户名/网址的内存倒排索引（非线程安全，由调用方串行访问）"""
+    FIELDS = ("name", "username", "url")
+    # 执行用户正则的方式，None 表示在当前线程中直接执行
+    regex_runner: Optional[RegexRunner] = None
+
+    def __init__(self, accounts: Iterable[Account] = ()):
+        self._patterns: Dict[Tuple[str, bool], Optional[re.Pattern]] = {}
+        self._snapshot: Optional["SearchIndex"] = None
+        self.rebuild(accounts)
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def clear(self):
+        self.rebuild(())
+
+    def rebuild(self, accounts: Iterable[Account]):
+        """根据账号集合整体重建索引"""
+        fields_of = self._fields_of
+        self._load((a.id, fields_of(a)) for a in accounts)
+
+    def put(self, account: Account):
+        """新增或更新账号"""
+        fields = self._fields_of(account)
+        doc = self._doc_of.get(account.id)
+        if doc is not None:
+            if self._doc_fields(doc) == fields:
+                return
+            self._kill(doc)
+        self._add_doc(account.id, fields)
+        self._maybe_compact()
+
+    def remove(self, aid: str):
+        doc = self._doc_of.pop(aid, None)
+        if doc is not None:
+            self._kill(doc)
+            self._maybe_compact()
+
+    def snapshot(self) -> "SearchIndex":
+        """当前内容的副本，供后台线程查找；内容没有变化时返回同一个副本
+
+        之后对索引的修改不影响副本。副本同样不是线程安全的，同一时间只能由一个线程使用。
+        """
+        snap = self._snapshot
+        if snap is None:
+            snap = SearchIndex.__new__(SearchIndex)
+            snap._patterns = {}
+            snap._doc_of = dict(self._doc_of)
+            snap._doc_aid = list(self._doc_aid)
+            snap._columns = tuple(list(column) for column in self._columns)
+            snap._doc_lower = list(self._doc_lower)
+            snap._chars = dict(self._chars)
+            snap._live = self._live
+            snap._dead = self._dead
+            snap._snapshot = snap
+            snap._forget_last_query()
+            self._snapshot = snap
+        return snap
+
+    def search(self, query: str, regex: bool = True,
+               checkpoint: Optional[Callable[[], None]] = None) -> Optional[Set[str]]:
+        """返回匹配的账号ID集合；空查询返回 None（表示全部匹配）
+
+        Args:
+            query: 搜索文本
+            regex: 为 False 时只做模糊匹配（正则超时后使用）
+            checkpoint: 在各阶段之间调用，抛出 SearchCancelled 即中止查找
+
+        Raises:
+            RegexTimeout: regex_runner 没有在时间预算内执行完正则
+        """
+        if not query:
+            return None
+        result = self._fuzzy_search(query.lower())
+        if regex and is_regex_query(query):
+            if checkpoint is not None:
+                checkpoint()
+            result.update(map(self._doc_aid.__getitem__, self._regex_hits(query)))
+        return result
+
+    def rank(self, query: str, limit: int = 50,
+             matched: Optional[Set[str]] = None, regex: bool = True,
+             checkpoint: Optional[Callable[[], None]] = None) -> List[SearchHit]:
+        """按相关度返回得分最高的 limit 条结果
+
+        Args:
+            query: 搜索文本
+            limit: 最多返回的条数
+            matched: 已经得到的 search(query) 结果，避免重复查找
+            regex: 与 search 相同
+            checkpoint: 打分过程中定期调用，抛出 SearchCancelled 即中止
+        """
+        if not query or limit <= 0:
+            return []
+        if matched is None:
+            matched = self.search(query, regex, checkpoint)
+        lower = query.lower()
+        regex_hits = self._regex_hits(query) if regex and is_regex_query(query) else {}
+        doc_of = self._doc_of
+        columns = self._columns
+        scored = []
+        for i, aid in enumerate(matched):
+            if checkpoint is not None and not i % _CHECKPOINT_INTERVAL:
+                checkpoint()
+            doc = doc_of.get(aid)
+            if doc is None:
+                continue
+            spans = regex_hits.get(doc)
+            best = best_field = None
+            for f, column in enumerate(columns):
+                text = column[doc]
+                if not text:
+                    continue
+                score = self._field_score(lower, spans[f] if spans else None, text)
+                if score is None:
+                    continue
+                score += _FIELD_BONUS[f]
+                if best is None or score > best:
+                    best, best_field = score, f
+            if best is not None:
+                # 同分时按文档号（即添加顺序）靠前者优先
+                scored.append((best, -doc, aid, best_field))
+        top = heapq.nlargest(limit, scored)
+        hits = []
+        for score, neg_doc, aid, f in top:
+            # 只为最终结果计算匹配位置
+            positions: List[int] = []
+            spans = regex_hits.get(-neg_doc)
+            self._field_score(lower, spans[f] if spans else None, columns[f][-neg_doc], positions)
+            hits.append(SearchHit(aid, score, self.FIELDS[f], _to_spans(positions)))
+        return hits
+
+    @staticmethod
+    def _field_score(query: str, span: Optional[Span], text: str,
+                     positions: Optional[List[int]] = None) -> Optional[int]:
+        """字段得分：模糊匹配与正则匹配（span 为该字段的正则匹配区间）中较高者"""
+        if span is None:
+            return fuzzy_score(query, text, positions)
+        fuzzy = fuzzy_score(query, text)
+        regex = _regex_score(text, span)
+        if regex is not None and (fuzzy is None or regex > fuzzy):
+            return _regex_score(text, span, positions) if positions is not None else regex
+        if fuzzy is not None and positions is not None:
+            fuzzy_score(query, text, positions)
+        return fuzzy
+
+    # ----- 内部实现 -----
+    @classmethod
+    def _fields_of(cls, account: Account) -> Tuple[str, ...]:
+        return tuple(getattr(account, f) or "" for f in cls.FIELDS)
+
+    def _doc_fields(self, doc: int) -> Tuple[str, ...]:
+        return tuple(column[doc] for column in self._columns)
+
+    def _load(self, docs: Iterable[Tuple[str, Tuple[str, ...]]]):
+        self._doc_of: Dict[str, int] = {}
+        self._doc_aid: List[Optional[str]] = []
+        # 按字段分列保存原文（正则逐字段验证），以及小写并以分隔符连接的全文（模糊匹配）
+        self._columns: Tuple[List[str], ...] = tuple([] for _ in self.FIELDS)
+        self._doc_lower: List[str] = []
+        for aid, fields in docs:
+            self._doc_of[aid] = len(self._doc_aid)
+            self._doc_aid.append(aid)
+            for column, value in zip(self._columns, fields):
+                column.append(value)
+            self._doc_lower.append(_SEP.join(fields).lower())
+        # 批量构建字符位图：先写入 bytearray，再一次性转换为整数
+        count = len(self._doc_aid)
+        size = (count + 7) >> 3
+        bitmaps: Dict[str, bytearray] = {}
+        for doc, text in enumerate(self._doc_lower):
+            byte, bit = doc >> 3, 1 << (doc & 7)
+            for c in set(text):
+                bitmap = bitmaps.get(c)
+                if bitmap is None:
+                    bitmaps[c] = bitmap = bytearray(size)
+                bitmap[byte] |= bit
+        bitmaps.pop(_SEP, None)
+        self._chars: Dict[str, int] = {c: int.from_bytes(b, "little") for c, b in bitmaps.items()}
+        self._live = (1 << count) - 1
+        self._dead = 0
+        self._forget_last_query()
+        self._snapshot = None
+
+    def _add_doc(self, aid: str, fields: Tuple[str, ...]):
+        doc = len(self._doc_aid)
+        lower = _SEP.join(fields).lower()
+        self._doc_of[aid] = doc
+        self._doc_aid.append(aid)
+        for column, value in zip(self._columns, fields):
+            column.append(value)
+        self._doc_lower.append(lower)
+        bit = 1 << doc
+        chars = self._chars
+        for c in set(lower):
+            if c != _SEP:
+                chars[c] = chars.get(c, 0) | bit
+        self._live |= bit
+        self._forget_last_query()
+        self._snapshot = None
+
+    def _kill(self, doc: int):
+        self._live &= ~(1 << doc)
+        self._doc_aid[doc] = None
+        for column in self._columns:
+            column[doc] = ""
+        self._doc_lower[doc] = ""
+        self._dead += 1
+        self._forget_last_query()
+        self._snapshot = None
+
+    def _forget_last_query(self):
+        # 上一次正则查询及其结果（rank 紧接 search 调用时不再重复执行）
+        self._last_regex: Optional[Tuple[str, RegexHits]] = None
+
+    def _maybe_compact(self):
+        if self._dead > 1024 and self._dead > len(self._doc_of):
+            self._load([(aid, self._doc_fields(doc)) for aid, doc in self._doc_of.items()])
+
+    def _compile(self, query: str, regex: bool) -> Optional[re.Pattern]:
+        key = (query, regex)
+        if key in self._patterns:
+            return self._patterns[key]
+        try:
+            if regex:
+                pattern = re.compile(query, re.IGNORECASE)
+            else:
+                # 子序列匹配：下一个字符之前只能跳过非分隔符、且不是该字符本身的字符，
+                # 贪婪匹配在第一个出现位置停下，不会产生回溯爆炸
+                parts = [re.escape(query[0])]
+                for c in query[1:]:
+                    escaped = re.escape(c)
+                    parts.append("[^%s%s]*%s" % (_SEP, escaped, escaped))
+                pattern = re.compile("".join(parts))
+        except re.error:
+            pattern = None
+        if len(self._patterns) >= _MAX_PATTERN_CACHE:
+            self._patterns.pop(next(iter(self._patterns)))
+        self._patterns[key] = pattern
+        return pattern
+
+    def _candidates(self, chars: Iterable[str]) -> Optional[bytes]:
+        """包含全部给定字符的存活文档，返回 compress 使用的选择字节；没有候选时返回 None"""
+        mask = self._live
+        bitmaps = self._chars
+        for c in set(chars):
+            bitmap = bitmaps.get(c)
+            if bitmap is None:
+                return None
+            mask &= bitmap
+        if not mask:
+            return None
+        return bin(mask)[:1:-1].encode("ascii").translate(_BIT_SELECTORS)
+
+    def _fuzzy_search(self, query: str) -> Set[str]:
+        selectors = self._candidates(query)
+        if selectors is None:
+            return set()
+        if len(query) == 1:
+            return set(compress(self._doc_aid, selectors))
+        search = self._compile(query, regex=False).search
+        return set(compress(compress(self._doc_aid, selectors),
+                            map(search, compress(self._doc_lower, selectors))))
+
+    def _regex_hits(self, query: str) -> RegexHits:
+        last = self._last_regex
+        if last is not None and last[0] == query:
+            return last[1]
+        pattern = self._compile(query, regex=True)
+        selectors = self._candidates("".join(_required_literals(query))) if pattern is not None else None
+        if selectors is None:
+            hits: RegexHits = {}
+        else:
+            docs = list(compress(range(len(self._doc_aid)), selectors))
+            runner = self.regex_runner
+            hits = match_regex(self._columns, pattern, docs) if runner is None else runner(self._columns, query, docs)
+        self._last_regex = (query, hits)
+        return hits
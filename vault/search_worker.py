@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+后台搜索
+搜索框的查找和打分在常驻后台线程中对搜索索引的副本进行，GUI线程只负责派发查询和显示结果：
+- 每次派发都有递增的编号，新的查询使尚未完成的旧查询作废：排队中的直接跳过，
+  进行中的在下一个检查点中止
+- 正则部分在子进程中按 search_regex_timeout 限时执行，超时只显示模糊匹配的结果
+- 结果分块送回：第一块包含按相关度排在最前的结果和高亮，其余账号按添加顺序分块追加
+- 完成时一并送回不限分组的命中集合，供分组树显示各分组的命中数量
+"""
+from functools import partial
+from typing import AbstractSet, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from PyQt5 import QtCore
+
+from .config import get_ui_config
+from .regex_sandbox import RegexSandbox
+from .search import RegexTimeout, SearchCancelled, SearchIndex
+from .storage import VaultStorage
+
+
+class _SearchWorker(QtCore.QObject):
+    """常驻后台线程的搜索执行者"""
+    rowsReady = QtCore.pyqtSignal(int, list, dict, bool)  # 编号, 账号ID, 高亮, 是否为第一块
+    finished = QtCore.pyqtSignal(int, int, str, object)  # 编号, 结果总数, 提示, 不限分组的命中集合
+
+    def __init__(self, regex_timeout: float):
+        super().__init__()
+        # 最新派发的查询编号，由GUI线程直接写入
+        self.latest = 0
+        self._sandbox = RegexSandbox(regex_timeout)
+
+    def _check(self, generation: int):
+        if generation != self.latest:
+            raise SearchCancelled()
+
+    @QtCore.pyqtSlot(int, str, object, object, object, int, int)
+    def search(self, generation: int, query: str, index: SearchIndex, order: Sequence[str],
+               in_group: Optional[FrozenSet[str]], limit: int, chunk_size: int):
+        checkpoint = partial(self._check, generation)
+        try:
+            checkpoint()
+            index.regex_runner = partial(self._sandbox.match, checkpoint=checkpoint)
+            note = ""
+            try:
+                matched = index.search(query, checkpoint=checkpoint)
+                regex = True
+            except RegexTimeout:
+                note = "正则表达式执行超时，仅显示模糊匹配结果"
+                matched = index.search(query, regex=False, checkpoint=checkpoint)
+                regex = False
+            visible = matched if in_group is None else matched & in_group
+            hits = index.rank(query, limit, visible, regex, checkpoint)
+            highlights = {h.account_id: (h.field, h.spans) for h in hits}
+            rows = [h.account_id for h in hits]
+            total = len(visible)
+            first = True
+            # 其余账号按添加顺序分块送出，第一块连同排名靠前的结果一起
+            for start in range(0, len(order), chunk_size):
+                checkpoint()
+                rows.extend(aid for aid in order[start:start + chunk_size]
+                            if aid in visible and aid not in highlights)
+                if len(rows) >= chunk_size:
+                    self.rowsReady.emit(generation, rows, highlights if first else {}, first)
+                    rows, first = [], False
+            if rows or first:
+                self.rowsReady.emit(generation, rows, highlights if first else {}, first)
+            self.finished.emit(generation, total, note, matched)
+        except SearchCancelled:
+            pass
+
+    @QtCore.pyqtSlot()
+    def close(self):
+        self._sandbox.close()
+
+
+class SearchController(QtCore.QObject):
+    """在GUI线程中使用的后台搜索入口
+
+    rowsReady/finished 只转发最新一次查询的结果，调用方不需要再判断结果是否过时。
+    chunked 为 False 的查询只送出一块（包含全部结果）。
+    """
+    rowsReady = QtCore.pyqtSignal(list, dict, bool)  # 账号ID, 高亮, 是否为第一块
+    finished = QtCore.pyqtSignal(int, str, object)  # 结果总数, 提示, 不限分组的命中账号ID集合
+    _request = QtCore.pyqtSignal(int, str, object, object, object, int, int)
+
+    def __init__(self, storage: VaultStorage, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self._generation = 0
+        self._busy = False
+        # 进行中的查询 (搜索文本, 索引副本, 分组成员)
+        self._pending: Optional[Tuple[str, SearchIndex, Optional[FrozenSet[str]]]] = None
+        # 账号添加顺序的副本（随搜索索引副本一起更新）
+        self._order: Tuple[Optional[SearchIndex], Tuple[str, ...]] = (None, ())
+
+        ui_config = get_ui_config()
+        self._thread = QtCore.QThread(self)
+        self._worker = _SearchWorker(ui_config.get('search_regex_timeout', 500) / 1000)
+        self._worker.moveToThread(self._thread)
+        self._request.connect(self._worker.search)
+        self._worker.rowsReady.connect(self._on_rows)
+        self._worker.finished.connect(self._on_finished)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        """是否有尚未完成的查询"""
+        return self._busy
+
+    def submit(self, query: str, group_id: Optional[str], chunked: bool = True) -> bool:
+        """派发查询，之前尚未完成的查询作废
+
+        同样的查询正在进行且数据没有变化时不重新开始，返回 False。
+        """
+        vault = self.storage.vault
+        index = self.storage.search_index.snapshot()
+        in_group = None if group_id is None else frozenset(vault.account_ids_in_group(group_id))
+        if self._busy and self._pending == (query, index, in_group):
+            return False
+        if self._order[0] is not index:
+            self._order = (index, tuple(vault.account_ids()))
+        ui_config = get_ui_config()
+        limit = ui_config.get('search_rank_limit', 50)
+        chunk_size = ui_config.get('search_chunk_size', 2000) if chunked else len(self._order[1]) + 1
+        chunk_size = max(chunk_size, ui_config['batch_load_size'], 1)
+        self._generation += 1
+        self._worker.latest = self._generation
+        self._busy = True
+        self._pending = (query, index, in_group)
+        self._request.emit(self._generation, query, index, self._order[1], in_group, limit, chunk_size)
+        return True
+
+    def cancel(self):
+        """作废尚未完成的查询"""
+        self._generation += 1
+        self._worker.latest = self._generation
+        self._busy = False
+        self._pending = None
+
+    def shutdown(self):
+        """停止后台线程并结束正则子进程"""
+        self.cancel()
+        self._thread.quit()
+        self._thread.wait()
+        self._worker.close()
+
+    def _on_rows(self, generation: int, rows: List[str], highlights: Dict, first: bool):
+        if generation == self._generation:
+            self.rowsReady.emit(rows, highlights, first)
+
+    def _on_finished(self, generation: int, total: int, note: str, matched: AbstractSet[str]):
+        if generation == self._generation:
+            self._busy = False
+            self._pending = None
+            self.finished.emit(total, note, matched)
@@ -1,14 +1,12 @@
-from .config import get_color_theme, get_font_config, get_spacing_config, get_border_radius_config
+from .theme import compile_style
 
 
 def load_settings_dialog_style():
-    """加载设置对话框专用样式"""
-    # 获取配置
-    colors = get_color_theme()
-    fonts = get_font_config()
-    spacing = get_spacing_config()
-    radius = get_border_radius_config()
-    
+    """加载设置对话框专用样式（按主题配置缓存）"""
+    return compile_style(_build_settings_dialog_style)
+
+
+def _build_settings_dialog_style(colors, fonts, spacing, radius):
     return f"""
     /* 设置对话框基础样式 */
     QDialog#SettingsDialog {{
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时分析
+以 python app.py --profile-startup 启动时记录各阶段的耗时：导入、创建应用、显示主密码对话框、
+导入主窗口模块、构建主窗口、等待解锁、主窗口首次绘制。等待用户输入主密码的时间不计入。
+首次绘制后输出报告（包括显示主密码对话框时已导入的本项目模块和 cryptography 模块）并关闭主窗口。
+"""
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from PyQt5 import QtCore, QtWidgets
+
+PROFILE_FLAG = "--profile-startup"
+
+# 各阶段的中文名称
+STAGE_NAMES = {
+    "import": "导入模块",
+    "app": "创建应用和样式",
+    "prompt": "显示主密码对话框",
+    "import_main": "导入主窗口模块",
+    "construct": "构建主窗口",
+    "unlock": "等待解锁完成",
+    "first_paint": "主窗口首次绘制",
+}
+
+
+def prompt_modules() -> List[str]:
+    """当前已导入的本项目模块和 cryptography 模块"""
+    return sorted(m for m in sys.modules
+                  if m == "vault" or m.startswith(("vault.", "cryptography")))
+
+
+class _FirstPaintFilter(QtCore.QObject):
+    """窗口（或其子控件）第一次收到绘制事件后，在本轮事件处理结束时回调"""
+
+    def __init__(self, window: QtWidgets.QWidget, callback):
+        super().__init__(window)
+        self._window = window
+        self._callback = callback
+
+    def eventFilter(self, obj, event):
+        if (event.type() == QtCore.QEvent.Paint and isinstance(obj, QtWidgets.QWidget)
+                and obj.window() is self._window):
+            QtWidgets.QApplication.instance().removeEventFilter(self)
+            QtCore.QTimer.singleShot(0, self._callback)
+        return False
+
+
+class StartupProfiler:
+    """记录启动各阶段的结束时间；未启用时所有方法都不做任何事
+
+    Args:
+        start: 计时起点（app.py 在导入其他模块之前取的 time.perf_counter()）
+        enabled: 是否启用
+    """
+
+    def __init__(self, start: float, enabled: bool):
+        self.enabled = enabled
+        self._last = start
+        self._paused_at: Optional[float] = None
+        self.stages: List[Tuple[str, float]] = []
+        self.prompt_modules: List[str] = []
+
+    def mark(self, stage: str):
+        """记录一个阶段结束"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def pause(self):
+        """开始等待用户输入，之后到 resume() 的时间不计入"""
+        if self.enabled:
+            self._paused_at = time.perf_counter()
+            self.prompt_modules = prompt_modules()
+
+    def resume(self):
+        if self.enabled and self._paused_at is not None:
+            self._last += time.perf_counter() - self._paused_at
+            self._paused_at = None
+
+    def watch_first_paint(self, window: QtWidgets.QWidget):
+        """主窗口首次绘制后记录最后一个阶段，输出报告并关闭主窗口（应用随之退出）"""
+        if not self.enabled:
+            return
+
+        def done():
+            self.mark("first_paint")
+            print(self.report())
+            # 经由 closeEvent 关闭，后台线程和未保存的修改照常处理
+            window.close()
+
+        QtWidgets.QApplication.instance().installEventFilter(_FirstPaintFilter(window, done))
+
+    def report(self) -> str:
+        lines = ["启动耗时（不含输入主密码的时间）:"]
+        for stage, seconds in self.stages:
+            lines.append(f"  {STAGE_NAMES.get(stage, stage):<12}{seconds * 1000:>10.1f} ms")
+        total = sum(seconds for _, seconds in self.stages)
+        lines.append(f"  {'合计':<12}{total * 1000:>10.1f} ms")
+        lines.append(f"显示主密码对话框时已导入的模块（{len(self.prompt_modules)} 个）:")
+        lines.extend(f"  {m}" for m in self.prompt_modules)
+        return "\n".join(lines)
@@ -1,36 +1,596 @@
+import io
 import json
+import lzma
+import mmap
 import os
-from typing import Optional, Dict
-from dataclasses import asdict
+import struct
+import sys
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from array import array
+from itertools import accumulate, chain
+from operator import attrgetter
+from typing import Optional, Dict, Callable, Tuple, List, BinaryIO, Union
+from dataclasses import asdict, fields
 
-from .models import VaultData, Account, Group, gen_id
-from .crypto import encrypt, decrypt, _crypto_manager
-from .config import get_security_config, get_text
+from .models import VaultData, Account, Group, gen_id, intern_id
+from .search import SearchIndex
+from .crypto import (
+    decrypt, encrypt_with_key, decrypt_with_key, derive_session_key, new_session_key,
+    SessionKey, RecordCipher, StreamCipher, NONCE_SIZE, STREAM_CHUNK_SIZE, STREAM_PREFIX_SIZE, TAG_SIZE,
+    _crypto_manager
+)
+from .config import get_security_config, get_storage_config, get_text
+
+
+# 保险库文件格式
+# v1（旧版）：ECIES密文；密钥由固定盐值派生，主密码哈希（另一次PBKDF2）保存在明文meta中
+# v2：文件头 | ECIES密文（整个保险库一个密文块，旧版导出文件）
+# v3：文件头 | 包装密钥长度(2) | ECIES包装的数据密钥 | 记录帧...（vault.dat 使用该格式）
+#     记录帧：帧长度(4) | 类型(1) | 操作(1) | ID长度(1) | ID | nonce | AES-GCM密文
+#     每条记录独立加密，修改单个账号只需追加一帧；失效帧过多时压缩重写
+# v4：同v3，每批帧以提交帧结尾（内容为本批记录帧数）；最后一个提交帧之后的内容
+#     视为崩溃时未完成的写入，加载时忽略并在下次保存时整体重写
+# v5：文件头 | 包装密钥长度(2) | ECIES包装的数据密钥 | 分块大小(4) | nonce前缀(7) | 密文块...
+#     分块流式AEAD（见 crypto.StreamCipher），加解密只缓存两个块，以上整个头部作为每个密文块的AAD
+# v6：同v5，nonce前缀之后多一个清单：明文长度(8)。块数和每一块的位置由明文长度和分块大小唯一确定，
+#     各块可以在线程池中并行加解密（导出文件使用该格式）
+# 文件头：MAGIC | 版本(1) | 盐长度(1) | 盐 | 迭代次数(4) | 标签长度(1) | 验证标签
+#     加密密钥和验证标签来自同一次加盐PBKDF2，解锁只需一次慢速派生
+# 记录帧和v2密文块的明文可以是 JSON 或二进制编码（见下方“载荷编码”），按内容识别；
+# 较大的载荷在加密前压缩（见“载荷压缩”）
+VAULT_MAGIC = b"MIMA"
+BLOB_FORMAT_VERSION = 2
+LOG_FORMAT_VERSION = 4
+STREAM_FORMAT_VERSION = 5
+CHUNKED_FORMAT_VERSION = 6
+_UNCOMMITTED_LOG_VERSION = 3
+FORMAT_VERSION = CHUNKED_FORMAT_VERSION
+
+# 记录类型与操作
+RECORD_META = 0
+RECORD_GROUP = 1
+RECORD_ACCOUNT = 2
+RECORD_COMMIT = 3
+OP_PUT = 1
+OP_DELETE = 2
+_META_ID = "meta"
+_FRAME_LEN = struct.Struct(">I")
+_WRAPPED_KEY_LEN = struct.Struct(">H")
+_COMMIT_COUNT = struct.Struct(">I")
+_STREAM_CHUNK_SIZE = struct.Struct(">I")
+_CHUNK_MANIFEST = struct.Struct(">Q")
+# 文件头的最大长度（盐和验证标签的长度各占一个字节）
+_MAX_HEADER_SIZE = len(VAULT_MAGIC) + 1 + 1 + 255 + 4 + 1 + 255
+# 读取v5文件时允许的最大分块，避免损坏的文件头导致分配过大的缓冲区
+_MAX_STREAM_CHUNK = 16 * 1024 * 1024
+# 旧版文件以临时公钥长度开头（未压缩P-256点为65字节）
+_LEGACY_PUBKEY_LEN = 65
+# is_encrypted_blob() 需要的文件开头字节数
+ENCRYPTED_PROBE_SIZE = _LEGACY_PUBKEY_LEN + 1
 
 
 class VaultError(Exception):
     pass
 
 
+def _pack_header(session_key: SessionKey, version: int) -> bytes:
+    return (VAULT_MAGIC + bytes([version]) +
+            bytes([len(session_key.salt)]) + session_key.salt +
+            struct.pack(">I", session_key.iterations) +
+            bytes([len(session_key.verify_tag)]) + session_key.verify_tag)
+
+
+def _unpack_header(blob: bytes) -> Optional[Tuple[int, bytes, int, bytes, int]]:
+    """解析文件头；blob 可以只是文件开头的一部分（至少 _MAX_HEADER_SIZE 字节或整个文件）
+
+    Returns:
+        (版本, 盐值, 迭代次数, 验证标签, 密文偏移)；旧版无文件头的数据返回 None
+    """
+    if blob[:len(VAULT_MAGIC)] != VAULT_MAGIC:
+        return None
+    try:
+        offset = len(VAULT_MAGIC)
+        version = blob[offset]
+        offset += 1
+        salt_len = blob[offset]
+        offset += 1
+        salt = blob[offset:offset + salt_len]
+        offset += salt_len
+        (iterations,) = struct.unpack_from(">I", blob, offset)
+        offset += 4
+        tag_len = blob[offset]
+        offset += 1
+        tag = blob[offset:offset + tag_len]
+        offset += tag_len
+    except (IndexError, struct.error):
+        raise VaultError("数据格式错误")
+    if len(salt) != salt_len or len(tag) != tag_len or offset > len(blob):
+        raise VaultError("数据格式错误")
+    return version, salt, iterations, tag, offset
+
+
+def _write_stream(session_key: SessionKey, plain: bytes, dst: BinaryIO, chunk_size: int, workers: int = 1):
+    """以v6格式写入：每次写入使用新的数据密钥和nonce前缀，各块用 workers 个线程并行加密"""
+    data_key = RecordCipher.new_data_key()
+    wrapped = encrypt_with_key(session_key, data_key)
+    prefix = StreamCipher.new_prefix()
+    head = (_pack_header(session_key, CHUNKED_FORMAT_VERSION) + _WRAPPED_KEY_LEN.pack(len(wrapped)) + wrapped +
+            _STREAM_CHUNK_SIZE.pack(chunk_size) + prefix + _CHUNK_MANIFEST.pack(len(plain)))
+    dst.write(head)
+    StreamCipher(data_key, prefix, head, chunk_size).seal_chunks(plain, dst, workers)
+
+
+def _read_stream(session_key: SessionKey, src: BinaryIO, file_header: bytes, version: int,
+                 workers: int = 1) -> bytes:
+    """读取v5/v6格式的其余部分（src 位于文件头之后），返回明文
+
+    Args:
+        file_header: 已读取的文件头原始字节，参与各密文块的认证
+        version: 文件版本；v6 按清单用 workers 个线程并行解密，v5 只能逐块顺序解密
+    """
+    raw_len = src.read(_WRAPPED_KEY_LEN.size)
+    if len(raw_len) != _WRAPPED_KEY_LEN.size:
+        raise VaultError("数据格式错误")
+    (wrapped_len,) = _WRAPPED_KEY_LEN.unpack(raw_len)
+    wrapped = src.read(wrapped_len)
+    tail_size = _STREAM_CHUNK_SIZE.size + STREAM_PREFIX_SIZE
+    if version == CHUNKED_FORMAT_VERSION:
+        tail_size += _CHUNK_MANIFEST.size
+    tail = src.read(tail_size)
+    if len(wrapped) != wrapped_len or len(tail) != tail_size:
+        raise VaultError("数据格式错误")
+    (chunk_size,) = _STREAM_CHUNK_SIZE.unpack_from(tail)
+    if not 0 < chunk_size <= _MAX_STREAM_CHUNK:
+        raise VaultError("数据格式错误")
+    prefix = tail[_STREAM_CHUNK_SIZE.size:_STREAM_CHUNK_SIZE.size + STREAM_PREFIX_SIZE]
+    try:
+        data_key = decrypt_with_key(session_key, wrapped)
+        cipher = StreamCipher(data_key, prefix, file_header + raw_len + wrapped + tail, chunk_size)
+        plain = io.BytesIO()
+        if version == CHUNKED_FORMAT_VERSION:
+            (plain_size,) = _CHUNK_MANIFEST.unpack_from(tail, _STREAM_CHUNK_SIZE.size + STREAM_PREFIX_SIZE)
+            cipher.open_chunks(src, plain, plain_size, workers)
+        else:
+            cipher.decrypt_stream(src, plain)
+    except ValueError:
+        raise VaultError("数据损坏或密码不正确")
+    return plain.getvalue()
+
+
+def _crypto_workers() -> int:
+    """分块加解密的线程数：存储配置 crypto_workers，0 表示按CPU核数"""
+    workers = get_storage_config().get('crypto_workers', 0)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _record_aad(kind: int, op: int, rid: str) -> bytes:
+    rid_bytes = rid.encode("utf-8")
+    return bytes((kind, op, len(rid_bytes))) + rid_bytes
+
+
+def _seal_frame(cipher: RecordCipher, kind: int, op: int, rid: str, body: bytes) -> bytes:
+    aad = _record_aad(kind, op, rid)
+    payload = aad + cipher.seal(aad, body)
+    return _FRAME_LEN.pack(len(payload)) + payload
+
+
+def _open_frame(cipher: RecordCipher, frame: memoryview) -> Tuple[int, int, str, bytes]:
+    kind, op, rid_len = frame[0], frame[1], frame[2]
+    aad_len = 3 + rid_len
+    aad = bytes(frame[:aad_len])
+    rid = aad[3:].decode("utf-8")
+    return kind, op, rid, cipher.open(aad, frame[aad_len:])
+
+
+def _frame_follows(cipher: RecordCipher, data, view: memoryview, start: int) -> bool:
+    """start 之后是否还有能通过认证的帧
+
+    损坏的帧长度不可信，因此逐字节重新同步帧边界；先用帧头的取值范围排除绝大多数位置，
+    只对可能的位置做一次 AES-GCM 认证。只在加载遇到损坏的帧时调用。
+    """
+    end_of_data = len(data)
+    min_payload = 3 + NONCE_SIZE + TAG_SIZE
+    for pos in range(start, end_of_data - _FRAME_LEN.size - min_payload + 1):
+        head = pos + _FRAME_LEN.size
+        if data[head] > RECORD_COMMIT or data[head + 1] not in (OP_PUT, OP_DELETE):
+            continue
+        (frame_len,) = _FRAME_LEN.unpack_from(data, pos)
+        if frame_len < min_payload + data[head + 2] or head + frame_len > end_of_data:
+            continue
+        try:
+            _open_frame(cipher, view[head:head + frame_len])
+        except (ValueError, UnicodeDecodeError):
+            continue
+        return True
+    return False
+
+
+# ----- 载荷编码 -----
+# 记录帧的内容和v2密文块的明文都是自描述的：以 '{' 开头的是 JSON，否则首字节是二进制编码的版本号。
+# 读取时按内容识别编码，新旧编码的记录可以出现在同一个文件中；写入使用 VaultStorage.codec。
+
+class PayloadCodec(ABC):
+    """载荷编码：整个保险库（导出文件、旧版格式）和单条记录（vault.dat 的记录帧）"""
+    name = ""
+
+    @abstractmethod
+    def encode_vault(self, meta: Dict[str, Optional[str]], version: int,
+                     groups: List[Group], accounts: List[Account]) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode_vault(self, plain: bytes) -> Tuple[Dict[str, Optional[str]], int, List[Group], List[Account]]:
+        """Returns: (meta, 数据版本, 分组, 账号)"""
+
+    @abstractmethod
+    def encode_record(self, obj) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode_record(self, kind: int, body: bytes):
+        ...
+
+    @abstractmethod
+    def encode_meta(self, version: int) -> bytes:
+        ...
+
+    @abstractmethod
+    def decode_meta(self, body: bytes) -> int:
+        ...
+
+
+class JsonCodec(PayloadCodec):
+    """JSON 编码（原有格式，旧版程序也能读取）"""
+    name = "json"
+
+    def encode_vault(self, meta, version, groups, accounts):
+        data = {
+            "version": version,
+            "groups": [asdict(g) for g in groups],
+            "accounts": [asdict(a) for a in accounts],
+        }
+        obj = {"meta": dict(meta, version=version), "data": data}
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+    def decode_vault(self, plain):
+        obj = json.loads(plain.decode("utf-8"))
+        data = obj.get("data", {})
+        groups = [Group.from_dict(g) for g in data.get("groups", [])]
+        accounts = [Account.from_dict(a) for a in data.get("accounts", [])]
+        return obj.get("meta", {}), data.get("version", 1), groups, accounts
+
+    def encode_record(self, obj):
+        return json.dumps(asdict(obj), separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+
+    def decode_record(self, kind, body):
+        cls = Account if kind == RECORD_ACCOUNT else Group
+        return cls.from_dict(json.loads(body))
+
+    def encode_meta(self, version):
+        return json.dumps({"version": version}).encode("utf-8")
+
+    def decode_meta(self, body):
+        return json.loads(body).get("version", 1)
+
+
+# 二进制编码（整数均为小端序）
+# 字符串块：方式(1) | 个数(4) | None 的个数(4) | None 的下标(各4) | [各值的字符数(个数×4)] | UTF-8字节数(4) | UTF-8
+#     方式 0：各值（None 记为空串）以 NUL 分隔后整体编码，解码时一次 split 即可
+#     方式 1：有值本身含 NUL 时，各值直接拼接，另存各值的字符数
+# 保险库：编码版本(1) | 数据版本(4) | 分组数(4) | 账号数(4) | 分组字段数(1) | 账号字段数(1)
+#         | meta 字符串块(salt, hash) | 分组字符串块 | 账号字符串块（块内按字段分列存放）
+# 记录：编码版本(1) | 字符串块（按字段顺序）；meta 记录：编码版本(1) | 数据版本(4)
+# 字段数写在数据中，之后给模型增加带默认值的字段时仍能读取旧数据。
+_BINARY_V1 = 1
+_SEPARATED = 0
+_LENGTH_PREFIXED = 1
+_U32 = "I" if array("I").itemsize == 4 else "L"
+_U32_LE = struct.Struct("<I")
+_BLOCK_HEAD = struct.Struct("<BII")
+_BINARY_VAULT = struct.Struct("<BIIIBB")
+_BINARY_META = struct.Struct("<BI")
+_GROUP_FIELDS = tuple(f.name for f in fields(Group))
+_ACCOUNT_FIELDS = tuple(f.name for f in fields(Account))
+_ACCOUNT_GROUP_FIELD = _ACCOUNT_FIELDS.index("group_id")
+_META_FIELDS = ("salt", "hash")
+
+
+def _pack_u32(values) -> bytes:
+    packed = array(_U32, values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_u32(data: bytes, offset: int, count: int) -> Tuple[array, int]:
+    end = offset + count * 4
+    values = array(_U32)
+    values.frombytes(data[offset:end])
+    if len(values) != count:
+        raise ValueError("字符串块不完整")
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values, end
+
+
+def _pack_strings(values: List[Optional[str]]) -> bytes:
+    nulls = [i for i, v in enumerate(values) if v is None] if None in values else []
+    if nulls:
+        values = ["" if v is None else v for v in values]
+    text = "\x00".join(values)
+    parts = [b"", _pack_u32(nulls)]
+    if text.count("\x00") == max(len(values) - 1, 0):
+        mode = _SEPARATED
+    else:
+        mode = _LENGTH_PREFIXED
+        text = "".join(values)
+        parts.append(_pack_u32(map(len, values)))
+    encoded = text.encode("utf-8")
+    parts[0] = _BLOCK_HEAD.pack(mode, len(values), len(nulls))
+    parts.append(_U32_LE.pack(len(encoded)))
+    parts.append(encoded)
+    return b"".join(parts)
+
+
+def _unpack_strings(data: bytes, offset: int) -> Tuple[List[Optional[str]], int]:
+    """解析字符串块，返回 (值列表, 块之后的偏移)；数据不完整时抛出 ValueError"""
+    mode, count, null_count = _BLOCK_HEAD.unpack_from(data, offset)
+    offset += _BLOCK_HEAD.size
+    nulls, offset = _unpack_u32(data, offset, null_count) if null_count else ((), offset)
+    if mode == _LENGTH_PREFIXED:
+        lengths, offset = _unpack_u32(data, offset, count)
+    elif mode != _SEPARATED:
+        raise ValueError("未知的字符串块格式")
+    (size,) = _U32_LE.unpack_from(data, offset)
+    start = offset + _U32_LE.size
+    end = start + size
+    if end > len(data):
+        raise ValueError("字符串块不完整")
+    text = data[start:end].decode("utf-8")
+    if mode == _SEPARATED:
+        values: List[Optional[str]] = text.split("\x00") if count else []
+    else:
+        bounds = list(accumulate(lengths, initial=0))
+        if bounds[-1] != len(text):
+            raise ValueError("字符串块长度不一致")
+        values = list(map(text.__getitem__, map(slice, bounds, bounds[1:])))
+    if len(values) != count:
+        raise ValueError("字符串块长度不一致")
+    for i in nulls:
+        values[i] = None
+    return values, end
+
+
+def _columns(objs: list, names: Tuple[str, ...]) -> List[Optional[str]]:
+    """按字段分列展开为一个列表"""
+    return list(chain.from_iterable(map(attrgetter(name), objs) for name in names))
+
+
+def _rows(cls, values: List[Optional[str]], n_rows: int, n_fields: int, known: int) -> list:
+    """由按字段分列展开的值创建对象；字段比模型多的数据无法读取，少的使用默认值"""
+    if n_fields > known or len(values) != n_rows * n_fields:
+        raise ValueError("字段数量不匹配")
+    if not n_rows:
+        return []
+    return list(map(cls, *(values[i * n_rows:(i + 1) * n_rows] for i in range(n_fields))))
+
+
+class BinaryCodec(PayloadCodec):
+    """长度前缀的二进制编码：同一块中的字段拼成一个字符串整体编解码，不经过中间字典"""
+    name = "binary"
+
+    def encode_vault(self, meta, version, groups, accounts):
+        head = _BINARY_VAULT.pack(_BINARY_V1, version, len(groups), len(accounts),
+                                  len(_GROUP_FIELDS), len(_ACCOUNT_FIELDS))
+        return b"".join((
+            head,
+            _pack_strings([meta.get(name) for name in _META_FIELDS]),
+            _pack_strings(_columns(groups, _GROUP_FIELDS)),
+            _pack_strings(_columns(accounts, _ACCOUNT_FIELDS)),
+        ))
+
+    def decode_vault(self, plain):
+        tag, version, n_groups, n_accounts, group_fields, account_fields = _BINARY_VAULT.unpack_from(plain)
+        if tag != _BINARY_V1:
+            raise ValueError("未知的编码版本")
+        meta_values, offset = _unpack_strings(plain, _BINARY_VAULT.size)
+        group_values, offset = _unpack_strings(plain, offset)
+        account_values, offset = _unpack_strings(plain, offset)
+        if offset != len(plain):
+            raise ValueError("数据长度不一致")
+        if account_fields > _ACCOUNT_GROUP_FIELD:
+            # 同一分组的账号共用一个分组ID字符串
+            start = _ACCOUNT_GROUP_FIELD * n_accounts
+            account_values[start:start + n_accounts] = map(intern_id, account_values[start:start + n_accounts])
+        meta = dict(zip(_META_FIELDS, meta_values))
+        groups = _rows(Group, group_values, n_groups, group_fields, len(_GROUP_FIELDS))
+        accounts = _rows(Account, account_values, n_accounts, account_fields, len(_ACCOUNT_FIELDS))
+        return meta, version, groups, accounts
+
+    def encode_record(self, obj):
+        names = _ACCOUNT_FIELDS if isinstance(obj, Account) else _GROUP_FIELDS
+        return bytes((_BINARY_V1,)) + _pack_strings([getattr(obj, name) for name in names])
+
+    def decode_record(self, kind, body):
+        if body[0] != _BINARY_V1:
+            raise ValueError("未知的编码版本")
+        values, offset = _unpack_strings(body, 1)
+        if offset != len(body):
+            raise ValueError("数据长度不一致")
+        cls, known = (Account, _ACCOUNT_FIELDS) if kind == RECORD_ACCOUNT else (Group, _GROUP_FIELDS)
+        if len(values) > len(known):
+            raise ValueError("字段数量不匹配")
+        return cls(*values)
+
+    def encode_meta(self, version):
+        return _BINARY_META.pack(_BINARY_V1, version)
+
+    def decode_meta(self, body):
+        tag, version = _BINARY_META.unpack(body)
+        if tag != _BINARY_V1:
+            raise ValueError("未知的编码版本")
+        return version
+
+
+PAYLOAD_CODECS: Dict[str, PayloadCodec] = {codec.name: codec for codec in (JsonCodec(), BinaryCodec())}
+
+
+def get_payload_codec(name: Optional[str] = None) -> PayloadCodec:
+    """按名称获取编码，默认取存储配置 payload_codec"""
+    name = name or get_storage_config().get('payload_codec', 'binary')
+    try:
+        return PAYLOAD_CODECS[name]
+    except KeyError:
+        raise VaultError(f"未知的数据编码: {name}")
+
+
+def _codec_of(payload: bytes) -> PayloadCodec:
+    """按内容识别载荷的编码"""
+    return PAYLOAD_CODECS["json"] if payload[:1] == b"{" else PAYLOAD_CODECS["binary"]
+
+
+# ----- 载荷压缩 -----
+# 编码之后、加密之前可选压缩。压缩过的载荷以标记字节开头（与 JSON 的 '{'、二进制编码的版本号都不冲突）：
+#     0xFE | 算法(1) | 原始长度(4) | 压缩数据
+# 小于 compression_min_size 的载荷（通常是单条记录）不压缩，压缩后没有变小的也保存原文；
+# 读取时按标记识别，压缩与未压缩的载荷可以混在同一个文件中。
+_COMPRESSED = 0xFE
+_COMPRESSED_HEAD = struct.Struct("<BBI")
+_ZLIB = 1
+_LZMA = 2
+_COMPRESSION_IDS = {"zlib": _ZLIB, "lzma": _LZMA}
+
+
+class PayloadCompressor:
+    """按算法和级别压缩载荷；algorithm 为 "none" 时不压缩
+
+    Args:
+        algorithm: "zlib"、"lzma" 或 "none"
+        level: 压缩级别（0~9，zlib 的 level / lzma 的 preset）
+        min_size: 小于该字节数的载荷不压缩
+    """
+
+    def __init__(self, algorithm: str = "zlib", level: int = 6, min_size: int = 2048):
+        if algorithm != "none" and algorithm not in _COMPRESSION_IDS:
+            raise VaultError(f"未知的压缩算法: {algorithm}")
+        self.algorithm = algorithm
+        self.level = level
+        self.min_size = min_size
+
+    def compress(self, payload: bytes) -> bytes:
+        if self.algorithm == "none" or len(payload) < self.min_size:
+            return payload
+        if self.algorithm == "zlib":
+            packed = zlib.compress(payload, self.level)
+        else:
+            packed = lzma.compress(payload, preset=self.level)
+        head = _COMPRESSED_HEAD.pack(_COMPRESSED, _COMPRESSION_IDS[self.algorithm], len(payload))
+        if len(head) + len(packed) >= len(payload):
+            return payload
+        return head + packed
+
+
+def get_payload_compressor() -> PayloadCompressor:
+    """按存储配置 compression / compression_level / compression_min_size 创建"""
+    config = get_storage_config()
+    return PayloadCompressor(config.get('compression', 'zlib'), config.get('compression_level', 6),
+                             config.get('compression_min_size', 2048))
+
+
+def _decompress(payload: bytes) -> bytes:
+    """还原压缩过的载荷，未压缩的原样返回；数据损坏或长度不符时抛出 ValueError"""
+    if payload[:1] != b"\xfe":
+        return payload
+    _, algorithm, size = _COMPRESSED_HEAD.unpack_from(payload)
+    if not size:
+        raise ValueError("压缩数据格式错误")
+    packed = payload[_COMPRESSED_HEAD.size:]
+    try:
+        # 最多解压出声明的长度，损坏的数据不会占用大量内存
+        if algorithm == _ZLIB:
+            decompressor = zlib.decompressobj()
+        elif algorithm == _LZMA:
+            decompressor = lzma.LZMADecompressor()
+        else:
+            raise ValueError("未知的压缩算法")
+        plain = decompressor.decompress(packed, size)
+    except (zlib.error, lzma.LZMAError) as e:
+        raise ValueError(f"解压失败: {e}") from None
+    if len(plain) != size or not decompressor.eof:
+        raise ValueError("解压后的长度不一致")
+    return plain
+
+
+def _decode_record(kind: int, body: bytes):
+    body = _decompress(body)
+    return _codec_of(body).decode_record(kind, body)
+
+
+def _fsync_dir(path: str):
+    """同步目录项，保证重命名在掉电后仍然生效（Windows 不支持对目录 fsync）"""
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def is_encrypted_blob(blob: bytes) -> bool:
+    """判断数据是否为加密保险库/导出文件（新旧格式均可识别）；只需文件开头的 ENCRYPTED_PROBE_SIZE 字节"""
+    if blob[:len(VAULT_MAGIC)] == VAULT_MAGIC:
+        return True
+    return len(blob) > _LEGACY_PUBKEY_LEN and blob[0] == _LEGACY_PUBKEY_LEN
+
+
 class VaultStorage:
     def __init__(self, path: str):
         self.path = path
         self.vault = VaultData()
+        # 账号搜索索引，随账号增删改同步维护
+        self.search_index = SearchIndex()
+        # 写入记录帧和导出文件使用的编码和压缩（读取时按内容识别）
+        self.codec = get_payload_codec()
+        self.compressor = get_payload_compressor()
         self._master_salt: Optional[bytes] = None
         self._master_hash: Optional[bytes] = None
-        self._master_password: Optional[str] = None
+        # 解锁期间缓存的会话密钥，避免每次保存都重新执行PBKDF2
+        self._session_key: Optional[SessionKey] = None
+        # 记录加密器（数据密钥由会话密钥包装保存在文件头中）
+        self._record_cipher: Optional[RecordCipher] = None
+        self._wrapped_data_key: Optional[bytes] = None
+        # 尚未写入磁盘的记录变更：(类型, ID) -> 最新对象，None 表示删除
+        self._pending: Dict[Tuple[int, str], Optional[object]] = {}
+        # 需要整体重写文件（新建、迁移、更换主密码、整体导入）
+        self._needs_rewrite = False
+        # 文件中的帧数量，用于判断是否需要压缩
+        self._log_frames = 0
+        # 加载时丢弃的未提交尾部字节数（上次写入中途崩溃时非零）
+        self.recovered_bytes = 0
+        # 组提交：_lock 保护内存状态，_commit_lock 保证同一时间只有一个线程写盘；
+        # 变更序号递增，写盘期间产生的变更由下一次提交统一落盘
+        self._commit_lock = threading.Lock()
+        self._mutation_seq = 0
+        self._durable_seq = 0
+        self._lock = threading.RLock()
 
     # ----- Master password flow -----
     def create_new(self, master_password: str):
         """创建新的保险库"""
-        self._master_password = master_password
-        self._master_salt, self._master_hash = _crypto_manager.create_master_hash(master_password)
+        self._set_session_key(new_session_key(master_password))
+        self._new_data_key()
+        self._master_salt, self._master_hash = None, None
         # default group
         default_group_name = get_text('default_values', 'default_group') or "未分组"
         default_group = Group(id=gen_id(), name=default_group_name)
-        self.vault.groups.append(default_group)
+        self.vault.put_group(default_group)
 
     def verify_master(self, master_password: str) -> bool:
+        if self.unlocked and not self._session_key.legacy:
+            return _crypto_manager.verify_session_password(master_password, self._session_key)
         if not self._master_salt or not self._master_hash:
             return False
         return _crypto_manager.verify_master_password(master_password, self._master_salt, self._master_hash)
@@ -39,19 +599,46 @@ class VaultStorage:
         """修改主密码"""
         if not self.verify_master(old_password):
             raise VaultError("主密码不正确")
-        # Re-encrypt with new password on save
-        self._master_password = new_password
-        self._master_salt, self._master_hash = _crypto_manager.create_master_hash(new_password)
+        with self._lock:
+            # 旧会话密钥失效，使用新密码和新盐值重新派生；同时轮换数据密钥并整体重写
+            self._set_session_key(new_session_key(new_password))
+            self._new_data_key()
+            self._master_salt, self._master_hash = None, None
         self.save()
 
+    def lock(self):
+        """锁定保险库：丢弃会话密钥和内存中的数据"""
+        with self._lock:
+            self._set_session_key(None)
+            if self._record_cipher is not None:
+                self._record_cipher.invalidate()
+            self._record_cipher = None
+            self._wrapped_data_key = None
+            self._pending.clear()
+            self.vault = VaultData()
+            self.search_index.clear()
+
+    @property
+    def unlocked(self) -> bool:
+        return self._session_key is not None and self._session_key.valid
+
+    def _set_session_key(self, session_key: Optional[SessionKey]):
+        if self._session_key is not None and self._session_key is not session_key:
+            self._session_key.invalidate()
+        self._session_key = session_key
+
+    def _new_data_key(self):
+        """生成新的数据密钥，下次保存时整体重写文件"""
+        data_key = RecordCipher.new_data_key()
+        self._wrapped_data_key = encrypt_with_key(self._session_key, data_key)
+        self._record_cipher = RecordCipher(data_key)
+        self._needs_rewrite = True
+
     # ----- Helpers -----
     def _find_default_group(self) -> Optional[Group]:
         default_group_name = get_text('default_values', 'default_group') or "未分组"
         undefined_group_name = get_text('default_values', 'undefined_group') or "未定义"
-        for g in self.vault.groups:
-            if g.name in (default_group_name, undefined_group_name):
-                return g
-        return None
+        return self.vault.group_by_name(default_group_name) or self.vault.group_by_name(undefined_group_name)
 
     def default_group_id(self) -> str:
         g = self._find_default_group()
@@ -60,92 +647,381 @@ class VaultStorage:
         # If missing (older数据或异常情况)，自动创建
         default_group_name = get_text('default_values', 'default_group') or "未分组"
         g = Group(id=gen_id(), name=default_group_name)
-        self.vault.groups.append(g)
+        with self._lock:
+            self.vault.put_group(g)
+            self._mark_put(RECORD_GROUP, g)
         return g.id
 
     def _name_exists(self, name: str) -> bool:
         name = (name or "").strip()
-        return any(g.name == name for g in self.vault.groups)
+        return self.vault.group_by_name(name) is not None
+
+    def _mark_put(self, kind: int, obj):
+        with self._lock:
+            self._pending[(kind, obj.id)] = obj
+            self._mutation_seq += 1
+            if kind == RECORD_ACCOUNT:
+                self.search_index.put(obj)
+
+    def _mark_delete(self, kind: int, rid: str):
+        with self._lock:
+            self._pending[(kind, rid)] = None
+            self._mutation_seq += 1
+            if kind == RECORD_ACCOUNT:
+                self.search_index.remove(rid)
+
+    def _mark_rewrite(self):
+        """整个保险库已被替换"""
+        with self._lock:
+            self.search_index.rebuild(self.vault.accounts)
+            self._pending.clear()
+            self._needs_rewrite = True
+            self._mutation_seq += 1
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return self._needs_rewrite or bool(self._pending)
 
     # ----- Persistence -----
-    def _serialize(self) -> bytes:
-        # 优化序列化过程，减少不必要的转换
+    def _serialize(self, codec: Optional[PayloadCodec] = None) -> bytes:
         meta = {
             "salt": self._master_salt.hex() if self._master_salt else None,
             "hash": self._master_hash.hex() if self._master_hash else None,
-            "version": self.vault.version,
-        }
-        
-        # 预分配数据字典以提高性能
-        data = {
-            "version": self.vault.version,
-        }
-        
-        # 批量序列化对象以提高性能
-        data["groups"] = [None] * len(self.vault.groups)
-        data["accounts"] = [None] * len(self.vault.accounts)
-        
-        for i, g in enumerate(self.vault.groups):
-            data["groups"][i] = asdict(g)
-            
-        for i, a in enumerate(self.vault.accounts):
-            data["accounts"][i] = asdict(a)
-        
-        obj = {
-            "meta": meta,
-            "data": data,
         }
-        plain = json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode("utf-8")
-        return plain
+        codec = codec or self.codec
+        return codec.encode_vault(meta, self.vault.version, list(self.vault.groups), list(self.vault.accounts))
+
+    def _encode_record(self, obj) -> bytes:
+        return self.compressor.compress(self.codec.encode_record(obj))
 
     def _deserialize(self, plain: bytes):
-        obj = json.loads(plain.decode("utf-8"))
-        meta = obj.get("meta", {})
+        plain = _decompress(plain)
+        meta, version, groups, accounts = _codec_of(plain).decode_vault(plain)
         self._master_salt = bytes.fromhex(meta.get("salt")) if meta.get("salt") else None
         self._master_hash = bytes.fromhex(meta.get("hash")) if meta.get("hash") else None
-        
-        # 解析数据部分，优化大数据量处理
-        data = obj.get("data", {})
-        self.vault.version = data.get("version", 1)
-        
-        # 预分配列表空间以提高性能
-        groups_data = data.get("groups", [])
-        accounts_data = data.get("accounts", [])
-        
-        self.vault.groups = [None] * len(groups_data)
-        self.vault.accounts = [None] * len(accounts_data)
-        
-        # 批量创建对象以提高性能
-        for i, g in enumerate(groups_data):
-            self.vault.groups[i] = Group(**g)
-            
-        for i, a in enumerate(accounts_data):
-            self.vault.accounts[i] = Account(**a)
+        self.vault.version = version
+        self.vault.groups = groups
+        self.vault.accounts = accounts
+        self.search_index.rebuild(self.vault.accounts)
 
     def save(self):
-        if not self._master_password:
-            raise VaultError("未设置主密码")
-        plain = self._serialize()
-        encrypted_data = encrypt(self._master_password, plain)
-        with open(self.path, "wb") as f:
-            f.write(encrypted_data)
+        """提交变更：通常只追加变更记录；首次保存、迁移或失效帧过多时整体重写
+
+        返回时本次调用之前的所有变更都已 fsync 落盘。多个线程同时保存时采用组提交：
+        写盘期间其他线程产生的变更由下一位提交者合并为一批，只需一次 fsync。
+        """
+        with self._lock:
+            if not self.unlocked or self._record_cipher is None:
+                raise VaultError("未设置主密码")
+            ticket = self._mutation_seq
+        with self._commit_lock:
+            with self._lock:
+                if self._record_cipher is None:
+                    raise VaultError("未设置主密码")
+                rewrite = self._needs_rewrite or not os.path.exists(self.path) or self._should_compact()
+                if not rewrite and (self._durable_seq >= ticket or not self._pending):
+                    # 其他线程的提交已经包含了本次调用之前的变更
+                    return
+                seq = self._mutation_seq
+                cipher = self._record_cipher
+                if rewrite:
+                    header = self._log_header()
+                    snapshot = (self.vault.version, list(self.vault.groups), list(self.vault.accounts))
+                    batch = None
+                else:
+                    batch = dict(self._pending)
+                self._pending.clear()
+                self._needs_rewrite = False
+            # 加密和写盘在状态锁之外进行，GUI线程的修改不会被 fsync 阻塞
+            try:
+                if rewrite:
+                    frames = self._rewrite(header, cipher, *snapshot)
+                else:
+                    frames = self._append_batch(cipher, batch)
+            except OSError as e:
+                with self._lock:
+                    # 文件尾部状态未知：保留未提交的变更，下次保存时整体重写
+                    if batch:
+                        for key, obj in batch.items():
+                            self._pending.setdefault(key, obj)
+                    self._needs_rewrite = True
+                raise VaultError(f"保存失败: {e}")
+            with self._lock:
+                self._log_frames = frames if rewrite else self._log_frames + frames
+                self._durable_seq = seq
+
+    def _should_compact(self) -> bool:
+        config = get_storage_config()
+        live = len(self.vault.groups) + len(self.vault.accounts) + 1
+        return (self._log_frames + len(self._pending) > config['compaction_min_frames'] and
+                self._log_frames + len(self._pending) > live * config['compaction_ratio'])
+
+    def _log_header(self) -> bytes:
+        return (_pack_header(self._session_key, LOG_FORMAT_VERSION) +
+                _WRAPPED_KEY_LEN.pack(len(self._wrapped_data_key)) + self._wrapped_data_key)
+
+    def _rewrite(self, header: bytes, cipher: RecordCipher, version: int,
+                 groups: List[Group], accounts: List[Account]) -> int:
+        """整体重写（压缩）：只写入当前有效记录
+
+        先写临时文件并 fsync，再原子替换 vault.dat 并同步目录；
+        任意时刻崩溃，磁盘上都是完整的旧文件或完整的新文件。
+
+        Returns:
+            写入的帧数量
+        """
+        encode = self._encode_record
+        frames: List[bytes] = [_seal_frame(cipher, RECORD_META, OP_PUT, _META_ID, self.codec.encode_meta(version))]
+        for g in groups:
+            frames.append(_seal_frame(cipher, RECORD_GROUP, OP_PUT, g.id, encode(g)))
+        for a in accounts:
+            frames.append(_seal_frame(cipher, RECORD_ACCOUNT, OP_PUT, a.id, encode(a)))
+        frames.append(_seal_frame(cipher, RECORD_COMMIT, OP_PUT, "", _COMMIT_COUNT.pack(len(frames))))
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(header)
+                f.write(b"".join(frames))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        _fsync_dir(self.path)
+        return len(frames)
+
+    def _append_batch(self, cipher: RecordCipher, batch: Dict[Tuple[int, str], Optional[object]]) -> int:
+        """追加写入一批变更记录并以提交帧结尾，I/O量与变更记录大小成正比
+
+        Returns:
+            写入的帧数量
+        """
+        frames: List[bytes] = []
+        for (kind, rid), obj in batch.items():
+            if obj is None:
+                frames.append(_seal_frame(cipher, kind, OP_DELETE, rid, b""))
+            else:
+                frames.append(_seal_frame(cipher, kind, OP_PUT, rid, self._encode_record(obj)))
+        frames.append(_seal_frame(cipher, RECORD_COMMIT, OP_PUT, "", _COMMIT_COUNT.pack(len(frames))))
+        with open(self.path, "ab") as f:
+            f.write(b"".join(frames))
+            f.flush()
+            os.fsync(f.fileno())
+        return len(frames)
+
+    def _encrypt_blob(self, plain: bytes) -> bytes:
+        """加密为v2单密文块格式：文件头 + ECIES密文（旧版导出格式，仅供对比）"""
+        return _pack_header(self._session_key, BLOB_FORMAT_VERSION) + encrypt_with_key(self._session_key, plain)
 
-    def load(self, master_password: str):
+    @staticmethod
+    def _read_log(session_key: SessionKey, data: bytes, offset: int,
+                  version: int = LOG_FORMAT_VERSION) -> Tuple[VaultData, RecordCipher, bytes, int, int]:
+        """解析记录日志
+
+        v4 只应用以提交帧结尾的完整批次；最后一个提交帧之后残缺或无法解密的内容
+        是写入中途崩溃留下的，予以忽略。损坏的帧之后还有能通过认证的帧时，损坏的是
+        已提交的内容，报错而不是丢弃之后的批次。
+
+        Returns:
+            (保险库数据, 记录加密器, 包装后的数据密钥, 帧数量, 已提交内容的结束偏移)
+        """
+        try:
+            (wrapped_len,) = _WRAPPED_KEY_LEN.unpack_from(data, offset)
+        except struct.error:
+            raise VaultError("数据格式错误")
+        offset += _WRAPPED_KEY_LEN.size
+        wrapped = data[offset:offset + wrapped_len]
+        offset += wrapped_len
+        try:
+            cipher = RecordCipher(decrypt_with_key(session_key, wrapped))
+        except ValueError:
+            raise VaultError("数据损坏或密码不正确")
+
+        require_commit = version >= LOG_FORMAT_VERSION
+        groups: Dict[str, Group] = {}
+        accounts: Dict[str, Account] = {}
+        meta_version = 1
+        frames = 0
+        committed_end = offset
+        batch: List[Tuple[int, int, str, bytes]] = []
+        view = memoryview(data)
+        end_of_data = len(data)
+        try:
+            while offset < end_of_data:
+                if offset + _FRAME_LEN.size > end_of_data:
+                    break
+                (frame_len,) = _FRAME_LEN.unpack_from(data, offset)
+                start = offset + _FRAME_LEN.size
+                end = start + frame_len
+                if end > end_of_data or frame_len < 3:
+                    break
+                try:
+                    record = _open_frame(cipher, view[start:end])
+                except (ValueError, UnicodeDecodeError):
+                    if not require_commit:
+                        raise VaultError("数据损坏或密码不正确")
+                    break
+                offset = end
+                if record[0] != RECORD_COMMIT:
+                    batch.append(record)
+                    if require_commit:
+                        continue
+                elif _COMMIT_COUNT.unpack(record[3])[0] != len(batch):
+                    raise VaultError("数据损坏或密码不正确")
+                for kind, op, rid, body in batch:
+                    if kind == RECORD_ACCOUNT:
+                        if op == OP_PUT:
+                            accounts[rid] = _decode_record(kind, body)
+                        else:
+                            accounts.pop(rid, None)
+                    elif kind == RECORD_GROUP:
+                        if op == OP_PUT:
+                            groups[rid] = _decode_record(kind, body)
+                        else:
+                            groups.pop(rid, None)
+                    elif kind == RECORD_META and op == OP_PUT:
+                        meta_version = _codec_of(body).decode_meta(body)
+                frames += len(batch) + (record[0] == RECORD_COMMIT)
+                batch.clear()
+                committed_end = offset
+            if require_commit and offset < end_of_data and _frame_follows(cipher, data, view, offset + 1):
+                # 只有最后一个未提交的批次可能因写入中途崩溃而残缺
+                raise VaultError("数据损坏或密码不正确")
+        except (ValueError, TypeError, struct.error):
+            raise VaultError("数据损坏或密码不正确")
+        finally:
+            view.release()
+        if not require_commit and committed_end != end_of_data:
+            raise VaultError("数据文件不完整")
+        if require_commit and frames == 0:
+            # 整体重写是原子的，至少存在一个完整批次
+            raise VaultError("数据损坏或密码不正确")
+        vault = VaultData(groups=list(groups.values()), accounts=list(accounts.values()), version=meta_version)
+        return vault, cipher, wrapped, frames, committed_end
+
+    def load(self, master_password: str, progress: Optional[Callable[[str, int], None]] = None):
+        """解锁并加载保险库
+
+        Args:
+            master_password: 主密码
+            progress: 可选的进度回调 progress(阶段描述, 百分比)，在各阶段之间调用；
+                回调抛出的异常会原样向上传播，可用于取消加载
+        """
+        report = progress or (lambda stage, percent: None)
         if not os.path.exists(self.path):
             raise VaultError("数据文件不存在")
+        report("读取数据文件…", 0)
+        # 整体重写中途崩溃留下的临时文件；vault.dat 本身仍是完整的旧版本
+        try:
+            os.remove(self.path + ".tmp")
+        except OSError:
+            pass
         with open(self.path, "rb") as f:
-            encrypted_data = f.read()
+            # 映射文件而不是整体读入：记录日志逐帧解密，进程内不另存一份文件内容
+            size = os.fstat(f.fileno()).st_size
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            try:
+                migrate = self._load_file(master_password, f, data, report)
+            finally:
+                if size:
+                    try:
+                        data.close()
+                    except BufferError:
+                        # 异常的回溯仍引用着映射的内容，随回溯一起释放
+                        pass
+        if migrate:
+            # 关闭映射之后再整体重写（Windows 不能替换仍被映射的文件）
+            self.save()
+        report("完成", 100)
+
+    def _load_file(self, master_password: str, f: BinaryIO, encrypted_data,
+                   report: Callable[[str, int], None]) -> bool:
+        """load() 的主体；encrypted_data 是整个文件的只读映射
+
+        Returns:
+            是否需要整体重写以迁移到记录日志格式
+        """
+        header = _unpack_header(encrypted_data)
+        if header is None:
+            self._load_legacy(master_password, encrypted_data, report)
+            return True
+        version, salt, iterations, tag, offset = header
+        if version > FORMAT_VERSION:
+            raise VaultError("数据文件版本过新，请升级程序")
+        report("派生密钥…", 10)
+        session_key = derive_session_key(master_password, salt, iterations)
+        # 验证标签与加密密钥来自同一次派生，无需再做一次主密码哈希
+        if not session_key.matches(tag):
+            raise VaultError("主密码错误")
+        report("解密数据…", 60)
+        if version in (_UNCOMMITTED_LOG_VERSION, LOG_FORMAT_VERSION):
+            vault, cipher, wrapped, frames, committed_end = self._read_log(
+                session_key, encrypted_data, offset, version)
+            report("建立搜索索引…", 90)
+            search_index = SearchIndex(vault.accounts)
+            with self._lock:
+                self.vault = vault
+                self.search_index = search_index
+                self._record_cipher = cipher
+                self._wrapped_data_key = wrapped
+                self._log_frames = frames
+                self._pending.clear()
+                self.recovered_bytes = len(encrypted_data) - committed_end
+                # 有未提交的尾部或旧版v3日志时，下次保存整体重写，不在残缺内容之后追加
+                self._needs_rewrite = self.recovered_bytes > 0 or version != LOG_FORMAT_VERSION
+                self._mutation_seq = self._durable_seq = 0
+                self._set_session_key(session_key)
+            return False
+        # v2 单密文块、v5/v6 分块流：解密后迁移到记录日志格式
+        if version in (STREAM_FORMAT_VERSION, CHUNKED_FORMAT_VERSION):
+            f.seek(offset)
+            plain = _read_stream(session_key, f, encrypted_data[:offset], version, _crypto_workers())
+        else:
+            try:
+                with memoryview(encrypted_data) as view:
+                    plain = decrypt_with_key(session_key, view[offset:])
+            except Exception:
+                raise VaultError("数据损坏或密码不正确")
+        report("解析数据…", 80)
+        try:
+            self._deserialize(plain)
+        except Exception:
+            raise VaultError("数据损坏或密码不正确")
+        self._set_session_key(session_key)
+        report("升级数据格式…", 90)
+        self._new_data_key()
+        return True
+
+    def _load_legacy(self, master_password: str, encrypted_data: bytes,
+                     report: Callable[[str, int], None]):
+        """读取v1格式，之后由 load() 整体重写为当前格式（仅首次解锁旧文件时执行一次）"""
+        report("派生密钥…", 10)
+        session_key = derive_session_key(master_password)
+        report("解密数据…", 30)
+        try:
+            plain = decrypt_with_key(session_key, encrypted_data)
+        except Exception:
+            raise VaultError("数据损坏或密码不正确")
+        report("解析数据…", 35)
         try:
-            plain = decrypt(master_password, encrypted_data)
             self._deserialize(plain)
         except Exception:
             raise VaultError("数据损坏或密码不正确")
         # Verify master
+        report("验证主密码…", 40)
         if not self._master_salt or not self._master_hash:
             raise VaultError("数据格式错误")
         if not _crypto_manager.verify_master_password(master_password, self._master_salt, self._master_hash):
             raise VaultError("主密码错误")
-        self._master_password = master_password
+        session_key.invalidate()
+        report("升级数据格式…", 70)
+        self._set_session_key(new_session_key(master_password))
+        self._new_data_key()
+        self._master_salt, self._master_hash = None, None
 
     # ----- Groups and Accounts API -----
     def add_group(self, name: str) -> Group:
@@ -160,7 +1036,9 @@ class VaultStorage:
         if name in (default_group_name, undefined_group_name) and self._find_default_group():
             raise VaultError("该名称为保留分组，已存在")
         g = Group(id=gen_id(), name=name)
-        self.vault.groups.append(g)
+        with self._lock:
+            self.vault.put_group(g)
+            self._mark_put(RECORD_GROUP, g)
         return g
 
     def rename_group(self, gid: str, name: str):
@@ -168,43 +1046,66 @@ class VaultStorage:
         if not name:
             raise VaultError("分组名称不能为空")
         # 不允许重名（排除自己）
-        if any(g.name == name and g.id != gid for g in self.vault.groups):
+        existing = self.vault.group_by_name(name)
+        if existing is not None and existing.id != gid:
             raise VaultError("分组名称已存在")
-        for g in self.vault.groups:
-            if g.id == gid:
-                g.name = name
-                return
-        raise VaultError("分组不存在")
+        with self._lock:
+            if self.vault.get_group(gid) is None:
+                raise VaultError("分组不存在")
+            g = self.vault.rename_group(gid, name)
+            self._mark_put(RECORD_GROUP, g)
 
     def delete_group(self, gid: str, migrate_to: Optional[str]):
         # 禁止删除默认分组
         if gid == self.default_group_id():
             raise VaultError("默认分组不可删除")
         target_gid = migrate_to or self.default_group_id()
-        # 删除分组
-        self.vault.groups = [g for g in self.vault.groups if g.id != gid]
-        # 迁移账号（仅迁移被删分组内账号，未分组的账号不会受影响）
-        for a in self.vault.accounts:
-            if a.group_id == gid:
-                a.group_id = target_gid
+        with self._lock:
+            # 删除分组
+            self.vault.remove_group(gid)
+            self._mark_delete(RECORD_GROUP, gid)
+            # 迁移账号（仅迁移被删分组内账号，未分组的账号不会受影响）
+            for aid in list(self.vault.account_ids_in_group(gid)):
+                self._mark_put(RECORD_ACCOUNT, self.vault.move_account(aid, target_gid))
+
+    def move_account(self, aid: str, gid: str) -> Account:
+        """把账号移动到指定分组"""
+        with self._lock:
+            if self.vault.get_account(aid) is None:
+                raise VaultError("账号不存在")
+            if self.vault.get_group(gid) is None:
+                raise VaultError("分组不存在")
+            a = self.vault.move_account(aid, gid)
+            self._mark_put(RECORD_ACCOUNT, a)
+        return a
+
+    def get_account(self, aid: str) -> Optional[Account]:
+        return self.vault.get_account(aid)
+
+    def get_group(self, gid: str) -> Optional[Group]:
+        return self.vault.get_group(gid)
 
     def add_account(self, a: Account):
         if not a.group_id:
             a.group_id = self.default_group_id()
-        self.vault.accounts.append(a)
+        with self._lock:
+            self.vault.put_account(a)
+            self._mark_put(RECORD_ACCOUNT, a)
 
     def update_account(self, a: Account):
-        for i, item in enumerate(self.vault.accounts):
-            if item.id == a.id:
-                # 确保更新后也有有效分组
-                if not a.group_id:
-                    a.group_id = self.default_group_id()
-                self.vault.accounts[i] = a
-                return
-        raise VaultError("账号不存在")
+        if self.vault.get_account(a.id) is None:
+            raise VaultError("账号不存在")
+        # 确保更新后也有有效分组
+        if not a.group_id:
+            a.group_id = self.default_group_id()
+        with self._lock:
+            self.vault.put_account(a)
+            self._mark_put(RECORD_ACCOUNT, a)
 
     def delete_account(self, aid: str):
-        self.vault.accounts = [a for a in self.vault.accounts if a.id != aid]
+        with self._lock:
+            self.vault.remove_account(aid)
+            self._mark_delete(RECORD_ACCOUNT, aid)
 
     # ----- Import/Export -----
     def export_plain(self) -> str:
@@ -218,9 +1119,9 @@ class VaultStorage:
     def import_plain(self, text: str, merge: bool = True):
         data = json.loads(text)
         if not merge:
-            self.vault.version = data.get("version", 1)
-            self.vault.groups = [Group(**g) for g in data.get("groups", [])]
-            self.vault.accounts = [Account(**a) for a in data.get("accounts", [])]
+            with self._lock:
+                self.vault = VaultData.from_dict(data)
+                self._mark_rewrite()
             return
         # merge groups by name
         name_to_gid = {g.name: g.id for g in self.vault.groups}
@@ -233,53 +1134,116 @@ class VaultStorage:
                 name_to_gid[g["name"]] = gid
         # merge accounts by (name, username)
         existing = {(a.name, a.username): a for a in self.vault.accounts}
+        import_group_names = {g["id"]: g["name"] for g in data.get("groups", [])}
         for a in data.get("accounts", []):
             key = (a["name"], a["username"])
-            a_group_name = next((g.name for g in data.get("groups", []) if g["id"] == a["group_id"]), None)
+            a_group_name = import_group_names.get(a["group_id"])
             a["group_id"] = name_to_gid.get(a_group_name) or self.default_group_id()
             if key in existing:
                 # overwrite
                 a["id"] = existing[key].id
-                self.update_account(Account(**a))
+                self.update_account(Account.from_dict(a))
             else:
                 a["id"] = gen_id()
-                self.add_account(Account(**a))
+                self.add_account(Account.from_dict(a))
 
     def export_encrypted(self) -> bytes:
-        plain = self._serialize()
-        if not self._master_password:
+        out = io.BytesIO()
+        self.export_encrypted_to(out)
+        return out.getvalue()
+
+    def export_encrypted_to(self, dst: BinaryIO):
+        """以v6分块格式写入 dst：各块并行加密，按顺序逐块写出，不在内存中拼出完整的密文"""
+        if not self.unlocked:
             raise VaultError("未设置主密码")
-        return encrypt(self._master_password, plain)
+        plain = self.compressor.compress(self._serialize())
+        chunk_size = get_storage_config().get('stream_chunk_size', STREAM_CHUNK_SIZE)
+        _write_stream(self._session_key, plain, dst, chunk_size, _crypto_workers())
+
+    def _open_blob(self, src: BinaryIO, password: Optional[str]) -> Tuple[Dict[str, Optional[str]], int,
+                                                                        List[Group], List[Account]]:
+        """解密并解析导出文件；未提供密码时尝试使用当前会话密钥
+
+        v5/v6 文件从 src 逐块读取解密，其他格式需要整体读入。
+
+        Returns:
+            (meta, 数据版本, 分组, 账号)
+        """
+        start = src.tell()
+        head = src.read(_MAX_HEADER_SIZE)
+        header = _unpack_header(head)
+        if header is None:
+            # 旧版格式使用固定盐值，只能通过密码解密
+            if not password:
+                raise VaultError("旧版加密文件需要输入密码")
+            src.seek(start)
+            try:
+                plain = decrypt(password, src.read())
+            except ValueError:
+                raise VaultError("数据损坏或密码不正确")
+        else:
+            version, salt, iterations, tag, offset = header
+            if version > FORMAT_VERSION:
+                raise VaultError("文件版本过新，请升级程序")
+            session_key = self._blob_session_key(salt, iterations, tag, password)
+            if version in (STREAM_FORMAT_VERSION, CHUNKED_FORMAT_VERSION):
+                src.seek(start + offset)
+                plain = _read_stream(session_key, src, head[:offset], version, _crypto_workers())
+            else:
+                src.seek(start)
+                blob = src.read()
+                if version in (_UNCOMMITTED_LOG_VERSION, LOG_FORMAT_VERSION):
+                    # 也允许直接导入保险库数据文件
+                    vault, cipher, _, _, _ = self._read_log(session_key, blob, offset, version)
+                    cipher.invalidate()
+                    return {}, vault.version, list(vault.groups), list(vault.accounts)
+                try:
+                    with memoryview(blob) as view:
+                        plain = decrypt_with_key(session_key, view[offset:])
+                except ValueError:
+                    raise VaultError("数据损坏或密码不正确")
+        try:
+            plain = _decompress(plain)
+            return _codec_of(plain).decode_vault(plain)
+        except (ValueError, TypeError, struct.error):
+            raise VaultError("数据损坏或密码不正确")
+
+    def _blob_session_key(self, salt: bytes, iterations: int, tag: bytes, password: Optional[str]) -> SessionKey:
+        if password:
+            session_key = derive_session_key(password, salt, iterations)
+            if not session_key.matches(tag):
+                raise VaultError("密码错误")
+        elif self.unlocked and self._session_key.salt == salt:
+            session_key = self._session_key
+        else:
+            raise VaultError("该文件来自其他保险库，请输入其密码")
+        return session_key
 
-    def import_encrypted(self, blob: bytes, password: Optional[str] = None, merge: bool = True):
+    def import_encrypted(self, source: Union[bytes, BinaryIO], password: Optional[str] = None, merge: bool = True):
+        """导入加密文件；source 可以是文件内容或以二进制方式打开的（可定位的）文件对象"""
         # Allow providing a password for foreign encrypted file
-        pwd = password or self._master_password
-        if not pwd:
+        if not password and not self.unlocked:
             raise VaultError("缺少解密密码")
-        plain = decrypt(pwd, blob)
-        data = json.loads(plain.decode("utf-8"))
+        src = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        meta, version, groups, accounts = self._open_blob(src, password)
         if not merge:
-            meta = data.get("meta", {})
             self._master_salt = bytes.fromhex(meta.get("salt")) if meta.get("salt") else None
             self._master_hash = bytes.fromhex(meta.get("hash")) if meta.get("hash") else None
-            
-            data_content = data.get("data", {})
-            self.vault.version = data_content.get("version", 1)
-            self.vault.groups = [Group(**g) for g in data_content.get("groups", [])]
-            self.vault.accounts = [Account(**a) for a in data_content.get("accounts", [])]
+
+            with self._lock:
+                self.vault = VaultData(groups, accounts, version)
+                self._mark_rewrite()
             return
         # simple merge: append groups/accounts with new ids
-        old_names = {g.name for g in self.vault.groups}
         map_gid: Dict[str, str] = {}
-        data_content = data.get("data", {})
-        for g in data_content.get("groups", []):
-            if g["name"] in old_names:
-                exist_gid = next(x.id for x in self.vault.groups if x.name == g["name"])
-                map_gid[g["id"]] = exist_gid
+        for g in groups:
+            existing_group = self.vault.group_by_name(g.name)
+            if existing_group is not None:
+                map_gid[g.id] = existing_group.id
             else:
-                ng = self.add_group(g["name"])
-                map_gid[g["id"]] = ng.id
-        for a in data_content.get("accounts", []):
-            a["id"] = gen_id()
-            a["group_id"] = map_gid.get(a["group_id"]) or self.default_group_id()
-            self.add_account(Account(**a))
+                ng = self.add_group(g.name)
+                map_gid[g.id] = ng.id
+        for a in accounts:
+            a.id = gen_id()
+            a.group_id = map_gid.get(a.group_id) or self.default_group_id()
+            self.add_account(a)
@@ -1,13 +1,17 @@
-from .config import get_color_theme, get_font_config, get_spacing_config, get_border_radius_config
+from .theme import apply_style, compile_style
 
 
 def load_app_style():
-    # 获取配置
-    colors = get_color_theme()
-    fonts = get_font_config()
-    spacing = get_spacing_config()
-    radius = get_border_radius_config()
-    
+    """全局样式表（按主题配置缓存）"""
+    return compile_style(_build_app_style)
+
+
+def apply_app_style(app) -> bool:
+    """把全局样式表设置到应用上，主题未变化时不重新设置"""
+    return apply_style(app, _build_app_style)
+
+
+def _build_app_style(colors, fonts, spacing, radius):
     # Modern dark theme QSS (使用配置)
     return f"""
     * {{ font-family: {fonts['family']}; }}
@@ -188,15 +192,14 @@ def load_app_style():
     }}
 
     /* 卡片视图样式 */
-    QListWidget#CardList {{ background: {colors['surface_variant']}; color: {colors['on_surface_variant']}; border: none; padding: {spacing['md']}px; }}
-    QListWidget#CardList::item {{ margin: 0px; }}
+    QListView#CardList {{ background: {colors['surface_variant']}; color: {colors['on_surface_variant']}; border: none; padding: {spacing['md']}px; }}
+    QListView#CardList::item {{ margin: 0px; }}
 
-    /* 账号卡片样式 - 禁用文本选择，优化交互反馈 */
+    /* 账号卡片样式 - 背景和边框（含悬停、选中状态）由卡片自己绘制，见 card_view.paint_card_frame */
     QFrame#AccountCard {{ 
-        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #1c1c2a, stop:1 #181826); 
+        background: transparent;
         color: {colors['on_surface']}; 
-        border: 1px solid {colors['outline']}; 
-        border-radius: {radius['large']}px;
+        border: none;
         selection-background-color: transparent;
         margin: {spacing['xs']}px;
     }}
@@ -206,24 +209,6 @@ def load_app_style():
         selection-background-color: transparent;
         selection-color: {colors['on_surface']};
     }}
-    
-    /* 悬停状态 - 使用QSS支持的属性 */
-    QFrame#AccountCard[hovered="true"] {{ 
-        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #212137, stop:1 #1d1d33); 
-        border-color: {colors['primary_hover']};
-    }}
-    
-    /* 选中状态 */
-    QFrame#AccountCard[selected="true"] {{ 
-        border: 2px solid {colors['accent']}; 
-        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #1f1f35, stop:1 #1b1b31);
-    }}
-    
-    /* 选中且悬停状态 */
-    QFrame#AccountCard[selected="true"][hovered="true"] {{ 
-        border: 2px solid #9ca6ff; 
-        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 #242240, stop:1 #202038);
-    }}
 
     QLabel[role="title"] {{ font-size: {fonts['sizes']['large']}px; font-weight: {fonts['weights']['bold']}; color: {colors['on_surface']}; }}
     QLabel[role="muted"] {{ color: {colors['on_surface_variant']}; }}
@@ -0,0 +1,77 @@
+"""
+主题引擎
+
+样式表由颜色、字体、间距和圆角四项配置生成。生成结果按这四项配置内容的哈希缓存，
+配置没有变化时直接复用上次的文本，不再重新拼接。
+应用样式表时先与目标当前的样式表比较，相同就不调用 setStyleSheet：
+对 QApplication 设置样式表会让全部控件重新匹配样式并 polish，代价与控件数量成正比。
+"""
+import hashlib
+import json
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import get_color_theme, get_font_config, get_spacing_config, get_border_radius_config
+
+# 样式表生成函数：接收 colors/fonts/spacing/radius 四个关键字参数，返回 QSS 文本
+StyleBuilder = Callable[..., str]
+
+# 缓存的主题数量上限（在几套主题之间来回切换时不必重新生成）
+_MAX_CACHED_THEMES = 8
+
+# (生成函数, 主题哈希) -> QSS
+_compiled: Dict[Tuple[str, str], str] = {}
+_theme_keys: list = []
+
+
+def theme_config() -> dict:
+    """当前生效的主题配置（已合并用户设置）"""
+    return {
+        'colors': get_color_theme(),
+        'fonts': get_font_config(),
+        'spacing': get_spacing_config(),
+        'radius': get_border_radius_config(),
+    }
+
+
+def theme_key(config: Optional[dict] = None) -> str:
+    """主题配置内容的哈希，配置相同则哈希相同"""
+    if config is None:
+        config = theme_config()
+    raw = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def compile_style(builder: StyleBuilder) -> str:
+    """按当前主题生成样式表，同一主题只生成一次"""
+    config = theme_config()
+    key = theme_key(config)
+    cache_key = (f"{builder.__module__}.{builder.__qualname__}", key)
+    qss = _compiled.get(cache_key)
+    if qss is None:
+        qss = builder(**config)
+        if key not in _theme_keys:
+            _theme_keys.append(key)
+            if len(_theme_keys) > _MAX_CACHED_THEMES:
+                stale = _theme_keys.pop(0)
+                for k in [k for k in _compiled if k[1] == stale]:
+                    del _compiled[k]
+        _compiled[cache_key] = qss
+    return qss
+
+
+def apply_style(target, builder: StyleBuilder) -> bool:
+    """把样式表设置到控件或 QApplication 上
+
+    样式表与目标当前的相同时不做任何事，返回是否实际重新设置了样式表。
+    """
+    qss = compile_style(builder)
+    if target.styleSheet() == qss:
+        return False
+    target.setStyleSheet(qss)
+    return True
+
+
+def clear_style_cache():
+    """清空已生成的样式表"""
+    _compiled.clear()
+    _theme_keys.clear()
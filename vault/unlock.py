@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+异步解锁
+在后台线程中完成密钥派生、解密和反序列化，GUI线程只负责显示进度
+"""
+from PyQt5 import QtWidgets, QtCore
+from .storage import VaultStorage, VaultError
+
+
+class UnlockCancelled(Exception):
+    """用户取消了解锁"""
+
+
+class UnlockThread(QtCore.QThread):
+    """异步解锁线程"""
+    progress = QtCore.pyqtSignal(str, int)  # 阶段描述, 百分比
+    unlock_completed = QtCore.pyqtSignal()
+    unlock_failed = QtCore.pyqtSignal(str)
+    unlock_cancelled = QtCore.pyqtSignal()
+
+    def __init__(self, storage: VaultStorage, master_password: str, first_run: bool = False):
+        super().__init__()
+        self.storage = storage
+        self.master_password = master_password
+        self.first_run = first_run
+
+    def _report(self, stage: str, percent: int):
+        # 在阶段之间检查取消请求；单次PBKDF2无法中断，最多等待一个阶段
+        if self.isInterruptionRequested():
+            raise UnlockCancelled()
+        self.progress.emit(stage, percent)
+
+    def run(self):
+        """在后台线程中执行解锁操作"""
+        try:
+            if self.first_run:
+                self._report("创建保险库…", 0)
+                self.storage.create_new(self.master_password)
+                self._report("保存数据…", 80)
+                self.storage.save()
+                self._report("完成", 100)
+            else:
+                self.storage.load(self.master_password, progress=self._report)
+            self.unlock_completed.emit()
+        except UnlockCancelled:
+            self.unlock_cancelled.emit()
+        except VaultError as e:
+            self.unlock_failed.emit(str(e))
+        except Exception as e:
+            self.unlock_failed.emit(f"未知错误: {str(e)}")
+        finally:
+            # 不再持有明文主密码
+            self.master_password = None
+
+
+class UnlockProgressDialog(QtWidgets.QProgressDialog):
+    """解锁进度对话框（可取消）"""
+
+    def __init__(self, storage: VaultStorage, master_password: str, first_run: bool = False, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("解锁")
+        self.setLabelText("正在创建保险库…" if first_run else "正在解锁…")
+        self.setCancelButtonText("取消")
+        self.setRange(0, 100)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setWindowModality(QtCore.Qt.ApplicationModal)
+
+        self.error_message = ""
+        self._finished = False
+
+        self._thread = UnlockThread(storage, master_password, first_run)
+        self._thread.progress.connect(self._on_progress)
+        self._thread.unlock_completed.connect(self._on_completed)
+        self._thread.unlock_failed.connect(self._on_failed)
+        self._thread.unlock_cancelled.connect(self._on_cancelled)
+        self.canceled.connect(self._on_cancel_requested)
+
+    def start(self):
+        """显示对话框并启动后台解锁；返回后调用方可以在GUI线程并行做其他工作"""
+        self.setValue(0)
+        self.show()
+        # 先绘制对话框，再启动线程，保证完成信号只会在 wait_result() 中处理
+        QtWidgets.QApplication.processEvents()
+        self._thread.start()
+
+    def wait_result(self) -> int:
+        """等待解锁结束，返回 QDialog.Accepted 或 QDialog.Rejected"""
+        if not self._finished:
+            self.exec_()
+        if self._thread.isRunning():
+            # 取消后对话框已关闭，但当前阶段的PBKDF2仍在进行；在事件循环中等待线程结束，界面不冻结
+            loop = QtCore.QEventLoop()
+            self._thread.finished.connect(loop.quit)
+            if self._thread.isRunning():
+                loop.exec_()
+        self._thread.wait()
+        return self.result()
+
+    def _on_progress(self, stage: str, percent: int):
+        if self.wasCanceled():
+            return
+        self.setLabelText(stage)
+        self.setValue(percent)
+
+    def _finish(self, code: int):
+        self._finished = True
+        self.done(code)
+
+    def _on_completed(self):
+        # 取消请求晚于最后一个检查点时解锁仍会完成，按用户的选择作废
+        self._finish(QtWidgets.QDialog.Rejected if self.wasCanceled() else QtWidgets.QDialog.Accepted)
+
+    def _on_failed(self, error_msg: str):
+        self.error_message = error_msg
+        self._finish(QtWidgets.QDialog.Rejected)
+
+    def _on_cancelled(self):
+        self._finish(QtWidgets.QDialog.Rejected)
+
+    def _on_cancel_requested(self):
+        self.setLabelText("正在取消…")
+        self._thread.requestInterruption()